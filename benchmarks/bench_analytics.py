@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark des statistiques annuelles (AnalyticsService)
+
+Construit une année de N rendez-vous puis mesure séparément la lecture en
+colonnes et le calcul des agrégats (heures par semaine et par catégorie,
+jours chargés, matrice d'occupation).
+
+Usage:
+    python benchmarks/bench_analytics.py [--rows 50000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database_manager import DatabaseManager
+from src.models.appointment import Appointment
+from src.models.category import Category
+from src.services.analytics_service import AnalyticsService
+from src.services.appointment_service import AppointmentService
+
+
+YEAR_START = date(2024, 1, 1)
+YEAR_END = date(2024, 12, 31)
+
+
+def build_database(path, rows):
+    """Crée une base d'une année de rendez-vous répartis sur quatre catégories"""
+    db = DatabaseManager(path, profile="fast")
+    db.initializeDatabase()
+    category_ids = [db.insertCategory(Category(name=f"Bench {i}", color="#3B82F6")) for i in range(4)]
+    rng = random.Random(42)
+    
+    def appointments():
+        for index in range(rows):
+            start = datetime(2024, 1, 1, 7) + timedelta(days=rng.randrange(366), minutes=15 * rng.randrange(48))
+            yield Appointment(title=f"RDV {index}", start_datetime=start,
+                              end_datetime=start + timedelta(minutes=30 * rng.randrange(1, 6)),
+                              category_id=rng.choice(category_ids))
+    
+    with db.transaction():
+        db.insertAppointments(appointments())
+    return db
+
+
+def median_ms(func, repeat=7):
+    """Retourne la durée médiane d'un appel en millisecondes"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return statistics.median(durations)
+
+
+def main():
+    """Fonction principale du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark des statistiques annuelles")
+    parser.add_argument("--rows", type=int, default=50_000, help="Nombre de rendez-vous sur l'année")
+    args = parser.parse_args()
+    
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(temp_fd)
+    
+    try:
+        db = build_database(temp_path, args.rows)
+        analytics = AnalyticsService(AppointmentService(db))
+        columns = analytics.loadColumns(YEAR_START, YEAR_END)
+        
+        print(f"📊 Statistiques d'une année de {args.rows:,} rendez-vous")
+        print("=" * 50)
+        for name, func in (
+            ("lecture en colonnes", lambda: analytics.loadColumns(YEAR_START, YEAR_END)),
+            ("heures par semaine", lambda: analytics.getWeeklyHours(columns, by_subcategory=True)),
+            ("jours de la semaine", lambda: analytics.getWeekdayTotals(columns)),
+            ("occupation 7 x 24", lambda: analytics.getOccupancyMatrix(columns)),
+            ("synthèse complète", lambda: analytics.getSummary(YEAR_START, YEAR_END)),
+        ):
+            print(f"{name:<22} {median_ms(func):>8.1f} ms")
+        
+        db.close()
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
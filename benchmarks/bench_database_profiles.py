@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark des profils de performance SQLite
+
+Construit pour chaque profil une base synthétique de N rendez-vous puis mesure
+le débit d'écriture (par lots et ligne par ligne) et de lecture (par jour et
+par mois).
+
+Usage:
+    python benchmarks/bench_database_profiles.py [--rows 100000] [--profiles durable balanced fast]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database_manager import DatabaseManager
+from src.database.performance_profiles import PERFORMANCE_PROFILES
+from src.models.appointment import Appointment
+from src.models.category import Category
+
+
+BATCH_SIZE = 1000
+SINGLE_WRITES = 500
+START_DATE = datetime(2020, 1, 1, 8, 0)
+
+
+def generate_appointments(count, category_id, seed=42):
+    """Génère des rendez-vous synthétiques répartis sur plusieurs années"""
+    rng = random.Random(seed)
+    for index in range(count):
+        start = START_DATE + timedelta(days=rng.randrange(5 * 365), minutes=15 * rng.randrange(40))
+        yield Appointment(
+            title=f"RDV {index}",
+            description="Description synthétique",
+            start_datetime=start,
+            end_datetime=start + timedelta(minutes=30 * rng.randint(1, 4)),
+            category_id=category_id
+        )
+
+
+def remove_database(path):
+    """Supprime une base et ses fichiers WAL"""
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.unlink(path + suffix)
+
+
+def bench_profile(profile, rows):
+    """Mesure les débits d'un profil et retourne un dictionnaire de résultats"""
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(temp_fd)
+    results = {"profile": profile}
+    
+    try:
+        db = DatabaseManager(temp_path, profile=profile)
+        db.initializeDatabase()
+        category_id = db.insertCategory(Category(name="Bench", color="#3B82F6"))
+        
+        # Écriture par lots : un commit par lot de BATCH_SIZE lignes
+        appointments = list(generate_appointments(rows, category_id))
+        start = time.perf_counter()
+        for offset in range(0, rows, BATCH_SIZE):
+            with db.transaction():
+                db.insertAppointments(appointments[offset:offset + BATCH_SIZE])
+        results["batch_writes"] = rows / (time.perf_counter() - start)
+        
+        # Écriture ligne par ligne : un commit (et un fsync éventuel) par ligne
+        singles = list(generate_appointments(SINGLE_WRITES, category_id, seed=7))
+        start = time.perf_counter()
+        for appointment in singles:
+            db.insertAppointment(appointment)
+        results["single_writes"] = SINGLE_WRITES / (time.perf_counter() - start)
+        
+        # Lecture par jour sur une année
+        day = START_DATE.date()
+        start = time.perf_counter()
+        loaded = 0
+        for offset in range(365):
+            loaded += len(db.getAppointmentsByDate(day + timedelta(days=offset)))
+        elapsed = time.perf_counter() - start
+        results["day_reads"] = 365 / elapsed
+        results["day_rows"] = loaded / elapsed
+        
+        # Lecture par mois sur cinq ans
+        start = time.perf_counter()
+        loaded = 0
+        for month in range(60):
+            month_start = datetime(2020 + month // 12, month % 12 + 1, 1)
+            month_end = datetime(2020 + (month + 1) // 12, (month + 1) % 12 + 1, 1)
+            loaded += len(db.getAppointmentsInRange(month_start, month_end))
+        elapsed = time.perf_counter() - start
+        results["month_reads"] = 60 / elapsed
+        results["month_rows"] = loaded / elapsed
+        
+        db.close()
+    finally:
+        remove_database(temp_path)
+    
+    return results
+
+
+def main():
+    """Fonction principale du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark des profils SQLite")
+    parser.add_argument("--rows", type=int, default=100_000, help="Nombre de rendez-vous synthétiques")
+    parser.add_argument("--profiles", nargs="+", default=list(PERFORMANCE_PROFILES),
+                        choices=list(PERFORMANCE_PROFILES), help="Profils à mesurer")
+    args = parser.parse_args()
+    
+    print(f"📊 Benchmark des profils SQLite - {args.rows} rendez-vous")
+    print("=" * 78)
+    print(f"{'Profil':<10} {'lots (l/s)':>12} {'unitaire (l/s)':>15} "
+          f"{'jours (req/s)':>14} {'mois (req/s)':>13} {'lues (l/s)':>10}")
+    
+    for profile in args.profiles:
+        r = bench_profile(profile, args.rows)
+        print(f"{r['profile']:<10} {r['batch_writes']:>12,.0f} {r['single_writes']:>15,.0f} "
+              f"{r['day_reads']:>14,.0f} {r['month_reads']:>13,.0f} {r['month_rows']:>10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
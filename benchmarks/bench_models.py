@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement des rendez-vous en objets
+
+Construit une base de N rendez-vous puis compare, pour un chargement complet,
+la construction historique (``sqlite3.Row``, accès par nom, classe avec
+``__dict__``, datetimes construits à la lecture) à la construction actuelle
+(tuples, ``Appointment.fromRow``, classe à ``__slots__``, datetimes construits
+au premier accès). Mesure la durée et la mémoire Python retenue par les
+objets chargés (tracemalloc).
+
+Usage:
+    python benchmarks/bench_models.py [--rows 1000000]
+"""
+
+import argparse
+import gc
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database_manager import APPOINTMENT_COLUMNS, DatabaseManager
+from src.models.appointment import Appointment
+from src.models.category import Category
+from src.utils.epoch import fromEpoch
+
+
+START_DATE = datetime(2015, 1, 1, 8, 0)
+
+
+class LegacyAppointment:
+    """Modèle d'origine : attributs dans un __dict__ par instance"""
+    
+    def __init__(self, id=None, title="", description="", start_datetime=None,
+                 end_datetime=None, category_id=None, subcategory_id=None):
+        self.id = id
+        self.title = title
+        self.description = description
+        self.start_datetime = start_datetime
+        self.end_datetime = end_datetime
+        self.category_id = category_id
+        self.subcategory_id = subcategory_id
+
+
+def build_database(path, rows):
+    """Crée une base de N rendez-vous, un toutes les 10 minutes"""
+    db = DatabaseManager(path, profile="fast")
+    db.initializeDatabase()
+    category_id = db.insertCategory(Category(name="Bench", color="#3B82F6"))
+    
+    def appointments():
+        for index in range(rows):
+            start = START_DATE + timedelta(minutes=10 * index)
+            yield Appointment(title=f"RDV {index}", description="Description synthétique",
+                              start_datetime=start, end_datetime=start + timedelta(minutes=30),
+                              category_id=category_id)
+    
+    with db.transaction():
+        db.insertAppointments(appointments())
+    db.close()
+
+
+def load_legacy(path):
+    """Chargement historique : sqlite3.Row, accès par nom, dates converties d'emblée"""
+    connection = sqlite3.connect(path)
+    connection.row_factory = sqlite3.Row
+    rows = connection.execute("SELECT * FROM appointments").fetchall()
+    appointments = [
+        LegacyAppointment(
+            id=row["id"],
+            title=row["title"],
+            description=row["description"],
+            start_datetime=fromEpoch(row["start_datetime"]),
+            end_datetime=fromEpoch(row["end_datetime"]),
+            category_id=row["category_id"],
+            subcategory_id=row["subcategory_id"]
+        )
+        for row in rows
+    ]
+    connection.close()
+    return appointments
+
+
+def load_slotted(path):
+    """Chargement actuel : tuples, construction positionnelle, dates converties à la demande"""
+    connection = sqlite3.connect(path)
+    rows = connection.execute(f"SELECT {APPOINTMENT_COLUMNS} FROM appointments").fetchall()
+    appointments = list(map(Appointment.fromRow, rows))
+    connection.close()
+    return appointments
+
+
+def measure(loader, path):
+    """Retourne (durée en s, mémoire retenue en Mo, nombre d'objets)"""
+    gc.collect()
+    start = time.perf_counter()
+    appointments = loader(path)
+    elapsed = time.perf_counter() - start
+    count = len(appointments)
+    del appointments
+    
+    # Seconde passe sous tracemalloc : le traçage ralentit les allocations
+    gc.collect()
+    tracemalloc.start()
+    appointments = loader(path)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del appointments
+    
+    return elapsed, retained / (1024 * 1024), count
+
+
+def main():
+    """Fonction principale du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark du chargement des modèles")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="Nombre de rendez-vous synthétiques")
+    args = parser.parse_args()
+    
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(temp_fd)
+    
+    try:
+        build_database(temp_path, args.rows)
+        
+        print(f"📊 Chargement de {args.rows:,} rendez-vous")
+        print("=" * 58)
+        print(f"{'Construction':<12} {'durée (s)':>10} {'objets/s':>12} {'mémoire (Mo)':>14}")
+        
+        for name, loader in (("historique", load_legacy), ("slots", load_slotted)):
+            elapsed, memory, count = measure(loader, temp_path)
+            print(f"{name:<12} {elapsed:>10.2f} {count / elapsed:>12,.0f} {memory:>14,.1f}")
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark des deux rendus de la grille mensuelle (widgets et canvas)
+
+Navigue de mois en mois dans une CalendarView pour chaque rendu et mesure le
+temps moyen d'une navigation, dessin compris. Nécessite un affichage.
+
+Usage:
+    python benchmarks/bench_month_grid.py [--months 24] [--rows 5000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import customtkinter as ctk
+
+from src.database.database_manager import DatabaseManager
+from src.gui.calendar_view import CalendarView
+from src.models.appointment import Appointment
+from src.models.category import Category
+from src.services.appointment_service import AppointmentService
+
+
+def build_database(path, rows):
+    """Crée une base avec des rendez-vous répartis sur deux ans"""
+    db = DatabaseManager(path)
+    db.initializeDatabase()
+    category_id = db.insertCategory(Category(name="Bench", color="#3B82F6"))
+    rng = random.Random(42)
+    
+    def appointments():
+        for index in range(rows):
+            start = datetime(2024, 1, 1, 8) + timedelta(days=rng.randrange(730), hours=rng.randrange(10))
+            yield Appointment(title=f"RDV {index}", start_datetime=start,
+                              end_datetime=start + timedelta(hours=1), category_id=category_id)
+    
+    with db.transaction():
+        db.insertAppointments(appointments())
+    return db
+
+
+def bench_renderer(root, appointment_service, renderer, months):
+    """Mesure le temps moyen d'une navigation mensuelle pour un rendu"""
+    view = CalendarView(root, appointment_service, lambda d: None, lambda a: None, renderer=renderer)
+    view.pack(fill="both", expand=True)
+    root.update()
+    
+    # Premier passage pour remplir le cache du service
+    targets = [date(2024 + m // 12, m % 12 + 1, 1) for m in range(months)]
+    for target in targets:
+        view.showDate(target)
+    root.update()
+    
+    start = time.perf_counter()
+    for target in targets:
+        view.showDate(target)
+        root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    
+    view.destroy()
+    return elapsed / months * 1000
+
+
+def main():
+    """Fonction principale du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark des rendus de la grille mensuelle")
+    parser.add_argument("--months", type=int, default=24, help="Nombre de navigations mesurées")
+    parser.add_argument("--rows", type=int, default=5000, help="Nombre de rendez-vous synthétiques")
+    args = parser.parse_args()
+    
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(temp_fd)
+    
+    try:
+        db = build_database(temp_path, args.rows)
+        appointment_service = AppointmentService(db)
+        
+        root = ctk.CTk()
+        root.geometry("900x700")
+        
+        print(f"📊 Navigation mensuelle - {args.months} mois, {args.rows} rendez-vous")
+        print("=" * 50)
+        for renderer in ("widgets", "canvas"):
+            average_ms = bench_renderer(root, appointment_service, renderer, args.months)
+            print(f"{renderer:<10} {average_ms:>8.2f} ms / navigation")
+        
+        root.destroy()
+        db.close()
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la recherche plein texte (FTS5)
+
+Construit une base de N rendez-vous aux titres et descriptions variés puis
+mesure la latence de ``AppointmentService.search`` pour des saisies
+progressives, comme lors d'une frappe dans la sidebar.
+
+Usage:
+    python benchmarks/bench_search.py [--rows 500000] [--repeat 20]
+"""
+
+import argparse
+import itertools
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database_manager import DatabaseManager
+from src.models.appointment import Appointment
+from src.models.category import Category
+from src.services.appointment_service import AppointmentService
+
+
+START_DATE = datetime(2018, 1, 1, 8, 0)
+SUBJECTS = ["Réunion", "Médecin", "Dentiste", "Formation", "Projet", "Sport", "Famille",
+            "Banque", "Garage", "Coiffeur", "Kiné", "Entretien", "Comité", "Revue", "Atelier",
+            "Déjeuner", "Dîner", "Appel", "Visio", "Point", "Séminaire", "Cours", "Livraison",
+            "Anniversaire", "Vétérinaire", "Notaire", "Ophtalmo", "Piscine", "Concert", "Voyage"]
+QUERIES = ["me", "med", "médecin", "reu", "réunion", "réunion budget", "anniv", "kine",
+           "dupont", "mot12", "xyz"]
+SYLLABLES = ["ba", "co", "du", "fa", "ge", "li", "mo", "na", "pe", "ri", "sa", "to", "va", "zu"]
+
+
+def build_vocabulary(rng, size):
+    """Génère un vocabulaire de mots synthétiques (noms, lieux, sujets)"""
+    words = {"dupont", "budget", "client", "équipe", "planning", "suivi", "contrôle"}
+    while len(words) < size:
+        words.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))))
+    return sorted(words) + [f"mot{index}" for index in range(size // 4)]
+
+
+def build_database(path, rows):
+    """Crée une base de N rendez-vous aux textes aléatoires
+    
+    Les mots suivent une distribution de Zipf : quelques mots très fréquents,
+    une longue traîne de mots rares, comme dans un agenda réel.
+    """
+    db = DatabaseManager(path, profile="fast")
+    db.initializeDatabase()
+    category_id = db.insertCategory(Category(name="Bench", color="#3B82F6"))
+    rng = random.Random(42)
+    vocabulary = build_vocabulary(rng, 4000)
+    rng.shuffle(vocabulary)
+    cum_weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(vocabulary))))
+    
+    def appointments():
+        for index in range(rows):
+            start = START_DATE + timedelta(days=rng.randrange(6 * 365), minutes=15 * rng.randrange(40))
+            words = rng.choices(vocabulary, cum_weights=cum_weights, k=8)
+            yield Appointment(
+                title=f"{rng.choice(SUBJECTS)} {words[0]}",
+                description=" ".join(words[1:]),
+                start_datetime=start,
+                end_datetime=start + timedelta(minutes=30),
+                category_id=category_id
+            )
+    
+    with db.transaction():
+        db.insertAppointments(appointments())
+    return db
+
+
+def main():
+    """Fonction principale du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark de la recherche plein texte")
+    parser.add_argument("--rows", type=int, default=500_000, help="Nombre de rendez-vous synthétiques")
+    parser.add_argument("--repeat", type=int, default=20, help="Répétitions par requête")
+    args = parser.parse_args()
+    
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(temp_fd)
+    
+    try:
+        db = build_database(temp_path, args.rows)
+        service = AppointmentService(db)
+        
+        print(f"📊 Recherche plein texte - {args.rows:,} rendez-vous, {args.repeat} répétitions")
+        print("=" * 64)
+        print(f"{'Saisie':<16} {'résultats':>10} {'médiane (ms)':>14} {'max (ms)':>10} {'+ plage (ms)':>12}")
+        
+        year_range = (date(2020, 1, 1), date(2020, 12, 31))
+        for query in QUERIES:
+            timings, ranged = [], []
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                results = service.search(query)
+                timings.append((time.perf_counter() - start) * 1000)
+                
+                start = time.perf_counter()
+                service.search(query, date_range=year_range)
+                ranged.append((time.perf_counter() - start) * 1000)
+            
+            print(f"{query:<16} {len(results):>10} {statistics.median(timings):>14.2f} "
+                  f"{max(timings):>10.2f} {statistics.median(ranged):>12.2f}")
+        
+        db.close()
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
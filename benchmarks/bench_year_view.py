@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark du chargement de la vue annuelle
+
+Construit une base dense (rendez-vous simples et quelques séries) puis mesure,
+cache vidé, le temps d'AppointmentService.getYearActivity pour chaque année :
+c'est la seule requête faite par la vue annuelle lors d'un changement d'année.
+
+Usage:
+    python benchmarks/bench_year_view.py [--rows 200000] [--years 5]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Ajouter la racine du projet au path Python
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.database.database_manager import DatabaseManager
+from src.models.appointment import Appointment
+from src.models.category import Category
+from src.services.appointment_service import AppointmentService
+
+
+FIRST_YEAR = 2020
+
+
+def build_database(path, rows, years):
+    """Crée une base de N rendez-vous répartis sur plusieurs années, plus trois séries"""
+    db = DatabaseManager(path, profile="fast")
+    db.initializeDatabase()
+    category_id = db.insertCategory(Category(name="Bench", color="#3B82F6"))
+    rng = random.Random(42)
+    span = (datetime(FIRST_YEAR + years, 1, 1) - datetime(FIRST_YEAR, 1, 1)).days
+    
+    def appointments():
+        for index in range(rows):
+            start = datetime(FIRST_YEAR, 1, 1, 8) + timedelta(days=rng.randrange(span), hours=rng.randrange(10))
+            yield Appointment(title=f"RDV {index}", start_datetime=start,
+                              end_datetime=start + timedelta(minutes=rng.choice((15, 30, 60))),
+                              category_id=category_id)
+    
+    with db.transaction():
+        db.insertAppointments(appointments())
+        for rule in ("FREQ=DAILY", "FREQ=WEEKLY", "FREQ=MONTHLY"):
+            start = datetime(FIRST_YEAR, 1, 1, 9)
+            db.insertAppointment(Appointment(title=rule, start_datetime=start,
+                                             end_datetime=start + timedelta(minutes=30),
+                                             category_id=category_id, recurrence_rule=rule))
+    return db
+
+
+def main():
+    """Fonction principale du benchmark"""
+    parser = argparse.ArgumentParser(description="Benchmark du chargement de la vue annuelle")
+    parser.add_argument("--rows", type=int, default=200_000, help="Nombre de rendez-vous synthétiques")
+    parser.add_argument("--years", type=int, default=5, help="Nombre d'années couvertes")
+    args = parser.parse_args()
+    
+    temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+    os.close(temp_fd)
+    
+    try:
+        db = build_database(temp_path, args.rows, args.years)
+        appointment_service = AppointmentService(db)
+        
+        print(f"📊 Vue annuelle - {args.rows:,} rendez-vous sur {args.years} ans")
+        print("=" * 50)
+        for year in range(FIRST_YEAR, FIRST_YEAR + args.years):
+            appointment_service.clearCache()
+            start = time.perf_counter()
+            activity = appointment_service.getYearActivity(year)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            print(f"{year}  {len(activity):>4} jours occupés  {elapsed_ms:>8.2f} ms")
+        
+        db.close()
+    finally:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+if __name__ == "__main__":
+    main()
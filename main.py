@@ -13,6 +13,7 @@ from src.gui.main_window import MainWindow
 from src.database.database_manager import DatabaseManager
 from src.services.category_service import CategoryService
 from src.services.appointment_service import AppointmentService
+from src.services.analytics_service import AnalyticsService
 
 
 def main():
@@ -25,14 +26,15 @@ def main():
         # Initialiser les services
         category_service = CategoryService(db_manager)
         appointment_service = AppointmentService(db_manager)
+        analytics_service = AnalyticsService(appointment_service)
         
         # Initialiser les catégories par défaut
         category_service.initializeDefaultCategories()
         
         # Lancer l'interface graphique
-        app = MainWindow(category_service, appointment_service)
+        app = MainWindow(category_service, appointment_service, analytics_service)
         app.run()
-        
+    
     except Exception as e:
         print(f"Erreur lors du démarrage de l'application: {e}")
         sys.exit(1)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Commandes de maintenance de la base Gestion Calendrier
+
+Usage:
+    python -m src.cli rebuild-summary [--db calendar_data.db]
+    python -m src.cli import-ics FICHIER.ics [--category Perso] [--db calendar_data.db]
+    python -m src.cli export-ics FICHIER.ics [--from 2024-01-01] [--to 2025-01-01]
+    python -m src.cli export-jsonl FICHIER.jsonl [--from 2024-01-01] [--to 2025-01-01]
+
+Aucune commande n'importe l'interface graphique : utilisables sans affichage.
+"""
+
+import argparse
+import sys
+from datetime import date
+
+from src.database.database_manager import DatabaseManager
+from src.services.appointment_service import AppointmentService
+from src.services.category_service import CategoryService
+from src.services.export_service import ExportService
+from src.services.ics_import_service import IcsImportService
+from src.utils.constants import DATABASE_PATH
+
+
+def rebuildSummary(db_manager: DatabaseManager, args) -> int:
+    """Recalcule la synthèse quotidienne (bases existantes ou après un import direct)"""
+    rows = db_manager.rebuildDailySummary()
+    print(f"✅ Synthèse quotidienne recalculée: {rows} ligne(s)")
+    return 0
+
+
+def importIcs(db_manager: DatabaseManager, args) -> int:
+    """Importe un fichier .ics en affichant la progression"""
+    category_service = CategoryService(db_manager)
+    category_service.initializeDefaultCategories()
+    
+    default_category_id = None
+    if args.category:
+        category = category_service.getCategoryByName(args.category)
+        if category is None:
+            print(f"❌ Catégorie inconnue: {args.category}")
+            return 1
+        default_category_id = category.id
+    
+    def showProgress(imported: int, bytes_read: int, total_bytes: int):
+        percent = 100 * bytes_read / total_bytes if total_bytes else 100
+        print(f"\r   {imported:,} rendez-vous importés ({percent:.0f} %)", end="", flush=True)
+    
+    import_service = IcsImportService(AppointmentService(db_manager), category_service)
+    result = import_service.importFile(args.path, default_category_id, progress_callback=showProgress)
+    print()
+    print(f"✅ {result['imported']} rendez-vous importés, {result['skipped']} événement(s) ignoré(s)")
+    if result["rules_dropped"]:
+        print(f"⚠️ {result['rules_dropped']} règle(s) de récurrence non reconnue(s) : première occurrence seule")
+    return 0
+
+
+def exportIcs(db_manager: DatabaseManager, args) -> int:
+    """Exporte les rendez-vous dans un fichier .ics"""
+    count = ExportService(db_manager).exportIcs(args.path, args.start, args.end)
+    print(f"✅ {count} rendez-vous exportés dans {args.path}")
+    return 0
+
+
+def exportJsonl(db_manager: DatabaseManager, args) -> int:
+    """Exporte les rendez-vous en JSON lines (un objet par ligne)"""
+    count = ExportService(db_manager).exportJsonl(args.path, args.start, args.end)
+    print(f"✅ {count} rendez-vous exportés dans {args.path}")
+    return 0
+
+
+def buildParser() -> argparse.ArgumentParser:
+    """Construit l'analyseur de la ligne de commande"""
+    parser = argparse.ArgumentParser(description="Maintenance de la base Gestion Calendrier")
+    parser.add_argument("--db", default=DATABASE_PATH, help="Chemin de la base de données")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    rebuild_parser = commands.add_parser("rebuild-summary", help="Recalcule la synthèse quotidienne")
+    rebuild_parser.set_defaults(handler=rebuildSummary)
+    
+    import_parser = commands.add_parser("import-ics", help="Importe les événements d'un fichier .ics")
+    import_parser.add_argument("path", help="Fichier .ics à importer")
+    import_parser.add_argument("--category", help="Catégorie des événements sans catégorie reconnue")
+    import_parser.set_defaults(handler=importIcs)
+    
+    for name, handler, help_text in (
+        ("export-ics", exportIcs, "Exporte les rendez-vous dans un fichier .ics"),
+        ("export-jsonl", exportJsonl, "Exporte les rendez-vous en JSON lines"),
+    ):
+        export_parser = commands.add_parser(name, help=help_text)
+        export_parser.add_argument("path", help="Fichier de destination")
+        export_parser.add_argument("--from", dest="start", type=date.fromisoformat,
+                                   help="Premier jour exporté (AAAA-MM-JJ)")
+        export_parser.add_argument("--to", dest="end", type=date.fromisoformat,
+                                   help="Jour de fin, exclu (AAAA-MM-JJ)")
+        export_parser.set_defaults(handler=handler)
+    
+    return parser
+
+
+def main(argv=None) -> int:
+    """Fonction principale de la ligne de commande"""
+    args = buildParser().parse_args(argv)
+    
+    db_manager = DatabaseManager(args.db)
+    try:
+        # Les migrations en attente (dont la création de la synthèse) sont appliquées
+        db_manager.initializeDatabase()
+        return args.handler(db_manager, args)
+    except Exception as e:
+        print(f"❌ Erreur: {e}")
+        return 1
+    finally:
+        db_manager.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
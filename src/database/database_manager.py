@@ -1,32 +1,97 @@
 """Gestionnaire de base de données SQLite"""
 
+import json
 import sqlite3
-from typing import List, Optional
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Type
 from datetime import date, datetime
 from src.models.category import Category
 from src.models.subcategory import Subcategory
 from src.models.appointment import Appointment
-from src.utils.constants import DATABASE_PATH
+from src.models.appointment_details import AppointmentDetails
+from src.database.identity_map import IdentityMap
+from src.database.migrations import (
+    INSERT_TRIGGERS, MigrationManager, fillDailySummary, indexNewAppointments
+)
+from src.database.pagination import parseCursorToken
+from src.database.performance_profiles import DEFAULT_PROFILE, applyPerformanceProfile, validateProfile
+from src.utils.constants import APPOINTMENT_PAGE_SIZE, DATABASE_PATH
+from src.utils.epoch import SECONDS_PER_DAY, fromEpoch, toEpoch
+
+
+# Colonnes lues, dans l'ordre attendu par les constructeurs fromRow des modèles
+CATEGORY_COLUMNS = "id, name, color"
+SUBCATEGORY_COLUMNS = "id, name, category_id, color"
+APPOINTMENT_COLUMNS = (
+    "id, title, description, start_datetime, end_datetime, category_id, subcategory_id, "
+    "recurrence_rule"
+)
+APPOINTMENT_COLUMN_COUNT = len(APPOINTMENT_COLUMNS.split(","))
+
+# Projections des lectures de rendez-vous : "summary" ne lit pas la
+# description (NULL à sa place), chargée au premier accès par le modèle
+PROJECTION_FULL = "full"
+PROJECTION_SUMMARY = "summary"
+_PROJECTION_COLUMNS = {
+    PROJECTION_FULL: APPOINTMENT_COLUMNS,
+    PROJECTION_SUMMARY: APPOINTMENT_COLUMNS.replace("description", "NULL"),
+}
+# Colonnes des exports : noms de catégorie et exceptions des séries inclus
+EXPORT_COLUMNS = (
+    "a.id, a.title, a.description, a.start_datetime, a.end_datetime, a.recurrence_rule, "
+    "c.name, s.name, "
+    "CASE WHEN a.recurrence_rule IS NOT NULL THEN ("
+    "SELECT group_concat(e.occurrence_start) FROM appointment_exceptions e "
+    "WHERE e.appointment_id = a.id) END"
+)
+
+
+def _prefixedColumns(columns: str, alias: str) -> str:
+    """Préfixe chaque colonne d'une liste par un alias de table (sauf NULL)"""
+    return ", ".join(
+        column if column == "NULL" else f"{alias}.{column}"
+        for column in map(str.strip, columns.split(","))
+    )
+
+
+def _appointmentColumns(projection: str) -> str:
+    """Retourne les colonnes lues pour une projection"""
+    try:
+        return _PROJECTION_COLUMNS[projection]
+    except KeyError:
+        raise ValueError(f"Projection inconnue: {projection}")
 
 
 class DatabaseManager:
     """Gestionnaire principal pour les opérations de base de données"""
     
-    def __init__(self, db_path: str = DATABASE_PATH):
+    def __init__(self, db_path: str = DATABASE_PATH, profile: str = DEFAULT_PROFILE):
         self.db_path = db_path
+        self.profile = profile
         self.connection = None
+        self._transaction_depth = 0
+        # Une seule instance par rendez-vous chargé, partagée par les vues et les caches
+        self.identity_map = IdentityMap()
         self.connectToDatabase()
     
     def connectToDatabase(self):
         """Établit la connexion à la base de données"""
+        # Un profil inconnu est refusé avant d'ouvrir (et de laisser ouverte) la connexion
+        validateProfile(self.profile)
         try:
-            self.connection = sqlite3.connect(self.db_path)
-            self.connection.row_factory = sqlite3.Row
+            # L'interface exécute les requêtes sur son thread de travail
+            # (BackgroundExecutor) : la connexion n'est utilisée que par un
+            # thread à la fois, mais pas forcément celui qui l'a ouverte
+            self.connection = sqlite3.connect(self.db_path, check_same_thread=False)
+            # Lignes sous forme de tuples : les modèles sont construits
+            # positionnellement, sans recherche de colonne par nom
+            self.connection.row_factory = None
+            applyPerformanceProfile(self.connection, self.profile)
         except sqlite3.Error as e:
             raise Exception(f"Erreur de connexion à la base de données: {e}")
     
     def initializeDatabase(self):
-        """Initialise les tables de la base de données"""
+        """Initialise les tables de la base de données puis applique les migrations"""
         cursor = self.connection.cursor()
         
         # Table des catégories
@@ -49,14 +114,14 @@ class DatabaseManager:
             )
         """)
         
-        # Table des rendez-vous
+        # Table des rendez-vous (horaires en secondes depuis l'époque, voir src.utils.epoch)
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS appointments (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 title TEXT NOT NULL,
                 description TEXT,
-                start_datetime TEXT NOT NULL,
-                end_datetime TEXT NOT NULL,
+                start_datetime INTEGER NOT NULL,
+                end_datetime INTEGER NOT NULL,
                 category_id INTEGER NOT NULL,
                 subcategory_id INTEGER,
                 FOREIGN KEY (category_id) REFERENCES categories (id),
@@ -65,6 +130,86 @@ class DatabaseManager:
         """)
         
         self.connection.commit()
+        
+        # Mettre le schéma à jour (index, évolutions ultérieures)
+        self.migrateDatabase()
+    
+    def migrateDatabase(self) -> int:
+        """Applique les migrations de schéma en attente et retourne leur nombre"""
+        return MigrationManager(self.connection).migrate()
+    
+    def getSchemaVersion(self) -> int:
+        """Retourne la version du schéma (PRAGMA user_version)"""
+        return MigrationManager(self.connection).getCurrentVersion()
+    
+    @contextmanager
+    def transaction(self):
+        """Regroupe plusieurs écritures dans une seule transaction
+        
+        Les méthodes d'écriture appelées dans le bloc diffèrent leur commit
+        jusqu'à la sortie du bloc le plus externe ; une exception annule
+        l'ensemble des écritures du bloc. Un bloc imbriqué est un point de
+        sauvegarde (SAVEPOINT) : son échec n'annule que ses propres écritures,
+        même si un bloc englobant rattrape l'exception.
+        """
+        savepoint = f"transaction_{self._transaction_depth}" if self._transaction_depth else None
+        if savepoint:
+            # Un SAVEPOINT hors transaction en ouvrirait une que son RELEASE validerait
+            if not self.connection.in_transaction:
+                self.connection.execute("BEGIN")
+            self.connection.execute(f"SAVEPOINT {savepoint}")
+        
+        self._transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self._transaction_depth -= 1
+            if savepoint:
+                self.connection.execute(f"ROLLBACK TO {savepoint}")
+                self.connection.execute(f"RELEASE {savepoint}")
+            else:
+                self.connection.rollback()
+            # Les instances ont pu recevoir des valeurs désormais annulées
+            self.identity_map.clear()
+            raise
+        else:
+            self._transaction_depth -= 1
+            if savepoint:
+                self.connection.execute(f"RELEASE {savepoint}")
+            else:
+                self.connection.commit()
+    
+    @contextmanager
+    def deferredIndexes(self):
+        """Charge massivement des rendez-vous sans maintenir les index ligne à ligne
+        
+        Dans une transaction, les triggers d'insertion (R*Tree, plein texte,
+        synthèse quotidienne) sont retirés le temps du bloc ; les rendez-vous
+        insérés sont ensuite indexés en quelques requêtes ensemblistes, bien
+        plus rapides. Le bloc ne doit qu'insérer des rendez-vous : une mise à
+        jour ou une suppression y trouverait des index incomplets.
+        """
+        with self.transaction():
+            cursor = self.connection.cursor()
+            # Le retrait des triggers doit être annulé avec le reste du bloc
+            if not self.connection.in_transaction:
+                cursor.execute("BEGIN")
+            
+            cursor.execute("SELECT COALESCE(MAX(id), 0) FROM appointments")
+            last_id = cursor.fetchone()[0]
+            for trigger_name in INSERT_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+            
+            yield self
+            
+            indexNewAppointments(cursor, last_id)
+            for trigger_sql in INSERT_TRIGGERS.values():
+                cursor.execute(trigger_sql)
+    
+    def _commit(self):
+        """Valide les écritures, sauf à l'intérieur d'un bloc transaction()"""
+        if self._transaction_depth == 0:
+            self.connection.commit()
     
     def insertCategory(self, category: Category) -> int:
         """Insère une nouvelle catégorie et retourne son ID"""
@@ -75,39 +220,27 @@ class DatabaseManager:
             (category.name, category.color)
         )
         
-        self.connection.commit()
+        self._commit()
         return cursor.lastrowid
     
     def getCategoryById(self, category_id: int) -> Optional[Category]:
         """Récupère une catégorie par son ID"""
         cursor = self.connection.cursor()
         
-        cursor.execute("SELECT * FROM categories WHERE id = ?", (category_id,))
+        cursor.execute(f"SELECT {CATEGORY_COLUMNS} FROM categories WHERE id = ?", (category_id,))
         row = cursor.fetchone()
         
         if row:
-            return Category(
-                id=row["id"],
-                name=row["name"],
-                color=row["color"]
-            )
+            return Category.fromRow(row)
         return None
     
     def getAllCategories(self) -> List[Category]:
         """Récupère toutes les catégories"""
         cursor = self.connection.cursor()
         
-        cursor.execute("SELECT * FROM categories ORDER BY name")
-        rows = cursor.fetchall()
+        cursor.execute(f"SELECT {CATEGORY_COLUMNS} FROM categories ORDER BY name")
         
-        return [
-            Category(
-                id=row["id"],
-                name=row["name"],
-                color=row["color"]
-            )
-            for row in rows
-        ]
+        return list(map(Category.fromRow, cursor.fetchall()))
     
     def insertSubcategory(self, subcategory: Subcategory) -> int:
         """Insère une nouvelle sous-catégorie et retourne son ID"""
@@ -118,7 +251,7 @@ class DatabaseManager:
             (subcategory.name, subcategory.category_id, subcategory.color)
         )
         
-        self.connection.commit()
+        self._commit()
         return cursor.lastrowid
     
     def getSubcategoriesByCategory(self, category_id: int) -> List[Subcategory]:
@@ -126,20 +259,40 @@ class DatabaseManager:
         cursor = self.connection.cursor()
         
         cursor.execute(
-            "SELECT * FROM subcategories WHERE category_id = ? ORDER BY name",
+            f"SELECT {SUBCATEGORY_COLUMNS} FROM subcategories WHERE category_id = ? ORDER BY name",
             (category_id,)
         )
-        rows = cursor.fetchall()
         
-        return [
-            Subcategory(
-                id=row["id"],
-                name=row["name"],
-                category_id=row["category_id"],
-                color=row["color"]
-            )
-            for row in rows
-        ]
+        return list(map(Subcategory.fromRow, cursor.fetchall()))
+    
+    def getCategoryTree(self) -> List[Tuple[Category, Optional[Subcategory]]]:
+        """Récupère en une requête toutes les catégories et leurs sous-catégories
+        
+        Retourne une ligne par couple (catégorie, sous-catégorie), triée par
+        nom de catégorie puis de sous-catégorie. Une catégorie sans
+        sous-catégorie apparaît une fois, avec None.
+        """
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            f"""SELECT {_prefixedColumns(CATEGORY_COLUMNS, "c")},
+                       {_prefixedColumns(SUBCATEGORY_COLUMNS, "s")}
+               FROM categories c
+               LEFT JOIN subcategories s ON s.category_id = c.id
+               ORDER BY c.name, c.id, s.name"""
+        )
+        
+        tree = []
+        categories = {}
+        for row in cursor.fetchall():
+            # Une seule instance par catégorie, partagée par ses lignes
+            category = categories.get(row[0])
+            if category is None:
+                category = categories[row[0]] = Category.fromRow(row[:3])
+            subcategory = Subcategory.fromRow(row[3:]) if row[3] is not None else None
+            tree.append((category, subcategory))
+        
+        return tree
     
     def insertAppointment(self, appointment: Appointment) -> int:
         """Insère un nouveau rendez-vous et retourne son ID"""
@@ -147,49 +300,502 @@ class DatabaseManager:
         
         cursor.execute(
             """INSERT INTO appointments 
-               (title, description, start_datetime, end_datetime, category_id, subcategory_id) 
-               VALUES (?, ?, ?, ?, ?, ?)""",
-            (
-                appointment.title,
-                appointment.description,
-                appointment.start_datetime.isoformat(),
-                appointment.end_datetime.isoformat(),
-                appointment.category_id,
-                appointment.subcategory_id
-            )
+               (title, description, start_datetime, end_datetime, category_id, subcategory_id,
+                recurrence_rule) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            self._appointmentValues(appointment)
         )
         
-        self.connection.commit()
+        self._commit()
         return cursor.lastrowid
     
-    def getAppointmentsByDate(self, target_date: date) -> List[Appointment]:
-        """Récupère tous les rendez-vous d'une date donnée"""
+    def insertAppointments(self, appointments: Iterable[Appointment]) -> int:
+        """Insère un lot de rendez-vous en une seule requête préparée
+        
+        Retourne le nombre de rendez-vous insérés.
+        """
+        cursor = self.connection.cursor()
+        
+        cursor.executemany(
+            """INSERT INTO appointments 
+               (title, description, start_datetime, end_datetime, category_id, subcategory_id,
+                recurrence_rule) 
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            (self._appointmentValues(appointment) for appointment in appointments)
+        )
+        
+        self._commit()
+        return max(cursor.rowcount, 0)
+    
+    def getAppointmentById(self, appointment_id: int) -> Optional[Appointment]:
+        """Récupère un rendez-vous par son ID"""
+        cursor = self.connection.cursor()
+        
+        appointment = self.identity_map.get(Appointment, appointment_id)
+        if appointment is not None:
+            return appointment
+        
+        cursor.execute(f"SELECT {APPOINTMENT_COLUMNS} FROM appointments WHERE id = ?", (appointment_id,))
+        row = cursor.fetchone()
+        
+        if row:
+            return self.identity_map.load(Appointment, row)
+        return None
+    
+    def getAppointmentDescription(self, appointment_id: int) -> Optional[str]:
+        """Lit la seule description d'un rendez-vous (chargement différé des modèles)"""
+        row = self.connection.execute(
+            "SELECT description FROM appointments WHERE id = ?", (appointment_id,)
+        ).fetchone()
+        return row[0] if row else None
+    
+    def getAppointmentsByIds(self, appointment_ids: Iterable[int]) -> List[Appointment]:
+        """Récupère plusieurs rendez-vous par leurs IDs en une seule requête
+        
+        Les rendez-vous déjà chargés sont pris dans l'identity map ; les autres
+        sont lus ensemble. Le résultat suit l'ordre des IDs demandés, les IDs
+        inexistants étant ignorés.
+        """
+        appointment_ids = list(appointment_ids)
+        found = {}
+        missing = []
+        for appointment_id in appointment_ids:
+            appointment = self.identity_map.get(Appointment, appointment_id)
+            if appointment is not None:
+                found[appointment_id] = appointment
+            else:
+                missing.append(appointment_id)
+        
+        if missing:
+            cursor = self.connection.cursor()
+            # Un seul paramètre JSON quel que soit le nombre d'IDs
+            cursor.execute(
+                f"""SELECT {APPOINTMENT_COLUMNS} FROM appointments
+                   WHERE id IN (SELECT value FROM json_each(?))""",
+                (json.dumps(missing),)
+            )
+            for appointment in self.identity_map.loadAll(Appointment, cursor.fetchall()):
+                found[appointment.id] = appointment
+        
+        return [found[appointment_id] for appointment_id in appointment_ids if appointment_id in found]
+    
+    def getAppointmentsByDate(self, target_date: date,
+                              projection: str = PROJECTION_FULL) -> List[Appointment]:
+        """Récupère tous les rendez-vous simples d'une date donnée (hors séries)"""
         cursor = self.connection.cursor()
         
-        # Convertir la date en format ISO pour la comparaison
-        date_start = f"{target_date.strftime('%Y-%m-%d')}T00:00:00"
-        date_end = f"{target_date.strftime('%Y-%m-%d')}T23:59:59"
+        # Bornes numériques semi-ouvertes : [minuit, minuit du lendemain[
+        date_start = toEpoch(target_date)
+        
+        cursor.execute(
+            f"""SELECT {_appointmentColumns(projection)} FROM appointments 
+               WHERE start_datetime >= ? AND start_datetime < ?
+                 AND recurrence_rule IS NULL
+               ORDER BY start_datetime""",
+            (date_start, date_start + SECONDS_PER_DAY)
+        )
+        
+        return self._loadAppointments(Appointment, cursor.fetchall(), projection)
+    
+    def getAppointmentsInRange(self, start, end, projection: str = PROJECTION_FULL) -> List[Appointment]:
+        """Récupère en une seule requête les rendez-vous simples commençant dans [start, end[
+        
+        Les bornes acceptent des dates (minuit) ou des datetimes. Les résultats
+        sont triés par date/heure de début. Les séries récurrentes sont
+        développées par le service (voir getRecurringSeries). La projection
+        PROJECTION_SUMMARY ne lit pas les descriptions.
+        """
+        cursor = self.connection.cursor()
         
         cursor.execute(
-            """SELECT * FROM appointments 
-               WHERE start_datetime >= ? AND start_datetime <= ?
+            f"""SELECT {_appointmentColumns(projection)} FROM appointments 
+               WHERE start_datetime >= ? AND start_datetime < ?
+                 AND recurrence_rule IS NULL
                ORDER BY start_datetime""",
-            (date_start, date_end)
+            (toEpoch(start), toEpoch(end))
+        )
+        
+        return self._loadAppointments(Appointment, cursor.fetchall(), projection)
+    
+    def iterAppointments(self, start=None, end=None, category_ids: Optional[Iterable[int]] = None,
+                         batch_size: int = APPOINTMENT_PAGE_SIZE,
+                         cursor_token: Optional[str] = None,
+                         projection: str = PROJECTION_FULL) -> Iterator[Appointment]:
+        """Parcourt les rendez-vous simples de [start, end[ page par page
+        
+        Pagination par clé sur (start_datetime, id) : chaque page reprend
+        strictement après la dernière ligne lue, en suivant l'index des
+        horaires, et un seul lot est gardé en mémoire. ``cursor_token`` (voir
+        pagination.cursorToken) reprend un parcours juste après le rendez-vous
+        qui l'a produit. Bornes None : pas de limite.
+        """
+        if batch_size <= 0:
+            raise ValueError("La taille de page doit être strictement positive")
+        
+        # (début, id) > (start, -1) équivaut à début >= start : les id sont positifs
+        key = parseCursorToken(cursor_token) if cursor_token else (
+            toEpoch(start) if start is not None else -(1 << 62), -1
+        )
+        if cursor_token and start is not None:
+            key = max(key, (toEpoch(start), -1))
+        upper = toEpoch(end) if end is not None else 1 << 62
+        
+        category_filter = ""
+        filter_params = ()
+        if category_ids is not None:
+            filter_params = tuple(category_ids)
+            # « +category_id » écarte l'index des catégories : l'ordre de
+            # l'index des horaires évite de trier toute la catégorie à chaque page
+            category_filter = f"AND +category_id IN ({', '.join('?' * len(filter_params))})"
+        
+        query = f"""SELECT {_appointmentColumns(projection)} FROM appointments
+                   WHERE (start_datetime, id) > (?, ?) AND start_datetime < ?
+                     AND recurrence_rule IS NULL {category_filter}
+                   ORDER BY start_datetime, id
+                   LIMIT ?"""
+        
+        while True:
+            rows = self.connection.execute(query, (*key, upper, *filter_params, batch_size)).fetchall()
+            yield from self._loadAppointments(Appointment, rows, projection)
+            
+            if len(rows) < batch_size:
+                return
+            key = (rows[-1][3], rows[-1][0])
+    
+    def getTimeColumns(self, start, end) -> List[Tuple[int, int, int, int]]:
+        """Récupère (début, fin, catégorie, sous-catégorie ou -1) des rendez-vous simples de [start, end[
+        
+        Horaires en secondes depuis l'époque, sans construction d'objets :
+        destiné aux agrégations en colonnes (voir AnalyticsService).
+        """
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """SELECT start_datetime, end_datetime, category_id, COALESCE(subcategory_id, -1)
+               FROM appointments
+               WHERE start_datetime >= ? AND start_datetime < ?
+                 AND recurrence_rule IS NULL""",
+            (toEpoch(start), toEpoch(end))
+        )
+        
+        return cursor.fetchall()
+    
+    def getAppointmentsWithCategory(self, start, end,
+                                    projection: str = PROJECTION_FULL) -> List[AppointmentDetails]:
+        """Récupère les rendez-vous simples commençant dans [start, end[ avec leur catégorie
+        
+        Les noms et couleurs de la catégorie et de la sous-catégorie sont
+        obtenus par jointure dans la même requête.
+        """
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            f"""SELECT {_prefixedColumns(_appointmentColumns(projection), "a")},
+                       c.name, c.color, s.name, s.color
+               FROM appointments a
+               LEFT JOIN categories c ON c.id = a.category_id
+               LEFT JOIN subcategories s ON s.id = a.subcategory_id
+               WHERE a.start_datetime >= ? AND a.start_datetime < ?
+                 AND a.recurrence_rule IS NULL
+               ORDER BY a.start_datetime""",
+            (toEpoch(start), toEpoch(end))
+        )
+        
+        return self._loadAppointments(AppointmentDetails, cursor.fetchall(), projection)
+    
+    def getRecurringSeries(self, end, projection: str = PROJECTION_FULL) -> List[AppointmentDetails]:
+        """Récupère les modèles des séries récurrentes commençant avant end
+        
+        Chaque modèle porte sa règle RRULE et les noms et couleurs de sa
+        catégorie ; ses occurrences sont calculées par le service.
+        """
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            f"""SELECT {_prefixedColumns(_appointmentColumns(projection), "a")},
+                       c.name, c.color, s.name, s.color
+               FROM appointments a
+               LEFT JOIN categories c ON c.id = a.category_id
+               LEFT JOIN subcategories s ON s.id = a.subcategory_id
+               WHERE a.recurrence_rule IS NOT NULL AND a.start_datetime < ?
+               ORDER BY a.start_datetime""",
+            (toEpoch(end),)
+        )
+        
+        return self._loadAppointments(AppointmentDetails, cursor.fetchall(), projection)
+    
+    def getLongestSeriesDuration(self) -> int:
+        """Retourne la durée (en secondes) de la plus longue occurrence de série, 0 sans série"""
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """SELECT MAX(end_datetime - start_datetime)
+               FROM appointments
+               WHERE recurrence_rule IS NOT NULL"""
+        )
+        
+        return cursor.fetchone()[0] or 0
+    
+    def iterExportRows(self, start=None, end=None) -> Iterator[tuple]:
+        """Génère les lignes brutes à exporter, sans les charger en mémoire
+        
+        Chaque ligne contient (id, titre, description, début, fin, règle,
+        catégorie, sous-catégorie, exceptions) : horaires en secondes depuis
+        l'époque, exceptions séparées par des virgules. Les séries commençant
+        avant ``end`` sont générées en premier, puis les rendez-vous simples
+        commençant dans [start, end[ par ordre chronologique (bornes None :
+        pas de limite). Les deux lectures suivent un index : aucun tri en
+        mémoire, les lignes sont lues du curseur au fil de l'itération.
+        """
+        lower = toEpoch(start) if start is not None else -(1 << 62)
+        upper = toEpoch(end) if end is not None else 1 << 62
+        joins = """FROM appointments a
+               LEFT JOIN categories c ON c.id = a.category_id
+               LEFT JOIN subcategories s ON s.id = a.subcategory_id"""
+        
+        # Curseurs dédiés : l'appelant peut lire la base pendant l'itération
+        series_cursor = self.connection.execute(
+            f"""SELECT {EXPORT_COLUMNS} {joins}
+               WHERE a.recurrence_rule IS NOT NULL AND a.start_datetime < ?
+               ORDER BY a.start_datetime""",
+            (upper,)
+        )
+        yield from series_cursor
+        
+        cursor = self.connection.execute(
+            f"""SELECT {EXPORT_COLUMNS} {joins}
+               WHERE a.start_datetime >= ? AND a.start_datetime < ?
+                 AND a.recurrence_rule IS NULL
+               ORDER BY a.start_datetime""",
+            (lower, upper)
+        )
+        yield from cursor
+    
+    def getSeriesExceptions(self, series_id: int) -> List[datetime]:
+        """Récupère les débuts des occurrences retirées d'une série"""
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """SELECT occurrence_start FROM appointment_exceptions
+               WHERE appointment_id = ? ORDER BY occurrence_start""",
+            (series_id,)
+        )
+        
+        return [fromEpoch(row[0]) for row in cursor.fetchall()]
+    
+    def addSeriesException(self, series_id: int, occurrence_start: datetime):
+        """Retire une occurrence d'une série"""
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """INSERT OR IGNORE INTO appointment_exceptions (appointment_id, occurrence_start)
+               VALUES (?, ?)""",
+            (series_id, toEpoch(occurrence_start))
         )
+        
+        self._commit()
+    
+    def getOverlappingAppointments(self, start, end, exclude_id: Optional[int] = None,
+                                   limit: Optional[int] = None,
+                                   projection: str = PROJECTION_FULL) -> List[Appointment]:
+        """Récupère les rendez-vous qui chevauchent l'intervalle [start, end[
+        
+        La recherche passe par l'index R*Tree ``appointments_rtree`` : son coût
+        ne dépend pas de la longueur de la plage ni du jour de début des
+        rendez-vous (un rendez-vous de la veille qui déborde est trouvé).
+        Les modèles de séries sont exclus : seules leurs occurrences, calculées
+        par le service, occupent l'agenda.
+        """
+        cursor = self.connection.cursor()
+        start_epoch, end_epoch = toEpoch(start), toEpoch(end)
+        
+        # Le R*Tree sélectionne les candidats, les colonnes exactes tranchent
+        cursor.execute(
+            f"""SELECT {_prefixedColumns(_appointmentColumns(projection), "a")}
+               FROM appointments_rtree r
+               JOIN appointments a ON a.id = r.id
+               WHERE r.start_time <= ? AND r.end_time >= ?
+                 AND a.start_datetime < ? AND a.end_datetime > ?
+                 AND a.recurrence_rule IS NULL
+                 AND a.id IS NOT ?
+               ORDER BY a.start_datetime
+               LIMIT ?""",
+            (end_epoch, start_epoch, end_epoch, start_epoch, exclude_id,
+             -1 if limit is None else limit)
+        )
+        
+        return self._loadAppointments(Appointment, cursor.fetchall(), projection)
+    
+    def getConflictingPairs(self, start, end,
+                            projection: str = PROJECTION_FULL) -> List[Tuple[Appointment, Appointment]]:
+        """Récupère en une requête toutes les paires de rendez-vous en conflit
+        
+        Une paire est retournée lorsque les deux rendez-vous se chevauchent et
+        chevauchent tous deux la plage [start, end[. Chaque paire n'apparaît
+        qu'une fois, triée par début du premier rendez-vous. Les modèles de
+        séries sont exclus (voir getOverlappingAppointments).
+        """
+        cursor = self.connection.cursor()
+        start_epoch, end_epoch = toEpoch(start), toEpoch(end)
+        columns = _appointmentColumns(projection)
+        
+        # Auto-jointure sur le R*Tree : chaque candidat de la plage est comparé
+        # aux seuls intervalles qui le recoupent
+        cursor.execute(
+            f"""SELECT {_prefixedColumns(columns, "a")},
+                       {_prefixedColumns(columns, "b")}
+               FROM appointments_rtree ra
+               JOIN appointments_rtree rb
+                 ON rb.start_time <= ra.end_time AND rb.end_time >= ra.start_time
+                AND rb.id > ra.id
+               JOIN appointments a ON a.id = ra.id
+               JOIN appointments b ON b.id = rb.id
+               WHERE ra.start_time <= ? AND ra.end_time >= ?
+                 AND a.start_datetime < ? AND a.end_datetime > ?
+                 AND b.start_datetime < ? AND b.end_datetime > ?
+                 AND a.recurrence_rule IS NULL AND b.recurrence_rule IS NULL
+                 AND a.start_datetime < b.end_datetime AND b.start_datetime < a.end_datetime
+               ORDER BY a.start_datetime, b.start_datetime""",
+            (end_epoch, start_epoch, end_epoch, start_epoch, end_epoch, start_epoch)
+        )
+        
         rows = cursor.fetchall()
+        firsts = self._loadAppointments(Appointment, (row[:APPOINTMENT_COLUMN_COUNT] for row in rows), projection)
+        seconds = self._loadAppointments(Appointment, (row[APPOINTMENT_COLUMN_COUNT:] for row in rows), projection)
+        return list(zip(firsts, seconds))
+    
+    def searchAppointments(self, match_query: str, limit: int,
+                           start=None, end=None) -> List[Appointment]:
+        """Recherche plein texte (syntaxe MATCH de FTS5), triée par pertinence BM25
         
-        return [
-            Appointment(
-                id=row["id"],
-                title=row["title"],
-                description=row["description"],
-                start_datetime=datetime.fromisoformat(row["start_datetime"]),
-                end_datetime=datetime.fromisoformat(row["end_datetime"]),
-                category_id=row["category_id"],
-                subcategory_id=row["subcategory_id"]
-            )
-            for row in rows
-        ]
+        Les bornes optionnelles restreignent les résultats aux rendez-vous
+        commençant dans [start, end[.
+        """
+        cursor = self.connection.cursor()
+        
+        joins = ""
+        conditions = ["appointments_fts MATCH ?"]
+        params = [match_query]
+        if start is not None or end is not None:
+            joins = "JOIN appointments r ON r.id = f.rowid"
+            if start is not None:
+                conditions.append("r.start_datetime >= ?")
+                params.append(toEpoch(start))
+            if end is not None:
+                conditions.append("r.start_datetime < ?")
+                params.append(toEpoch(end))
+        params.append(limit)
+        
+        # Le classement est fait dans la table FTS ; seules les lignes retenues
+        # sont relues dans appointments. Un mot trouvé dans le titre pèse plus
+        # qu'un mot de la description.
+        cursor.execute(
+            f"""SELECT {_prefixedColumns(APPOINTMENT_COLUMNS, "a")}
+               FROM (
+                   SELECT f.rowid AS id, bm25(appointments_fts, 5.0, 1.0) AS score
+                   FROM appointments_fts f {joins}
+                   WHERE {" AND ".join(conditions)}
+                   ORDER BY score
+                   LIMIT ?
+               ) matches
+               JOIN appointments a ON a.id = matches.id
+               ORDER BY matches.score, a.start_datetime""",
+            params
+        )
+        
+        return self.identity_map.loadAll(Appointment, cursor.fetchall())
+    
+    def getAppointmentCountsByDay(self, year: int, month: int) -> Dict[date, int]:
+        """Compte les rendez-vous simples de chaque jour d'un mois en une seule requête
+        
+        Les jours sans rendez-vous sont absents du dictionnaire retourné ; les
+        occurrences des séries récurrentes sont ajoutées par le service.
+        """
+        cursor = self.connection.cursor()
+        
+        month_start = date(year, month, 1)
+        next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+        
+        # Lecture de la synthèse quotidienne : au plus un jour par catégorie
+        cursor.execute(
+            """SELECT day, SUM(appointment_count)
+               FROM daily_summary
+               WHERE day >= ? AND day < ?
+               GROUP BY day""",
+            (toEpoch(month_start), toEpoch(next_month))
+        )
+        rows = cursor.fetchall()
+        
+        return {fromEpoch(day).date(): total for day, total in rows}
+    
+    def getDailySummary(self, start, end) -> List[Tuple[date, int, int, int]]:
+        """Récupère la synthèse (jour, catégorie, nombre, durée en secondes) des jours de [start, end["""
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """SELECT day, category_id, appointment_count, total_seconds
+               FROM daily_summary
+               WHERE day >= ? AND day < ?
+               ORDER BY day, category_id""",
+            (toEpoch(start), toEpoch(end))
+        )
+        
+        return [(fromEpoch(day).date(), category_id, count, seconds)
+                for day, category_id, count, seconds in cursor.fetchall()]
+    
+    def getDailyTotals(self, start, end) -> Dict[date, Tuple[int, int]]:
+        """Totalise par jour (nombre, durée en secondes) les rendez-vous simples des jours de [start, end[
+        
+        Une lecture de la synthèse quotidienne, dans l'ordre de sa clé
+        primaire : au plus une ligne par jour et par catégorie, quel que soit
+        le nombre de rendez-vous.
+        """
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """SELECT day, SUM(appointment_count), SUM(total_seconds)
+               FROM daily_summary
+               WHERE day >= ? AND day < ?
+               GROUP BY day""",
+            (toEpoch(start), toEpoch(end))
+        )
+        
+        return {fromEpoch(day).date(): (count, seconds) for day, count, seconds in cursor.fetchall()}
+    
+    def getCategoryTotals(self, start, end) -> Dict[int, Tuple[int, int]]:
+        """Totalise par catégorie (nombre, durée en secondes) les jours de [start, end["""
+        cursor = self.connection.cursor()
+        
+        cursor.execute(
+            """SELECT category_id, SUM(appointment_count), SUM(total_seconds)
+               FROM daily_summary
+               WHERE day >= ? AND day < ?
+               GROUP BY category_id""",
+            (toEpoch(start), toEpoch(end))
+        )
+        
+        return {category_id: (count, seconds) for category_id, count, seconds in cursor.fetchall()}
+    
+    def rebuildDailySummary(self) -> int:
+        """Recalcule la synthèse quotidienne et retourne son nombre de lignes"""
+        cursor = self.connection.cursor()
+        fillDailySummary(cursor)
+        self._commit()
+        
+        cursor.execute("SELECT COUNT(*) FROM daily_summary")
+        return cursor.fetchone()[0]
+    
+    def _appointmentValues(self, appointment: Appointment) -> tuple:
+        """Retourne les valeurs d'un rendez-vous dans l'ordre des colonnes écrites"""
+        return (
+            appointment.title,
+            appointment.description,
+            appointment.start_epoch,
+            appointment.end_epoch,
+            appointment.category_id,
+            appointment.subcategory_id,
+            appointment.recurrence_rule or None
+        )
     
     def updateAppointment(self, appointment: Appointment) -> bool:
         """Met à jour un rendez-vous existant"""
@@ -198,21 +804,62 @@ class DatabaseManager:
         cursor.execute(
             """UPDATE appointments SET 
                title = ?, description = ?, start_datetime = ?, end_datetime = ?,
-               category_id = ?, subcategory_id = ?
+               category_id = ?, subcategory_id = ?, recurrence_rule = ?
+               WHERE id = ?""",
+            self._appointmentValues(appointment) + (appointment.id,)
+        )
+        
+        self._commit()
+        # Les instances déjà remises ne sont pas modifiées (voir IdentityMap)
+        self.identity_map.discard(appointment.id)
+        return cursor.rowcount > 0
+    
+    def updateAppointments(self, appointments: Iterable[Appointment]) -> int:
+        """Met à jour un lot de rendez-vous en une seule requête préparée
+        
+        Retourne le nombre de rendez-vous effectivement modifiés.
+        """
+        cursor = self.connection.cursor()
+        appointments = list(appointments)
+        
+        cursor.executemany(
+            """UPDATE appointments SET 
+               title = ?, description = ?, start_datetime = ?, end_datetime = ?,
+               category_id = ?, subcategory_id = ?, recurrence_rule = ?
                WHERE id = ?""",
             (
-                appointment.title,
-                appointment.description,
-                appointment.start_datetime.isoformat(),
-                appointment.end_datetime.isoformat(),
-                appointment.category_id,
-                appointment.subcategory_id,
-                appointment.id
+                self._appointmentValues(appointment) + (appointment.id,)
+                for appointment in appointments
             )
         )
         
-        self.connection.commit()
-        return cursor.rowcount > 0
+        self._commit()
+        for appointment in appointments:
+            self.identity_map.discard(appointment.id)
+        return max(cursor.rowcount, 0)
+    
+    def _loadAppointments(self, cls: Type, rows: Iterable[tuple], projection: str) -> List:
+        """Construit les rendez-vous des lignes lues ; description différée en projection summary
+        
+        Une ligne summary identique, description mise à part, à une instance
+        déjà chargée retourne cette instance telle quelle : sa description
+        n'est jamais différée à nouveau.
+        """
+        if projection != PROJECTION_SUMMARY:
+            return self.identity_map.loadAll(cls, rows)
+        
+        appointments = []
+        for row in rows:
+            known = self.identity_map.get(cls, row[0])
+            if known is not None and known.rowValues(include_description=False) == row:
+                appointments.append(known)
+                continue
+            
+            # Nouvelle instance, pas encore remise : elle peut être complétée
+            appointment = self.identity_map.replace(cls, row)
+            appointment.deferDescription(self.getAppointmentDescription)
+            appointments.append(appointment)
+        return appointments
     
     def deleteAppointment(self, appointment_id: int) -> bool:
         """Supprime un rendez-vous"""
@@ -220,7 +867,8 @@ class DatabaseManager:
         
         cursor.execute("DELETE FROM appointments WHERE id = ?", (appointment_id,))
         
-        self.connection.commit()
+        self._commit()
+        self.identity_map.discard(appointment_id)
         return cursor.rowcount > 0
     
     def close(self):
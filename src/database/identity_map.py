@@ -0,0 +1,72 @@
+"""Carte d'identité des objets chargés depuis la base"""
+
+import weakref
+from typing import Iterable, List, Optional, Set, Type
+
+
+class IdentityMap:
+    """Associe chaque ligne à une instance unique tant qu'elle est utilisée
+    
+    Les instances sont indexées par (classe, id) et référencées faiblement :
+    une instance qui n'est plus utilisée par aucune vue ni aucun cache sort
+    de la carte automatiquement. Relire une ligne inchangée retourne
+    l'instance existante.
+    
+    Contrat de threads : la carte n'est utilisée que par le thread qui
+    possède la connexion (le thread de travail de BackgroundExecutor), alors
+    que les vues lisent les instances sur le thread Tk. Une instance remise
+    à un appelant n'est donc jamais modifiée par la carte : une ligne relue
+    avec d'autres valeurs, ou réécrite, donne une nouvelle instance qui
+    remplace l'ancienne dans la carte. Les détenteurs de l'ancienne gardent
+    un instantané cohérent jusqu'à leur prochaine lecture (les caches du
+    service sont invalidés à chaque écriture). Seules les valeurs dérivées
+    calculées à la demande (datetimes, description différée) sont complétées
+    en place ; elles ne changent pas les valeurs de la ligne.
+    """
+    
+    def __init__(self):
+        self._instances = weakref.WeakValueDictionary()
+        self._classes: Set[type] = set()
+    
+    def load(self, cls: Type, row: tuple):
+        """Retourne l'instance de la ligne (id en première colonne)
+        
+        L'instance existante est réutilisée si la ligne est inchangée ; sinon
+        une nouvelle instance la remplace (l'ancienne n'est pas modifiée).
+        """
+        instance = self._instances.get((cls, row[0]))
+        if instance is not None and instance.rowValues() == tuple(row):
+            return instance
+        return self.replace(cls, row)
+    
+    def replace(self, cls: Type, row: tuple):
+        """Crée l'instance d'une ligne et la substitue à celle déjà en carte"""
+        instance = cls.fromRow(row)
+        self._instances[(cls, row[0])] = instance
+        self._classes.add(cls)
+        return instance
+    
+    def loadAll(self, cls: Type, rows: Iterable[tuple]) -> List:
+        """Retourne les instances d'une suite de lignes"""
+        load = self.load
+        return [load(cls, row) for row in rows]
+    
+    def get(self, cls: Type, object_id: int) -> Optional[object]:
+        """Retourne l'instance déjà chargée pour cet id, ou None"""
+        return self._instances.get((cls, object_id))
+    
+    def discard(self, object_id: int):
+        """Oublie toutes les instances de cet id (ligne réécrite ou supprimée)
+        
+        Les instances déjà remises restent inchangées ; la prochaine lecture
+        crée de nouvelles instances à partir de la base.
+        """
+        for cls in self._classes:
+            self._instances.pop((cls, object_id), None)
+    
+    def clear(self):
+        """Oublie toutes les instances (après une annulation de transaction)"""
+        self._instances.clear()
+    
+    def __len__(self) -> int:
+        return len(self._instances)
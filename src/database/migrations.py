@@ -0,0 +1,466 @@
+"""Migrations versionnées du schéma de la base de données
+
+La version du schéma est stockée dans ``PRAGMA user_version``. Les tables de
+base (version 0) sont créées par ``DatabaseManager.initializeDatabase`` ; chaque
+migration fait ensuite évoluer le schéma d'une version à la suivante, ce qui
+permet de mettre à jour en place un fichier ``calendar_data.db`` existant.
+"""
+
+import sqlite3
+from typing import Callable, List
+
+
+class Migration:
+    """Représente une étape de migration du schéma"""
+    
+    def __init__(self, version: int, description: str, upgrade: Callable):
+        self.version = version
+        self.description = description
+        self.upgrade = upgrade
+    
+    def __str__(self) -> str:
+        return f"Migration(version={self.version}, description='{self.description}')"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _dayKey(column: str) -> str:
+    """Expression SQL du jour (minuit, en secondes depuis l'époque) d'un horaire
+    
+    Le % de SQLite tronque vers zéro : le reste est ramené dans [0, 86400[
+    pour arrondir vers le bas, comme epochToDate, y compris avant 1970.
+    """
+    return f"{column} - (({column} % 86400) + 86400) % 86400"
+
+
+# Triggers d'insertion des structures dérivées des rendez-vous (R*Tree, index
+# plein texte, synthèse quotidienne). DatabaseManager.deferredIndexes les
+# retire pendant un chargement massif puis appelle indexNewAppointments.
+INSERT_TRIGGERS = {
+    "appointments_rtree_insert": """
+        CREATE TRIGGER IF NOT EXISTS appointments_rtree_insert
+        AFTER INSERT ON appointments
+        BEGIN
+            INSERT INTO appointments_rtree (id, start_time, end_time)
+            VALUES (new.id, MIN(new.start_datetime, new.end_datetime),
+                    MAX(new.start_datetime, new.end_datetime));
+        END
+    """,
+    "appointments_fts_insert": """
+        CREATE TRIGGER IF NOT EXISTS appointments_fts_insert
+        AFTER INSERT ON appointments
+        BEGIN
+            INSERT INTO appointments_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+    "daily_summary_insert": f"""
+        CREATE TRIGGER IF NOT EXISTS daily_summary_insert
+        AFTER INSERT ON appointments
+        WHEN new.recurrence_rule IS NULL
+        BEGIN
+            INSERT INTO daily_summary (day, category_id, appointment_count, total_seconds)
+            VALUES ({_dayKey("new.start_datetime")}, new.category_id,
+                    1, new.end_datetime - new.start_datetime)
+            ON CONFLICT (day, category_id) DO UPDATE SET
+                appointment_count = appointment_count + 1,
+                total_seconds = total_seconds + excluded.total_seconds;
+        END
+    """,
+}
+
+
+def indexNewAppointments(cursor: sqlite3.Cursor, after_id: int):
+    """Indexe en requêtes ensemblistes les rendez-vous d'ID supérieur à after_id"""
+    cursor.execute("""
+        INSERT INTO appointments_rtree (id, start_time, end_time)
+        SELECT id, MIN(start_datetime, end_datetime), MAX(start_datetime, end_datetime)
+        FROM appointments
+        WHERE id > ?
+    """, (after_id,))
+    cursor.execute("""
+        INSERT INTO appointments_fts (rowid, title, description)
+        SELECT id, title, description
+        FROM appointments
+        WHERE id > ?
+    """, (after_id,))
+    cursor.execute(f"""
+        INSERT INTO daily_summary (day, category_id, appointment_count, total_seconds)
+        SELECT {_dayKey("start_datetime")}, category_id,
+               COUNT(*), SUM(end_datetime - start_datetime)
+        FROM appointments
+        WHERE id > ? AND recurrence_rule IS NULL
+        GROUP BY 1, 2
+        ON CONFLICT (day, category_id) DO UPDATE SET
+            appointment_count = appointment_count + excluded.appointment_count,
+            total_seconds = total_seconds + excluded.total_seconds
+    """, (after_id,))
+
+
+def _createForeignKeyIndexes(cursor: sqlite3.Cursor):
+    """Index sur les clés étrangères utilisées pour filtrer les rendez-vous"""
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_appointments_category ON appointments (category_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_appointments_subcategory ON appointments (subcategory_id)"
+    )
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_subcategories_category ON subcategories (category_id)"
+    )
+
+
+def _createTimeRangeIndex(cursor: sqlite3.Cursor):
+    """Index composite (début, fin) pour les recherches par date et les chevauchements"""
+    # Le préfixe start_datetime sert aussi les recherches par jour et par plage
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_appointments_time_range
+           ON appointments (start_datetime, end_datetime)"""
+    )
+
+
+def _storeTimesAsEpoch(cursor: sqlite3.Cursor):
+    """Stocke les horaires en secondes depuis l'époque (INTEGER) au lieu de texte ISO"""
+    columns = {row[1]: row[2] for row in cursor.execute("PRAGMA table_info(appointments)")}
+    if columns.get("start_datetime", "").upper() == "INTEGER":
+        return
+    
+    # SQLite ne permet pas de changer le type d'une colonne : la table est
+    # reconstruite. strftime('%s') interprète l'heure ISO naïve comme UTC, ce
+    # qui correspond à la convention de src.utils.epoch.
+    cursor.execute("""
+        CREATE TABLE appointments_epoch (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            description TEXT,
+            start_datetime INTEGER NOT NULL,
+            end_datetime INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            subcategory_id INTEGER,
+            FOREIGN KEY (category_id) REFERENCES categories (id),
+            FOREIGN KEY (subcategory_id) REFERENCES subcategories (id)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO appointments_epoch
+            (id, title, description, start_datetime, end_datetime, category_id, subcategory_id)
+        SELECT id, title, description,
+               CAST(strftime('%s', start_datetime) AS INTEGER),
+               CAST(strftime('%s', end_datetime) AS INTEGER),
+               category_id, subcategory_id
+        FROM appointments
+    """)
+    cursor.execute("DROP TABLE appointments")
+    cursor.execute("ALTER TABLE appointments_epoch RENAME TO appointments")
+    
+    # Les index ont disparu avec l'ancienne table
+    _createForeignKeyIndexes(cursor)
+    _createTimeRangeIndex(cursor)
+
+
+def _createTimeRangeRtree(cursor: sqlite3.Cursor):
+    """Index R*Tree des intervalles [début, fin] des rendez-vous, tenu à jour par triggers"""
+    # Un R*Tree exige min <= max : les rendez-vous dont la fin précède le début
+    # sont indexés sur leur intervalle réordonné. Les coordonnées sont stockées
+    # en flottants 32 bits, arrondis vers l'extérieur : l'index renvoie un
+    # sur-ensemble que les requêtes filtrent ensuite sur les colonnes exactes.
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS appointments_rtree
+        USING rtree(id, start_time, end_time)
+    """)
+    cursor.execute("""
+        INSERT OR REPLACE INTO appointments_rtree (id, start_time, end_time)
+        SELECT id, MIN(start_datetime, end_datetime), MAX(start_datetime, end_datetime)
+        FROM appointments
+    """)
+    cursor.execute(INSERT_TRIGGERS["appointments_rtree_insert"])
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS appointments_rtree_update
+        AFTER UPDATE OF id, start_datetime, end_datetime ON appointments
+        BEGIN
+            DELETE FROM appointments_rtree WHERE id = old.id;
+            INSERT INTO appointments_rtree (id, start_time, end_time)
+            VALUES (new.id, MIN(new.start_datetime, new.end_datetime),
+                    MAX(new.start_datetime, new.end_datetime));
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS appointments_rtree_delete
+        AFTER DELETE ON appointments
+        BEGIN
+            DELETE FROM appointments_rtree WHERE id = old.id;
+        END
+    """)
+
+
+def _createFullTextIndex(cursor: sqlite3.Cursor):
+    """Index plein texte FTS5 sur le titre et la description, tenu à jour par triggers"""
+    # Table à contenu externe : le texte n'est pas dupliqué, seul l'index est
+    # stocké. Les index de préfixes (2 et 3 caractères) accélèrent la
+    # recherche pendant la saisie.
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS appointments_fts USING fts5(
+            title, description,
+            content='appointments', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+    cursor.execute("INSERT INTO appointments_fts (appointments_fts) VALUES ('rebuild')")
+    cursor.execute(INSERT_TRIGGERS["appointments_fts_insert"])
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS appointments_fts_update
+        AFTER UPDATE OF id, title, description ON appointments
+        BEGIN
+            INSERT INTO appointments_fts (appointments_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO appointments_fts (rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS appointments_fts_delete
+        AFTER DELETE ON appointments
+        BEGIN
+            INSERT INTO appointments_fts (appointments_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """)
+
+
+def _addRecurrence(cursor: sqlite3.Cursor):
+    """Règle de récurrence (RRULE) sur les rendez-vous et table des occurrences exclues"""
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(appointments)")]
+    if "recurrence_rule" not in columns:
+        cursor.execute("ALTER TABLE appointments ADD COLUMN recurrence_rule TEXT")
+    
+    # Occurrences retirées d'une série (EXDATE), par début d'occurrence
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS appointment_exceptions (
+            appointment_id INTEGER NOT NULL,
+            occurrence_start INTEGER NOT NULL,
+            PRIMARY KEY (appointment_id, occurrence_start),
+            FOREIGN KEY (appointment_id) REFERENCES appointments (id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS appointment_exceptions_cleanup
+        AFTER DELETE ON appointments
+        BEGIN
+            DELETE FROM appointment_exceptions WHERE appointment_id = old.id;
+        END
+    """)
+    
+    # Les modèles de série ne sont jamais lus comme des rendez-vous simples :
+    # l'index des horaires ne couvre que ces derniers (et reste couvrant pour
+    # les comptages par jour), un second index sert la recherche des séries.
+    cursor.execute("DROP INDEX IF EXISTS idx_appointments_time_range")
+    cursor.execute(
+        """CREATE INDEX idx_appointments_time_range
+           ON appointments (start_datetime, end_datetime)
+           WHERE recurrence_rule IS NULL"""
+    )
+    cursor.execute(
+        """CREATE INDEX IF NOT EXISTS idx_appointments_series
+           ON appointments (start_datetime)
+           WHERE recurrence_rule IS NOT NULL"""
+    )
+
+
+def fillDailySummary(cursor: sqlite3.Cursor):
+    """Recalcule entièrement la table daily_summary à partir des rendez-vous simples"""
+    cursor.execute("DELETE FROM daily_summary")
+    cursor.execute(f"""
+        INSERT INTO daily_summary (day, category_id, appointment_count, total_seconds)
+        SELECT {_dayKey("start_datetime")}, category_id,
+               COUNT(*), SUM(end_datetime - start_datetime)
+        FROM appointments
+        WHERE recurrence_rule IS NULL
+        GROUP BY 1, 2
+    """)
+
+
+def _createDailySummary(cursor: sqlite3.Cursor):
+    """Table de synthèse par jour et par catégorie, tenue à jour par triggers"""
+    # Un rendez-vous compte pour le jour de son début (minuit, en secondes
+    # depuis l'époque). Les modèles de séries récurrentes n'y figurent pas :
+    # leurs occurrences sont calculées par le service.
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS daily_summary (
+            day INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            appointment_count INTEGER NOT NULL,
+            total_seconds INTEGER NOT NULL,
+            PRIMARY KEY (day, category_id)
+        ) WITHOUT ROWID
+    """)
+    fillDailySummary(cursor)
+    
+    cursor.execute(INSERT_TRIGGERS["daily_summary_insert"])
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_summary_update
+        AFTER UPDATE OF start_datetime, end_datetime, category_id, recurrence_rule ON appointments
+        BEGIN
+            UPDATE daily_summary
+            SET appointment_count = appointment_count - 1,
+                total_seconds = total_seconds - (old.end_datetime - old.start_datetime)
+            WHERE day = {_dayKey("old.start_datetime")}
+              AND category_id = old.category_id
+              AND old.recurrence_rule IS NULL;
+            DELETE FROM daily_summary
+            WHERE day = {_dayKey("old.start_datetime")}
+              AND category_id = old.category_id
+              AND appointment_count = 0;
+            INSERT INTO daily_summary (day, category_id, appointment_count, total_seconds)
+            SELECT {_dayKey("new.start_datetime")}, new.category_id,
+                   1, new.end_datetime - new.start_datetime
+            WHERE new.recurrence_rule IS NULL
+            ON CONFLICT (day, category_id) DO UPDATE SET
+                appointment_count = appointment_count + 1,
+                total_seconds = total_seconds + excluded.total_seconds;
+        END
+    """)
+    cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS daily_summary_delete
+        AFTER DELETE ON appointments
+        WHEN old.recurrence_rule IS NULL
+        BEGIN
+            UPDATE daily_summary
+            SET appointment_count = appointment_count - 1,
+                total_seconds = total_seconds - (old.end_datetime - old.start_datetime)
+            WHERE day = {_dayKey("old.start_datetime")}
+              AND category_id = old.category_id;
+            DELETE FROM daily_summary
+            WHERE day = {_dayKey("old.start_datetime")}
+              AND category_id = old.category_id
+              AND appointment_count = 0;
+        END
+    """)
+
+
+def _addKeysetIndex(cursor: sqlite3.Cursor):
+    """Index des horaires ordonné par (début, id) pour la pagination par clé"""
+    # L'id est placé juste après le début : un parcours ordonné sur
+    # (start_datetime, id) suit l'index sans tri, et la fin reste en dernière
+    # colonne pour que l'index couvre toujours les lectures des horaires.
+    cursor.execute("DROP INDEX IF EXISTS idx_appointments_time_range")
+    cursor.execute(
+        """CREATE INDEX idx_appointments_time_range
+           ON appointments (start_datetime, id, end_datetime)
+           WHERE recurrence_rule IS NULL"""
+    )
+
+
+def _moveDescriptionLast(cursor: sqlite3.Cursor):
+    """Description en dernière colonne : les autres colonnes restent dans la page de la ligne"""
+    # SQLite range les colonnes dans l'ordre de la table : derrière une
+    # longue description, les horaires et la catégorie débordaient sur des
+    # pages de débordement, lues même quand la description n'est pas demandée.
+    columns = [row[1] for row in cursor.execute("PRAGMA table_info(appointments)")]
+    if columns[-1] == "description":
+        return
+    
+    # Index et triggers disparaissent avec la table : leur SQL est réexécuté
+    dependents = [row[0] for row in cursor.execute(
+        """SELECT sql FROM sqlite_master
+           WHERE tbl_name = 'appointments' AND type IN ('index', 'trigger') AND sql IS NOT NULL"""
+    )]
+    cursor.execute("""
+        CREATE TABLE appointments_reordered (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            start_datetime INTEGER NOT NULL,
+            end_datetime INTEGER NOT NULL,
+            category_id INTEGER NOT NULL,
+            subcategory_id INTEGER,
+            recurrence_rule TEXT,
+            description TEXT,
+            FOREIGN KEY (category_id) REFERENCES categories (id),
+            FOREIGN KEY (subcategory_id) REFERENCES subcategories (id)
+        )
+    """)
+    cursor.execute("""
+        INSERT INTO appointments_reordered
+            (id, title, start_datetime, end_datetime, category_id, subcategory_id,
+             recurrence_rule, description)
+        SELECT id, title, start_datetime, end_datetime, category_id, subcategory_id,
+               recurrence_rule, description
+        FROM appointments
+    """)
+    cursor.execute("DROP TABLE appointments")
+    cursor.execute("ALTER TABLE appointments_reordered RENAME TO appointments")
+    
+    for sql in dependents:
+        cursor.execute(sql)
+
+
+def _fixDailySummaryDays(cursor: sqlite3.Cursor):
+    """Recrée les triggers de la synthèse quotidienne avec des jours arrondis vers le bas"""
+    # Les versions précédentes rangeaient un rendez-vous antérieur à 1970
+    # dans le jour suivant ; la synthèse est recalculée avec les triggers.
+    for trigger_name in ("daily_summary_insert", "daily_summary_update", "daily_summary_delete"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger_name}")
+    _createDailySummary(cursor)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Index sur les clés étrangères", _createForeignKeyIndexes),
+    Migration(2, "Index composite sur les horaires des rendez-vous", _createTimeRangeIndex),
+    Migration(3, "Horaires stockés en secondes depuis l'époque", _storeTimesAsEpoch),
+    Migration(4, "Index R*Tree des intervalles des rendez-vous", _createTimeRangeRtree),
+    Migration(5, "Recherche plein texte sur les rendez-vous", _createFullTextIndex),
+    Migration(6, "Rendez-vous récurrents et exceptions", _addRecurrence),
+    Migration(7, "Synthèse quotidienne par catégorie", _createDailySummary),
+    Migration(8, "Index de pagination par clé (début, id)", _addKeysetIndex),
+    Migration(9, "Description en dernière colonne des rendez-vous", _moveDescriptionLast),
+    Migration(10, "Jours de la synthèse quotidienne arrondis vers le bas", _fixDailySummaryDays),
+]
+
+
+class MigrationManager:
+    """Applique les migrations en attente sur une connexion SQLite"""
+    
+    def __init__(self, connection: sqlite3.Connection, migrations: List[Migration] = None):
+        self.connection = connection
+        self.migrations = sorted(migrations or MIGRATIONS, key=lambda m: m.version)
+    
+    def getCurrentVersion(self) -> int:
+        """Retourne la version actuelle du schéma"""
+        return self.connection.execute("PRAGMA user_version").fetchone()[0]
+    
+    def getLatestVersion(self) -> int:
+        """Retourne la version la plus récente disponible"""
+        return self.migrations[-1].version if self.migrations else 0
+    
+    def getPendingMigrations(self) -> List[Migration]:
+        """Retourne les migrations qui restent à appliquer"""
+        current_version = self.getCurrentVersion()
+        return [m for m in self.migrations if m.version > current_version]
+    
+    def migrate(self) -> int:
+        """Applique les migrations en attente et retourne leur nombre"""
+        pending = self.getPendingMigrations()
+        
+        for migration in pending:
+            self.applyMigration(migration)
+        
+        return len(pending)
+    
+    def applyMigration(self, migration: Migration):
+        """Applique une migration dans sa propre transaction"""
+        # Valider un éventuel travail en cours avant d'ouvrir la transaction
+        self.connection.commit()
+        cursor = self.connection.cursor()
+        
+        try:
+            cursor.execute("BEGIN")
+            migration.upgrade(cursor)
+            # PRAGMA user_version est transactionnel : annulé avec la migration
+            cursor.execute(f"PRAGMA user_version = {int(migration.version)}")
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            raise Exception(
+                f"Échec de la migration {migration.version} ({migration.description}): {e}"
+            )
@@ -0,0 +1,25 @@
+"""Jetons de reprise de la pagination par clé (début, id)
+
+Un jeton désigne la position juste après un rendez-vous dans l'ordre
+(start_datetime, id). Il reste valide si des lignes sont ajoutées ou
+supprimées entre deux pages, contrairement à un décalage (OFFSET).
+"""
+
+from typing import Tuple
+from src.models.appointment import Appointment
+
+
+def cursorToken(appointment: Appointment) -> str:
+    """Retourne le jeton permettant de reprendre un parcours après ce rendez-vous"""
+    return f"{appointment.start_epoch}:{appointment.id}"
+
+
+def parseCursorToken(token: str) -> Tuple[int, int]:
+    """Retourne la clé (début en secondes depuis l'époque, id) d'un jeton"""
+    start, separator, appointment_id = token.partition(":")
+    try:
+        if not separator:
+            raise ValueError
+        return int(start), int(appointment_id)
+    except ValueError:
+        raise ValueError(f"Jeton de pagination invalide: {token!r}")
@@ -0,0 +1,65 @@
+"""Profils de performance SQLite
+
+Chaque profil regroupe les pragmas appliqués à l'ouverture de la connexion,
+afin de choisir en un seul paramètre le compromis durabilité/débit.
+"""
+
+import sqlite3
+from typing import Dict
+
+
+PERFORMANCE_PROFILES: Dict[str, Dict[str, object]] = {
+    # Chaque commit est synchronisé sur disque : aucune perte possible
+    "durable": {
+        "journal_mode": "WAL",
+        "synchronous": "FULL",
+        "cache_size": -8000,          # ~8 Mo (valeur négative = Kio)
+        "mmap_size": 0,
+        "temp_store": "DEFAULT",
+        "busy_timeout": 5000,         # ms
+    },
+    # WAL + NORMAL : la base reste cohérente, seuls les derniers commits
+    # peuvent être perdus en cas de coupure de courant
+    "balanced": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "cache_size": -32000,         # ~32 Mo
+        "mmap_size": 128 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+    # Aucune synchronisation : réservé aux imports massifs et aux bases jetables
+    "fast": {
+        "journal_mode": "WAL",
+        "synchronous": "OFF",
+        "cache_size": -128000,        # ~128 Mo
+        "mmap_size": 512 * 1024 * 1024,
+        "temp_store": "MEMORY",
+        "busy_timeout": 5000,
+    },
+}
+
+DEFAULT_PROFILE = "balanced"
+
+
+def validateProfile(profile: str):
+    """Vérifie qu'un profil existe (à appeler avant d'ouvrir la connexion)"""
+    if profile not in PERFORMANCE_PROFILES:
+        raise ValueError(
+            f"Profil de performance inconnu: {profile} "
+            f"(disponibles: {', '.join(PERFORMANCE_PROFILES)})"
+        )
+
+
+def applyPerformanceProfile(connection: sqlite3.Connection, profile: str = DEFAULT_PROFILE):
+    """Applique en une fois tous les pragmas d'un profil à une connexion"""
+    validateProfile(profile)
+    settings = PERFORMANCE_PROFILES[profile]
+    
+    # Le mode de journal doit être fixé avant toute transaction
+    connection.execute(f"PRAGMA journal_mode = {settings['journal_mode']}")
+    connection.execute(f"PRAGMA synchronous = {settings['synchronous']}")
+    connection.execute(f"PRAGMA cache_size = {int(settings['cache_size'])}")
+    connection.execute(f"PRAGMA mmap_size = {int(settings['mmap_size'])}")
+    connection.execute(f"PRAGMA temp_store = {settings['temp_store']}")
+    connection.execute(f"PRAGMA busy_timeout = {int(settings['busy_timeout'])}")
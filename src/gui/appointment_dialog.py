@@ -4,21 +4,31 @@ import customtkinter as ctk
 from datetime import datetime, date, time
 from typing import Optional, Callable, List
 from src.services.category_service import CategoryService
+from src.services.taxonomy_index import TaxonomyIndex
 from src.models.appointment import Appointment
 from src.models.category import Category
 from src.models.subcategory import Subcategory
+from src.gui.background_executor import ImmediateExecutor
+from src.utils.constants import RECURRENCE_PRESETS
 from src.utils.theme import getButtonStyle, getFrameStyle, SIZES, COLORS, FONTS
 
 
+# Portées de la modification d'une occurrence de série
+EDIT_SCOPE_OCCURRENCE = "Cette occurrence"
+EDIT_SCOPE_SERIES = "Toute la série"
+
+
 class AppointmentDialog:
     """Dialogue pour la création et modification de rendez-vous"""
     
     def __init__(self, parent, category_service: CategoryService, 
                  appointment_service, appointment: Optional[Appointment] = None, 
-                 callback: Optional[Callable] = None):
+                 callback: Optional[Callable] = None, executor=None):
         self.parent = parent
         self.category_service = category_service
         self.appointment_service = appointment_service
+        # Les appels aux services passent par l'exécuteur (thread de travail)
+        self.executor = executor or ImmediateExecutor()
         self.appointment = appointment  # None pour création, objet pour édition
         self.callback = callback
         
@@ -37,8 +47,16 @@ class AppointmentDialog:
         # Widgets
         self.category_combo = None
         self.subcategory_combo = None
+        self.recurrence_combo = None
+        
+        # Libellé affiché -> règle RRULE (une règle personnalisée s'affiche telle quelle)
+        self.recurrence_choices = dict(RECURRENCE_PRESETS)
+        # Une occurrence d'une série se modifie seule ou avec toute sa série
+        self.is_occurrence = appointment is not None and appointment.isOccurrence()
+        self.edit_scope_var = ctk.StringVar(value=EDIT_SCOPE_OCCURRENCE)
         
         self.categories = []
+        self.taxonomy = TaxonomyIndex()
         self.current_subcategories = []
     
     def show(self):
@@ -101,6 +119,19 @@ class AppointmentDialog:
         )
         title_label.pack(pady=(SIZES["spacing_md"], SIZES["spacing_xl"]))
         
+        # Portée de la modification d'une occurrence : elle seule ou toute la série
+        if self.is_occurrence:
+            ctk.CTkLabel(
+                main_frame,
+                text="Ce rendez-vous fait partie d'une série. Appliquer les modifications à :",
+                text_color=COLORS["text_secondary"]
+            ).pack(anchor="w", padx=SIZES["spacing_md"])
+            ctk.CTkSegmentedButton(
+                main_frame,
+                values=[EDIT_SCOPE_OCCURRENCE, EDIT_SCOPE_SERIES],
+                variable=self.edit_scope_var
+            ).pack(anchor="w", padx=SIZES["spacing_md"], pady=(SIZES["spacing_sm"], SIZES["spacing_md"]))
+        
         # Formulaire avec style
         form_frame_style = getFrameStyle("card")
         form_frame = ctk.CTkFrame(main_frame, **form_frame_style)
@@ -154,7 +185,15 @@ class AppointmentDialog:
         # Sous-catégorie
         ctk.CTkLabel(form_frame, text="Sous-catégorie", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=20, pady=(10, 5))
         self.subcategory_combo = ctk.CTkComboBox(form_frame, values=[])
-        self.subcategory_combo.pack(fill="x", padx=20, pady=(0, 20))
+        self.subcategory_combo.pack(fill="x", padx=20, pady=(0, 10))
+        
+        # Répétition
+        ctk.CTkLabel(form_frame, text="Répétition", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=20, pady=(10, 5))
+        self.recurrence_combo = ctk.CTkComboBox(
+            form_frame, values=list(self.recurrence_choices), state="readonly"
+        )
+        self.recurrence_combo.set(next(iter(self.recurrence_choices)))
+        self.recurrence_combo.pack(fill="x", padx=20, pady=(0, 20))
         
         # Boutons d'action avec styles appropriés
         buttons_frame = ctk.CTkFrame(main_frame, fg_color="transparent")
@@ -185,16 +224,30 @@ class AppointmentDialog:
             delete_btn_style = getButtonStyle("error")
             delete_btn = ctk.CTkButton(
                 buttons_frame,
-                text="Supprimer",
+                text="Supprimer l'occurrence" if self.is_occurrence else "Supprimer",
                 command=self.delete,
                 **delete_btn_style
             )
             delete_btn.pack(side="left")
     
     def loadData(self):
-        """Charge les données dans le formulaire"""
-        # Charger les catégories
-        self.categories = self.category_service.getAllCategories()
+        """Charge en arrière-plan les données nécessaires au formulaire"""
+        self.executor.submit(self.fetchFormData, callback=self.onFormDataLoaded)
+    
+    def fetchFormData(self):
+        """Récupère l'arbre des catégories et la description (thread de travail)"""
+        if self.appointment and not self.appointment.isDescriptionLoaded():
+            # Une description différée est lue ici : jamais de requête sur le thread Tk
+            self.appointment.description
+        return self.category_service.getTaxonomy()
+    
+    def onFormDataLoaded(self, form_data):
+        """Remplit le formulaire une fois les données chargées"""
+        if not (self.window and self.window.winfo_exists()):
+            return
+        
+        self.taxonomy = form_data
+        self.categories = self.taxonomy.getCategories()
         category_names = [cat.name for cat in self.categories]
         self.category_combo.configure(values=category_names)
         
@@ -208,17 +261,18 @@ class AppointmentDialog:
                 self.end_time_var.set(self.appointment.end_datetime.strftime("%H:%M"))
             
             # Sélectionner la catégorie
-            category = self.category_service.getCategoryById(self.appointment.category_id)
+            category = self.taxonomy.getCategoryById(self.appointment.category_id)
             if category:
                 self.category_combo.set(category.name)
                 self.onCategoryChanged(category.name)
                 
                 # Sélectionner la sous-catégorie si disponible
                 if self.appointment.subcategory_id:
-                    subcategories = self.category_service.getSubcategoriesByCategory(category.id)
-                    subcategory = next((sub for sub in subcategories if sub.id == self.appointment.subcategory_id), None)
+                    subcategory = self.taxonomy.getSubcategoryById(self.appointment.subcategory_id)
                     if subcategory:
                         self.subcategory_combo.set(subcategory.name)
+            
+            self.setRecurrenceRule(self.appointment.recurrence_rule)
         else:
             # Mode création: valeurs par défaut
             today = date.today()
@@ -235,11 +289,11 @@ class AppointmentDialog:
     def onCategoryChanged(self, category_name: str):
         """Callback appelé quand la catégorie change"""
         # Trouver la catégorie sélectionnée
-        category = next((cat for cat in self.categories if cat.name == category_name), None)
+        category = self.taxonomy.getCategoryByName(category_name)
         
         if category:
-            # Charger les sous-catégories
-            subcategories = self.category_service.getSubcategoriesByCategory(category.id)
+            # Sous-catégories déjà chargées avec le formulaire
+            subcategories = self.taxonomy.getSubcategories(category.id)
             subcategory_names = [sub.name for sub in subcategories]
             
             self.current_subcategories = subcategories
@@ -251,6 +305,18 @@ class AppointmentDialog:
             else:
                 self.subcategory_combo.set("")
     
+    def setRecurrenceRule(self, rule: Optional[str]):
+        """Sélectionne la répétition correspondant à une règle RRULE"""
+        for label, preset in self.recurrence_choices.items():
+            if preset == rule:
+                self.recurrence_combo.set(label)
+                return
+        
+        # Règle personnalisée (importée par exemple) : conservée telle quelle
+        self.recurrence_choices[rule] = rule
+        self.recurrence_combo.configure(values=list(self.recurrence_choices))
+        self.recurrence_combo.set(rule)
+    
     def validateForm(self) -> bool:
         """Valide le formulaire"""
         errors = []
@@ -298,19 +364,41 @@ class AppointmentDialog:
         try:
             # Construire les données du rendez-vous
             appointment_data = self.buildAppointmentData()
-            
+        except Exception as e:
+            self.showError("Erreur", f"Une erreur est survenue: {str(e)}")
+            return
+        
+        # L'écriture est faite sur le thread de travail
+        if self.is_occurrence and not self.isSeriesEdit():
+            self.executor.submit(
+                self.updateOccurrence,
+                appointment_data,
+                callback=lambda appointment_id: self.onSaveFinished(appointment_id is not None, appointment_data)
+            )
+        elif self.is_editing:
+            self.executor.submit(
+                self.updateAppointment,
+                appointment_data,
+                callback=lambda success: self.onSaveFinished(success, appointment_data)
+            )
+        else:
+            self.executor.submit(
+                self.createAppointment,
+                appointment_data,
+                callback=lambda appointment_id: self.onSaveFinished(appointment_id is not None, appointment_data)
+            )
+    
+    def onSaveFinished(self, success: bool, appointment_data: dict):
+        """Termine la sauvegarde sur le thread Tk"""
+        try:
             if self.is_editing:
-                # Mise à jour
-                success = self.updateAppointment(appointment_data)
                 if success:
                     self.showSuccess("Rendez-vous modifié avec succès")
                 else:
                     self.showError("Erreur", "Impossible de modifier le rendez-vous")
                     return
             else:
-                # Création
-                appointment_id = self.createAppointment(appointment_data)
-                if appointment_id:
+                if success:
                     self.showSuccess("Rendez-vous créé avec succès")
                 else:
                     self.showError("Erreur", "Impossible de créer le rendez-vous")
@@ -322,10 +410,14 @@ class AppointmentDialog:
             
             # Fermer le dialogue
             self.window.destroy()
-            
+        
         except Exception as e:
             self.showError("Erreur", f"Une erreur est survenue: {str(e)}")
     
+    def isSeriesEdit(self) -> bool:
+        """Indique si la modification d'une occurrence s'applique à toute sa série"""
+        return self.is_occurrence and self.edit_scope_var.get() == EDIT_SCOPE_SERIES
+    
     def buildAppointmentData(self) -> dict:
         """Construit les données du rendez-vous à partir du formulaire"""
         # Conversion de la date et heures
@@ -336,11 +428,17 @@ class AppointmentDialog:
         start_datetime = datetime.combine(appointment_date, start_time_obj)
         end_datetime = datetime.combine(appointment_date, end_time_obj)
         
+        # Pour toute la série, le décalage saisi sur l'occurrence est appliqué au début de la série
+        if self.isSeriesEdit():
+            shift = start_datetime - self.appointment.start_datetime
+            end_datetime = self.appointment.series_start + shift + (end_datetime - start_datetime)
+            start_datetime = self.appointment.series_start + shift
+        
         # Récupérer les IDs de catégorie et sous-catégorie
-        category = next((cat for cat in self.categories if cat.name == self.category_combo.get()), None)
+        category = self.taxonomy.getCategoryByName(self.category_combo.get())
         subcategory = None
-        if self.subcategory_combo.get():
-            subcategory = next((sub for sub in self.current_subcategories if sub.name == self.subcategory_combo.get()), None)
+        if category and self.subcategory_combo.get():
+            subcategory = self.taxonomy.getSubcategoryByName(category.id, self.subcategory_combo.get())
         
         return {
             'title': self.title_var.get().strip(),
@@ -348,7 +446,8 @@ class AppointmentDialog:
             'start_datetime': start_datetime,
             'end_datetime': end_datetime,
             'category_id': category.id if category else None,
-            'subcategory_id': subcategory.id if subcategory else None
+            'subcategory_id': subcategory.id if subcategory else None,
+            'recurrence_rule': self.recurrence_choices.get(self.recurrence_combo.get())
         }
     
     def createAppointment(self, data: dict) -> Optional[int]:
@@ -360,7 +459,8 @@ class AppointmentDialog:
                 start_datetime=data['start_datetime'],
                 end_datetime=data['end_datetime'],
                 category_id=data['category_id'],
-                subcategory_id=data['subcategory_id']
+                subcategory_id=data['subcategory_id'],
+                recurrence_rule=data['recurrence_rule']
             )
             return appointment_id
         except Exception as e:
@@ -377,13 +477,31 @@ class AppointmentDialog:
                 start_datetime=data['start_datetime'],
                 end_datetime=data['end_datetime'],
                 category_id=data['category_id'],
-                subcategory_id=data['subcategory_id']
+                subcategory_id=data['subcategory_id'],
+                recurrence_rule=data['recurrence_rule']
             )
             return success
         except Exception as e:
             print(f"Erreur lors de la mise à jour du rendez-vous: {e}")
             return False
     
+    def updateOccurrence(self, data: dict) -> Optional[int]:
+        """Remplace la seule occurrence éditée par un rendez-vous simple"""
+        try:
+            return self.appointment_service.updateOccurrence(
+                series_id=self.appointment.id,
+                occurrence_start=self.appointment.start_datetime,
+                title=data['title'],
+                description=data['description'],
+                start_datetime=data['start_datetime'],
+                end_datetime=data['end_datetime'],
+                category_id=data['category_id'],
+                subcategory_id=data['subcategory_id']
+            )
+        except Exception as e:
+            print(f"Erreur lors de la modification de l'occurrence: {e}")
+            return None
+    
     def delete(self):
         """Supprime le rendez-vous (mode édition seulement)"""
         if not self.is_editing:
@@ -395,20 +513,33 @@ class AppointmentDialog:
             "Êtes-vous sûr de vouloir supprimer ce rendez-vous ?"
         )
         
-        if result:
-            # Supprimer le rendez-vous
-            try:
-                success = self.appointment_service.deleteAppointment(self.appointment.id)
-                
-                if success:
-                    self.showSuccess("Rendez-vous supprimé avec succès")
-                    if self.callback:
-                        self.callback(None)  # Signal de suppression
-                    self.window.destroy()
-                else:
-                    self.showError("Erreur", "Impossible de supprimer le rendez-vous")
-            except Exception as e:
-                self.showError("Erreur", f"Erreur lors de la suppression: {e}")
+        if result and self.is_occurrence:
+            # Seule cette occurrence est retirée de la série
+            self.executor.submit(
+                self.appointment_service.deleteOccurrence,
+                self.appointment.id,
+                self.appointment.start_datetime,
+                callback=lambda _: self.onDeleteFinished(True),
+                error_callback=lambda e: self.showError("Erreur", f"Erreur lors de la suppression: {e}")
+            )
+        elif result:
+            # Supprimer le rendez-vous sur le thread de travail
+            self.executor.submit(
+                self.appointment_service.deleteAppointment,
+                self.appointment.id,
+                callback=self.onDeleteFinished,
+                error_callback=lambda e: self.showError("Erreur", f"Erreur lors de la suppression: {e}")
+            )
+    
+    def onDeleteFinished(self, success: bool):
+        """Termine la suppression sur le thread Tk"""
+        if success:
+            self.showSuccess("Rendez-vous supprimé avec succès")
+            if self.callback:
+                self.callback(None)  # Signal de suppression
+            self.window.destroy()
+        else:
+            self.showError("Erreur", "Impossible de supprimer le rendez-vous")
     
     def cancel(self):
         """Annule et ferme le dialogue"""
@@ -0,0 +1,197 @@
+"""Exécution des appels de service hors du thread Tk
+
+Les appels à la base de données sont exécutés sur un unique thread de travail ;
+les résultats sont renvoyés au thread Tk via une file consultée avec
+``root.after``, seul endroit où les callbacks (qui manipulent les widgets)
+sont appelés.
+"""
+
+import queue
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+
+POLL_INTERVAL_MS = 15
+
+
+class BackgroundTask:
+    """Représente un appel de service soumis au thread de travail"""
+    
+    def __init__(self, func: Callable, args: tuple, kwargs: dict,
+                 callback: Optional[Callable] = None, error_callback: Optional[Callable] = None,
+                 key: Optional[Hashable] = None):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.callback = callback
+        self.error_callback = error_callback
+        self.key = key
+        self._cancelled = False
+    
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+    
+    def cancel(self):
+        """Annule la tâche : elle ne sera pas exécutée ou son résultat sera ignoré"""
+        self._cancelled = True
+    
+    def run(self) -> Any:
+        """Exécute l'appel (sur le thread de travail)"""
+        return self.func(*self.args, **self.kwargs)
+    
+    def __str__(self) -> str:
+        name = getattr(self.func, "__name__", repr(self.func))
+        return f"BackgroundTask(func={name}, key={self.key!r}, cancelled={self._cancelled})"
+    
+    def __repr__(self) -> str:
+        return self.__str__()
+
+
+def _reportError(error: Exception):
+    """Gestionnaire d'erreur par défaut"""
+    print(f"Erreur lors d'une opération en arrière-plan: {error}")
+
+
+class BackgroundExecutor:
+    """Exécute les appels de service sur un thread de travail dédié
+    
+    Une tâche soumise avec une clé (``key``) rend obsolète la tâche précédente
+    de même clé : par exemple, le chargement d'un mois abandonné par une
+    navigation plus récente n'est pas exécuté, ou son résultat est ignoré.
+    """
+    
+    def __init__(self, root, poll_interval: int = POLL_INTERVAL_MS):
+        self.root = root
+        self.poll_interval = poll_interval
+        
+        self._tasks = queue.Queue()
+        self._results = queue.Queue()
+        self._latest_by_key: Dict[Hashable, BackgroundTask] = {}
+        self._pending = 0
+        self._poll_id = None
+        self._running = True
+        
+        self._worker = threading.Thread(target=self._runWorker, name="db-worker", daemon=True)
+        self._worker.start()
+    
+    def submit(self, func: Callable, *args, callback: Optional[Callable] = None,
+               error_callback: Optional[Callable] = None, key: Optional[Hashable] = None,
+               **kwargs) -> BackgroundTask:
+        """Soumet un appel ; callback(résultat) sera appelé sur le thread Tk"""
+        if not self._running:
+            raise RuntimeError("L'exécuteur est arrêté")
+        
+        task = BackgroundTask(func, args, kwargs, callback, error_callback, key)
+        
+        if key is not None:
+            self.cancelKey(key)
+            self._latest_by_key[key] = task
+        
+        self._pending += 1
+        self._tasks.put(task)
+        self._schedulePoll()
+        return task
+    
+    def cancelKey(self, key: Hashable):
+        """Annule la dernière tâche soumise avec cette clé"""
+        previous = self._latest_by_key.pop(key, None)
+        if previous:
+            previous.cancel()
+    
+    def shutdown(self, wait: bool = True):
+        """Arrête le thread de travail après les tâches déjà soumises"""
+        if not self._running:
+            return
+        
+        self._running = False
+        self._tasks.put(None)
+        
+        if wait:
+            self._worker.join()
+        
+        if self._poll_id is not None:
+            try:
+                self.root.after_cancel(self._poll_id)
+            except Exception:
+                pass
+            self._poll_id = None
+    
+    def _runWorker(self):
+        """Boucle du thread de travail"""
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            
+            if task.cancelled:
+                self._results.put((task, None, None))
+                continue
+            
+            try:
+                result = task.run()
+                self._results.put((task, result, None))
+            except Exception as e:
+                self._results.put((task, None, e))
+    
+    def _schedulePoll(self):
+        """Planifie la consultation de la file de résultats si nécessaire"""
+        if self._poll_id is None and self._pending > 0:
+            self._poll_id = self.root.after(self.poll_interval, self._pollResults)
+    
+    def _pollResults(self):
+        """Distribue les résultats disponibles sur le thread Tk"""
+        self._poll_id = None
+        
+        while True:
+            try:
+                task, result, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            
+            self._pending -= 1
+            self._dispatch(task, result, error)
+        
+        self._schedulePoll()
+    
+    def _dispatch(self, task: BackgroundTask, result: Any, error: Optional[Exception]):
+        """Appelle le callback d'une tâche terminée, sauf si elle est obsolète"""
+        if task.key is not None and self._latest_by_key.get(task.key) is task:
+            del self._latest_by_key[task.key]
+        
+        if task.cancelled:
+            return
+        
+        if error is not None:
+            (task.error_callback or _reportError)(error)
+        elif task.callback:
+            task.callback(result)
+
+
+class ImmediateExecutor:
+    """Exécuteur synchrone offrant la même interface que BackgroundExecutor
+    
+    Utilisé par défaut par les vues lorsqu'aucun exécuteur n'est fourni.
+    """
+    
+    def submit(self, func: Callable, *args, callback: Optional[Callable] = None,
+               error_callback: Optional[Callable] = None, key: Optional[Hashable] = None,
+               **kwargs) -> BackgroundTask:
+        """Exécute immédiatement l'appel puis son callback"""
+        task = BackgroundTask(func, args, kwargs, callback, error_callback, key)
+        
+        try:
+            result = task.run()
+        except Exception as e:
+            (error_callback or _reportError)(e)
+            return task
+        
+        if callback:
+            callback(result)
+        return task
+    
+    def cancelKey(self, key: Hashable):
+        """Rien à annuler : les tâches sont exécutées immédiatement"""
+    
+    def shutdown(self, wait: bool = True):
+        """Rien à arrêter"""
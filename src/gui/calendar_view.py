@@ -5,7 +5,10 @@ import calendar
 from datetime import date, datetime, timedelta
 from typing import Callable, Optional, List
 from src.services.appointment_service import AppointmentService
-from src.models.appointment import Appointment
+from src.models.appointment_details import AppointmentDetails
+from src.gui.background_executor import ImmediateExecutor
+from src.gui.canvas_month_grid import CanvasMonthGrid
+from src.utils.constants import CALENDAR_RENDERER
 from src.utils.theme import getButtonStyle, getFrameStyle, getCalendarCellStyle, SIZES, COLORS, FONTS, CORNER_RADIUS
 
 
@@ -13,10 +16,17 @@ class CalendarView(ctk.CTkFrame):
     """Widget de vue calendrier mensuelle"""
     
     def __init__(self, parent, appointment_service: AppointmentService, 
-                 on_date_selected: Callable, on_appointment_selected: Callable):
+                 on_date_selected: Callable, on_appointment_selected: Callable,
+                 executor=None, renderer: str = CALENDAR_RENDERER):
         super().__init__(parent)
         
+        if renderer not in ("widgets", "canvas"):
+            raise ValueError(f"Rendu de calendrier inconnu: {renderer}")
+        self.renderer = renderer
+        
         self.appointment_service = appointment_service
+        # Les appels au service passent par l'exécuteur (thread de travail)
+        self.executor = executor or ImmediateExecutor()
         self.on_date_selected = on_date_selected
         self.on_appointment_selected = on_appointment_selected
         
@@ -71,8 +81,13 @@ class CalendarView(ctk.CTkFrame):
         
         # Grille des jours - Structure fixe de 6 lignes x 7 colonnes
         self.day_buttons = {}
+        self.appointment_counts = {}  # Nombre de rendez-vous par jour du mois affiché
         self.fixed_cells = {}  # Cache des cellules fixes pour éviter les recreations
-        self.createFixedGrid()
+        self.canvas_dates = [None] * 42  # Date de chaque cellule du rendu canvas
+        if self.renderer == "canvas":
+            self.createCanvasGrid()
+        else:
+            self.createFixedGrid()
         self.updateDayGrid()
     
     def createDayHeaders(self):
@@ -168,13 +183,44 @@ class CalendarView(ctk.CTkFrame):
                     'col': col
                 }
     
+    def createCanvasGrid(self):
+        """Crée la grille dessinée sur un unique canvas (alternative aux widgets)"""
+        self.canvas_grid = CanvasMonthGrid(
+            self.calendar_frame,
+            on_cell_click=self.onCanvasCellClick
+        )
+        self.canvas_grid.grid(row=1, column=0, rowspan=6, columnspan=7, sticky="nsew")
+    
     def updateDayGrid(self):
+        """Charge les compteurs du mois en arrière-plan puis met à jour la grille"""
+        year, month = self.current_date.year, self.current_date.month
+        
+        # Une seule requête agrégée pour tous les indicateurs du mois ; une
+        # navigation plus récente rend cette requête obsolète (même clé)
+        self.executor.submit(
+            self.appointment_service.getAppointmentCountsByDay,
+            year, month,
+            callback=lambda counts: self.renderDayGrid(year, month, counts),
+            key=("calendar_month_counts", id(self))
+        )
+    
+    def renderDayGrid(self, year: int, month: int, appointment_counts):
         """Met à jour le contenu des cellules existantes SANS les recréer"""
+        # Ignorer une réponse arrivée après un changement de mois
+        if (year, month) != (self.current_date.year, self.current_date.month):
+            return
+        
+        self.appointment_counts = appointment_counts
+        
+        if self.renderer == "canvas":
+            self.renderCanvasGrid(year, month)
+            return
+        
         # Vider le mapping jour -> cellule
         self.day_buttons.clear()
         
         # Obtenir le calendrier du mois
-        cal = calendar.monthcalendar(self.current_date.year, self.current_date.month)
+        cal = calendar.monthcalendar(year, month)
         
         # Remplir d'abord toutes les cellules comme vides
         for cell_key, cell_data in self.fixed_cells.items():
@@ -187,10 +233,49 @@ class CalendarView(ctk.CTkFrame):
                 if day != 0:  # Jour valide du mois
                     cell_key = f"{row}_{col}"
                     if cell_key in self.fixed_cells:
-                        day_date = date(self.current_date.year, self.current_date.month, day)
+                        day_date = date(year, month, day)
                         self.updateCellWithDay(self.fixed_cells[cell_key], day_date)
                         self.day_buttons[day_date] = self.fixed_cells[cell_key]['frame']
     
+    def renderCanvasGrid(self, year: int, month: int):
+        """Dessine le mois sur le canvas en ne modifiant que les cellules changées"""
+        self.canvas_dates = [None] * 42
+        
+        for week_idx, week in enumerate(calendar.monthcalendar(year, month)):
+            for col, day in enumerate(week):
+                if day != 0:
+                    self.canvas_dates[week_idx * 7 + col] = date(year, month, day)
+        
+        self.canvas_grid.render([
+            self.getCellState(day_date) if day_date else None
+            for day_date in self.canvas_dates
+        ])
+    
+    def onCanvasCellClick(self, index: int):
+        """Gère le clic sur une cellule du canvas"""
+        if self.canvas_dates[index]:
+            self.selectDate(self.canvas_dates[index])
+    
+    def getCellState(self, day_date: date) -> dict:
+        """Calcule le contenu et les couleurs d'une cellule (communs aux deux rendus)"""
+        is_today = day_date == date.today()
+        is_selected = day_date == self.selected_date
+        appointment_count = self.appointment_counts.get(day_date, 0)
+        highlighted = is_today or is_selected
+        
+        cell_style = getCalendarCellStyle(is_today, is_selected, appointment_count > 0)
+        text_color = cell_style.get("text_color", COLORS["text_primary"])
+        fg_color = cell_style.get("fg_color", COLORS["surface"])
+        
+        return {
+            "text": str(day_date.day),
+            "fg_color": fg_color,
+            "text_color": text_color,
+            "hover_color": COLORS["surface_hover"] if not highlighted else fg_color,
+            "indicator_text": f"● {appointment_count}" if appointment_count else "",
+            "indicator_color": COLORS["appointment_indicator"] if not highlighted else text_color
+        }
+    
     def updateCellAsEmpty(self, cell_data):
         """Met à jour une cellule pour qu'elle soit vide"""
         cell_data['date'] = None
@@ -200,36 +285,23 @@ class CalendarView(ctk.CTkFrame):
     
     def updateCellWithDay(self, cell_data, day_date):
         """Met à jour une cellule avec un jour spécifique"""
-        # Déterminer l'état
-        is_today = day_date == date.today()
-        is_selected = day_date == self.selected_date
-        appointments = self.appointment_service.getAppointmentsByDate(day_date)
-        has_appointments = len(appointments) > 0
-        
-        # Obtenir le style
-        cell_style = getCalendarCellStyle(is_today, is_selected, has_appointments)
-        text_color = cell_style.get("text_color", COLORS["text_primary"])
-        fg_color = cell_style.get("fg_color", COLORS["surface"])
+        state = self.getCellState(day_date)
         
         # Mettre à jour la cellule
         cell_data['date'] = day_date
-        cell_data['frame'].configure(fg_color=fg_color)
+        cell_data['frame'].configure(fg_color=state["fg_color"])
         cell_data['button'].configure(
-            text=str(day_date.day),
-            text_color=text_color,
+            text=state["text"],
+            text_color=state["text_color"],
             state="normal",
-            hover_color=COLORS["surface_hover"] if not (is_today or is_selected) else fg_color
+            hover_color=state["hover_color"]
         )
         
         # Mettre à jour l'indicateur
-        if has_appointments:
-            indicator_color = COLORS["appointment_indicator"] if not (is_today or is_selected) else text_color
-            cell_data['indicator_label'].configure(
-                text=f"● {len(appointments)}",
-                text_color=indicator_color
-            )
-        else:
-            cell_data['indicator_label'].configure(text="")
+        cell_data['indicator_label'].configure(
+            text=state["indicator_text"],
+            text_color=state["indicator_color"]
+        )
     
     def onCellClick(self, row, col):
         """Gère le clic sur une cellule"""
@@ -252,7 +324,7 @@ class CalendarView(ctk.CTkFrame):
         # Forcer la mise à jour pour éviter l'accumulation
         self.calendar_frame.update_idletasks()
         
-        # Obtenir le calendrier du mois
+        # Obtenir le calendrier du mois (compteurs déjà chargés par updateDayGrid)
         cal = calendar.monthcalendar(self.current_date.year, self.current_date.month)
         
         # Créer toutes les cellules en une seule fois pour minimiser les redraws
@@ -289,8 +361,8 @@ class CalendarView(ctk.CTkFrame):
         # Déterminer l'état du jour
         is_today = day_date == date.today()
         is_selected = day_date == self.selected_date
-        appointments = self.appointment_service.getAppointmentsByDate(day_date)
-        has_appointments = len(appointments) > 0
+        appointment_count = self.appointment_counts.get(day_date, 0)
+        has_appointments = appointment_count > 0
         
         # Obtenir le style approprié selon l'état
         cell_style = getCalendarCellStyle(is_today, is_selected, has_appointments)
@@ -348,7 +420,7 @@ class CalendarView(ctk.CTkFrame):
             
             indicator = ctk.CTkLabel(
                 indicator_frame,
-                text=f"● {len(appointments)}",
+                text=f"● {appointment_count}",
                 font=ctk.CTkFont(size=FONTS["size_xs"]),
                 text_color=COLORS["appointment_indicator"] if not (is_today or is_selected) else text_color
             )
@@ -380,6 +452,12 @@ class CalendarView(ctk.CTkFrame):
     
     def updateSingleCellInFixedGrid(self, day_date: date):
         """Met à jour une seule cellule dans la grille fixe"""
+        if self.renderer == "canvas":
+            if day_date in self.canvas_dates:
+                index = self.canvas_dates.index(day_date)
+                self.canvas_grid.updateCell(index, self.getCellState(day_date))
+            return
+        
         # Trouver la cellule qui contient cette date
         for cell_data in self.fixed_cells.values():
             if cell_data['date'] == day_date:
@@ -399,10 +477,17 @@ class CalendarView(ctk.CTkFrame):
         self.showDayTimeline(selected_date)
     
     def showDayTimeline(self, target_date: date):
-        """Affiche la timeline du jour sélectionné"""
+        """Charge en arrière-plan puis affiche la timeline du jour sélectionné"""
+        self.executor.submit(
+            self.appointment_service.getAppointmentsWithCategory,
+            target_date,
+            callback=lambda appointments: self.openDayTimeline(target_date, appointments),
+            key=("calendar_day_timeline", id(self))
+        )
+    
+    def openDayTimeline(self, target_date: date, appointments: List[AppointmentDetails]):
+        """Affiche la timeline d'un jour dont les rendez-vous sont chargés"""
         # Cette méthode peut ouvrir une nouvelle fenêtre ou mise à jour une zone dédiée
-        appointments = self.appointment_service.getAppointmentsByDate(target_date)
-        
         if appointments:
             # Pour l'instant, on utilise une fenêtre popup simple
             timeline_window = ctk.CTkToplevel(self)
@@ -416,11 +501,15 @@ class CalendarView(ctk.CTkFrame):
             for appointment in appointments:
                 self.createAppointmentCard(appointments_frame, appointment)
     
-    def createAppointmentCard(self, parent, appointment: Appointment):
+    def createAppointmentCard(self, parent, appointment: AppointmentDetails):
         """Crée une carte pour un rendez-vous"""
         card_frame = ctk.CTkFrame(parent)
         card_frame.pack(fill="x", pady=5)
         
+        # Bandeau coloré selon la catégorie
+        color_bar = ctk.CTkFrame(card_frame, width=4, fg_color=appointment.getColor())
+        color_bar.pack(side="left", fill="y", padx=(5, 0), pady=5)
+        
         # En-tête avec heure et titre
         header_frame = ctk.CTkFrame(card_frame)
         header_frame.pack(fill="x", padx=10, pady=(10, 5))
@@ -439,6 +528,18 @@ class CalendarView(ctk.CTkFrame):
         )
         title_label.pack(side="left", padx=(10, 0))
         
+        category_text = appointment.category_name or ""
+        if appointment.subcategory_name:
+            category_text += f" · {appointment.subcategory_name}"
+        if category_text:
+            category_label = ctk.CTkLabel(
+                header_frame,
+                text=category_text,
+                font=ctk.CTkFont(size=FONTS["size_sm"]),
+                text_color=appointment.getColor()
+            )
+            category_label.pack(side="right")
+        
         # Description si disponible
         if appointment.description:
             desc_label = ctk.CTkLabel(
@@ -0,0 +1,135 @@
+"""Rendu de la grille mensuelle sur un unique canvas Tk"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from typing import Callable, Dict, List, Optional
+from src.utils.theme import COLORS, FONTS, SIZES
+
+
+class CanvasMonthGrid(tk.Canvas):
+    """Grille 6x7 dessinée sur un seul canvas
+    
+    Chaque cellule est composée de trois items (fond, numéro du jour,
+    indicateur) étiquetés ``cell_<index>``. Un rendu ne reconfigure que les
+    items dont le texte ou la couleur a changé, et les clics sont résolus par
+    hit-testing sur les items du canvas.
+    """
+    
+    ROWS = 6
+    COLUMNS = 7
+    
+    def __init__(self, parent, on_cell_click: Callable[[int], None], **kwargs):
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("borderwidth", 0)
+        kwargs.setdefault("background", COLORS["surface"])
+        super().__init__(parent, **kwargs)
+        
+        self.on_cell_click = on_cell_click
+        self.cell_count = self.ROWS * self.COLUMNS
+        
+        family = tkfont.nametofont("TkDefaultFont").actual("family")
+        self.day_font = (family, FONTS["size_md"], FONTS["weight_bold"])
+        self.indicator_font = (family, FONTS["size_xs"])
+        
+        # Dernier état dessiné par cellule (None = cellule vide)
+        self._states: List[Optional[Dict[str, str]]] = [None] * self.cell_count
+        self._items: List[Dict[str, int]] = []
+        self.createItems()
+        
+        self.bind("<Configure>", self.onResize)
+        self.bind("<Button-1>", self.onClick)
+    
+    def createItems(self):
+        """Crée une fois pour toutes les items de chaque cellule (masqués)"""
+        for index in range(self.cell_count):
+            tag = f"cell_{index}"
+            self._items.append({
+                "background": self.create_rectangle(
+                    0, 0, 0, 0, outline="", fill=COLORS["surface"],
+                    state="hidden", tags=("cell", tag)
+                ),
+                "day": self.create_text(
+                    0, 0, text="", font=self.day_font, fill=COLORS["text_primary"],
+                    state="hidden", tags=("cell", tag)
+                ),
+                "indicator": self.create_text(
+                    0, 0, text="", font=self.indicator_font,
+                    fill=COLORS["appointment_indicator"], state="hidden", tags=("cell", tag)
+                ),
+            })
+    
+    def onResize(self, event):
+        """Repositionne les items lorsque le canvas change de taille"""
+        padding = SIZES["spacing_xs"]
+        cell_width = event.width / self.COLUMNS
+        cell_height = event.height / self.ROWS
+        
+        for index, items in enumerate(self._items):
+            row, col = divmod(index, self.COLUMNS)
+            x0 = col * cell_width + padding
+            y0 = row * cell_height + padding
+            x1 = (col + 1) * cell_width - padding
+            y1 = (row + 1) * cell_height - padding
+            
+            self.coords(items["background"], x0, y0, x1, y1)
+            self.coords(items["day"], (x0 + x1) / 2, y0 + (y1 - y0) * 0.42)
+            self.coords(items["indicator"], (x0 + x1) / 2, y1 - 10)
+    
+    def render(self, states: List[Optional[Dict[str, str]]]) -> int:
+        """Affiche l'état des 42 cellules et retourne le nombre d'items modifiés"""
+        changed = 0
+        for index, state in enumerate(states):
+            changed += self.updateCell(index, state)
+        return changed
+    
+    def updateCell(self, index: int, state: Optional[Dict[str, str]]) -> int:
+        """Met à jour une cellule en ne touchant que ce qui a changé"""
+        previous = self._states[index]
+        if previous == state:
+            return 0
+        
+        items = self._items[index]
+        self._states[index] = state
+        
+        if state is None:
+            for item in items.values():
+                self.itemconfigure(item, state="hidden")
+            return len(items)
+        
+        # Une cellule qui était vide doit être entièrement redessinée
+        was_empty = previous is None
+        changed = 0
+        
+        if was_empty or previous["fg_color"] != state["fg_color"]:
+            self.itemconfigure(items["background"], fill=state["fg_color"], state="normal")
+            changed += 1
+        
+        if was_empty or (previous["text"], previous["text_color"]) != (state["text"], state["text_color"]):
+            self.itemconfigure(items["day"], text=state["text"], fill=state["text_color"], state="normal")
+            changed += 1
+        
+        if was_empty or ((previous["indicator_text"], previous["indicator_color"])
+                         != (state["indicator_text"], state["indicator_color"])):
+            self.itemconfigure(
+                items["indicator"], text=state["indicator_text"],
+                fill=state["indicator_color"], state="normal"
+            )
+            changed += 1
+        
+        return changed
+    
+    def cellAt(self, x: int, y: int) -> Optional[int]:
+        """Retourne l'index de la cellule visible sous un point (hit-testing)"""
+        for item in reversed(self.find_overlapping(x, y, x, y)):
+            for tag in self.gettags(item):
+                if tag.startswith("cell_"):
+                    index = int(tag[len("cell_"):])
+                    if self._states[index] is not None:
+                        return index
+        return None
+    
+    def onClick(self, event):
+        """Transmet le clic sur une cellule non vide"""
+        index = self.cellAt(event.x, event.y)
+        if index is not None:
+            self.on_cell_click(index)
@@ -0,0 +1,175 @@
+"""Rendu d'une année sur un unique canvas Tk (carte de chaleur des jours)"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+from datetime import date, timedelta
+from typing import Callable, List, Optional, Sequence
+from src.utils.theme import COLORS, FONTS, getHeatColor
+
+
+HEAT_LEVELS = 5  # Niveau 0 (aucun rendez-vous) puis quatre intensités
+MONTH_LABELS = ["Janv", "Févr", "Mars", "Avr", "Mai", "Juin",
+                "Juil", "Août", "Sept", "Oct", "Nov", "Déc"]
+WEEKDAY_LABELS = ["Lun", "", "Mer", "", "Ven", "", ""]
+
+
+def yearCellDates(year: int, cell_count: int) -> List[Optional[date]]:
+    """Dates des cellules d'une année, semaine par semaine (lundi en haut de colonne)
+    
+    La cellule d'un jour est son rang dans l'année décalé du jour de la
+    semaine du 1er janvier ; les cellules hors de l'année valent None.
+    """
+    first = date(year, 1, 1)
+    offset = first.weekday()
+    cells: List[Optional[date]] = [None] * cell_count
+    for day_index in range((date(year + 1, 1, 1) - first).days):
+        cells[offset + day_index] = first + timedelta(days=day_index)
+    return cells
+
+
+def monthColumns(year: int) -> List[int]:
+    """Colonne (semaine) du 1er de chaque mois, pour placer les libellés"""
+    offset = date(year, 1, 1).weekday()
+    return [(offset + date(year, month, 1).timetuple().tm_yday - 1) // 7 for month in range(1, 13)]
+
+
+def heatLevels(values: Sequence[int]) -> List[int]:
+    """Niveau d'intensité (0 à HEAT_LEVELS - 1) de chaque valeur, relatif au maximum"""
+    peak = max(values, default=0)
+    if peak <= 0:
+        return [0] * len(values)
+    
+    top = HEAT_LEVELS - 1
+    # Arrondi supérieur : toute valeur non nulle est visible (niveau 1 au moins)
+    return [-(-value * top // peak) if value > 0 else 0 for value in values]
+
+
+class CanvasYearGrid(tk.Canvas):
+    """Grille de 54 semaines x 7 jours dessinée sur un seul canvas
+    
+    Les items (un rectangle par cellule, les libellés des mois et des jours)
+    sont créés une fois ; un rendu ne reconfigure que les cellules dont le
+    niveau a changé. Les clics et le survol sont résolus par calcul de la
+    cellule sous le pointeur.
+    """
+    
+    ROWS = 7
+    COLUMNS = 54  # Une année bissextile commençant un dimanche touche 54 semaines
+    LABEL_WIDTH = 32
+    HEADER_HEIGHT = 18
+    
+    def __init__(self, parent, on_cell_click: Callable[[int], None],
+                 on_cell_hover: Optional[Callable[[Optional[int]], None]] = None, **kwargs):
+        kwargs.setdefault("highlightthickness", 0)
+        kwargs.setdefault("borderwidth", 0)
+        kwargs.setdefault("background", COLORS["surface"])
+        super().__init__(parent, **kwargs)
+        
+        self.on_cell_click = on_cell_click
+        self.on_cell_hover = on_cell_hover
+        self.cell_count = self.ROWS * self.COLUMNS
+        self.palette = [getHeatColor(level / (HEAT_LEVELS - 1)) for level in range(HEAT_LEVELS)]
+        
+        family = tkfont.nametofont("TkDefaultFont").actual("family")
+        self.label_font = (family, FONTS["size_xs"])
+        
+        # Dernier niveau dessiné par cellule (None = cellule masquée)
+        self._levels: List[Optional[int]] = [None] * self.cell_count
+        self._month_columns = [0] * len(MONTH_LABELS)
+        self._cell_size = 0.0
+        self._hovered: Optional[int] = None
+        self.createItems()
+        
+        self.bind("<Configure>", lambda event: self.layout())
+        self.bind("<Button-1>", self.onClick)
+        self.bind("<Motion>", self.onMotion)
+        self.bind("<Leave>", lambda event: self.setHovered(None))
+    
+    def createItems(self):
+        """Crée une fois pour toutes les cellules (masquées) et les libellés"""
+        self._cells = [
+            self.create_rectangle(0, 0, 0, 0, outline="", fill=self.palette[0], state="hidden")
+            for _ in range(self.cell_count)
+        ]
+        self._month_items = [
+            self.create_text(0, 0, text=label, anchor="w", font=self.label_font,
+                             fill=COLORS["text_secondary"])
+            for label in MONTH_LABELS
+        ]
+        self._weekday_items = [
+            self.create_text(0, 0, text=label, anchor="e", font=self.label_font,
+                             fill=COLORS["text_secondary"])
+            for label in WEEKDAY_LABELS
+        ]
+    
+    def layout(self):
+        """Repositionne les items selon la taille du canvas"""
+        width, height = self.winfo_width(), self.winfo_height()
+        cell = min((width - self.LABEL_WIDTH) / self.COLUMNS, (height - self.HEADER_HEIGHT) / self.ROWS)
+        self._cell_size = max(cell, 1.0)
+        cell = self._cell_size
+        gap = 1 if cell > 6 else 0
+        
+        for index, item in enumerate(self._cells):
+            column, row = divmod(index, self.ROWS)
+            x0 = self.LABEL_WIDTH + column * cell
+            y0 = self.HEADER_HEIGHT + row * cell
+            self.coords(item, x0 + gap, y0 + gap, x0 + cell - gap, y0 + cell - gap)
+        
+        for row, item in enumerate(self._weekday_items):
+            self.coords(item, self.LABEL_WIDTH - 4, self.HEADER_HEIGHT + (row + 0.5) * cell)
+        self.placeMonthLabels()
+    
+    def placeMonthLabels(self):
+        """Place chaque libellé de mois au-dessus de la semaine de son 1er jour"""
+        for column, item in zip(self._month_columns, self._month_items):
+            self.coords(item, self.LABEL_WIDTH + column * self._cell_size, self.HEADER_HEIGHT / 2)
+    
+    def render(self, levels: Sequence[Optional[int]], month_columns: Sequence[int]) -> int:
+        """Affiche le niveau de chaque cellule et retourne le nombre d'items modifiés"""
+        changed = 0
+        for index, level in enumerate(levels):
+            if self._levels[index] == level:
+                continue
+            
+            if level is None:
+                self.itemconfigure(self._cells[index], state="hidden")
+            else:
+                self.itemconfigure(self._cells[index], fill=self.palette[level], state="normal")
+            self._levels[index] = level
+            changed += 1
+        
+        if list(month_columns) != self._month_columns:
+            self._month_columns = list(month_columns)
+            self.placeMonthLabels()
+        return changed
+    
+    def cellAt(self, x: int, y: int) -> Optional[int]:
+        """Retourne l'index de la cellule visible sous un point"""
+        if not self._cell_size or x < self.LABEL_WIDTH or y < self.HEADER_HEIGHT:
+            return None
+        
+        column = int((x - self.LABEL_WIDTH) // self._cell_size)
+        row = int((y - self.HEADER_HEIGHT) // self._cell_size)
+        if column >= self.COLUMNS or row >= self.ROWS:
+            return None
+        
+        index = column * self.ROWS + row
+        return index if self._levels[index] is not None else None
+    
+    def onClick(self, event):
+        """Transmet le clic sur une cellule visible"""
+        index = self.cellAt(event.x, event.y)
+        if index is not None:
+            self.on_cell_click(index)
+    
+    def onMotion(self, event):
+        """Signale la cellule survolée lorsqu'elle change"""
+        self.setHovered(self.cellAt(event.x, event.y))
+    
+    def setHovered(self, index: Optional[int]):
+        """Mémorise la cellule survolée et prévient la vue"""
+        if index != self._hovered:
+            self._hovered = index
+            if self.on_cell_hover:
+                self.on_cell_hover(index)
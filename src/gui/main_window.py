@@ -1,23 +1,29 @@
 """Fenêtre principale de l'application"""
 
 import customtkinter as ctk
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from typing import Optional
 from src.services.category_service import CategoryService
 from src.services.appointment_service import AppointmentService
+from src.services.analytics_service import AnalyticsService
 from src.gui.calendar_view import CalendarView
+from src.gui.year_view import YearView
 from src.gui.timeline_view import TimelineView
 from src.gui.appointment_dialog import AppointmentDialog
-from src.utils.constants import APP_NAME, APP_VERSION
+from src.gui.statistics_dialog import StatisticsDialog
+from src.gui.background_executor import BackgroundExecutor
+from src.utils.constants import APP_NAME, APP_VERSION, SEARCH_DEBOUNCE_MS
 from src.utils.theme import getButtonStyle, getFrameStyle, SIZES, COLORS, FONTS, CORNER_RADIUS
 
 
 class MainWindow:
     """Fenêtre principale de l'application de gestion de calendrier"""
     
-    def __init__(self, category_service: CategoryService, appointment_service: AppointmentService):
+    def __init__(self, category_service: CategoryService, appointment_service: AppointmentService,
+                 analytics_service: Optional[AnalyticsService] = None):
         self.category_service = category_service
         self.appointment_service = appointment_service
+        self.analytics_service = analytics_service or AnalyticsService(appointment_service)
         
         # Configuration du thème
         ctk.set_appearance_mode("light")
@@ -29,9 +35,14 @@ class MainWindow:
         self.root.geometry("1200x800")
         self.root.minsize(800, 600)
         
+        # Thread de travail pour tous les appels aux services (base de données)
+        self.executor = BackgroundExecutor(self.root)
+        
         # Variables d'état
         self.current_date = date.today()
+        self.view_mode = "month"  # "month" ou "year"
         self.selected_appointment = None
+        self.search_after_id = None
         
         # Initialiser l'interface
         self.setupUI()
@@ -134,6 +145,15 @@ class MainWindow:
         )
         today_btn.pack(pady=(0, SIZES["spacing_md"]))
         
+        # Choix de la vue : grille mensuelle ou carte de chaleur annuelle
+        self.view_mode_selector = ctk.CTkSegmentedButton(
+            nav_frame,
+            values=["Mois", "Année"],
+            command=lambda value: self.setViewMode("year" if value == "Année" else "month")
+        )
+        self.view_mode_selector.set("Mois")
+        self.view_mode_selector.pack(pady=(0, SIZES["spacing_md"]))
+        
         # Actions
         actions_frame_style = getFrameStyle("card")
         actions_frame = ctk.CTkFrame(self.sidebar, **actions_frame_style)
@@ -156,7 +176,56 @@ class MainWindow:
             command=self.createNewAppointment,
             **new_appointment_btn_style
         )
-        new_appointment_btn.pack(fill="x", padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_md"]))
+        new_appointment_btn.pack(fill="x", padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_sm"]))
+        
+        # Audit des doubles réservations du trimestre affiché
+        conflicts_btn_style = getButtonStyle("warning")
+        conflicts_btn_style["corner_radius"] = 0
+        conflicts_btn = ctk.CTkButton(
+            actions_frame,
+            text="Conflits du trimestre",
+            command=self.showConflicts,
+            **conflicts_btn_style
+        )
+        conflicts_btn.pack(fill="x", padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_sm"]))
+        
+        # Statistiques de l'année affichée
+        statistics_btn_style = getButtonStyle("secondary")
+        statistics_btn_style["corner_radius"] = 0
+        statistics_btn = ctk.CTkButton(
+            actions_frame,
+            text="Statistiques",
+            command=self.showStatistics,
+            **statistics_btn_style
+        )
+        statistics_btn.pack(fill="x", padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_md"]))
+        
+        # Recherche plein texte
+        search_frame_style = getFrameStyle("card")
+        search_frame = ctk.CTkFrame(self.sidebar, **search_frame_style)
+        search_frame.pack(fill="x", padx=SIZES["spacing_xl"], pady=(0, SIZES["spacing_xl"]))
+        
+        search_label = ctk.CTkLabel(
+            search_frame, 
+            text="Recherche", 
+            font=ctk.CTkFont(weight="bold"),
+            text_color=COLORS["text_primary"]
+        )
+        search_label.pack(pady=(SIZES["spacing_md"], SIZES["spacing_sm"]))
+        
+        self.search_var = ctk.StringVar()
+        self.search_entry = ctk.CTkEntry(
+            search_frame,
+            textvariable=self.search_var,
+            placeholder_text="Titre, description...",
+            corner_radius=0
+        )
+        self.search_entry.pack(fill="x", padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_sm"]))
+        self.search_entry.bind("<KeyRelease>", self.onSearchChanged)
+        
+        # Résultats remplis au fil de la saisie
+        self.search_results_frame = ctk.CTkFrame(search_frame, fg_color="transparent")
+        self.search_results_frame.pack(fill="x", padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_sm"]))
         
         # Filtres par catégorie
         filters_frame_style = getFrameStyle("card")
@@ -171,11 +240,19 @@ class MainWindow:
         )
         filters_label.pack(pady=(SIZES["spacing_md"], SIZES["spacing_sm"]))
         
+        # Checkboxes créées une fois les catégories chargées en arrière-plan
+        self.filters_frame = filters_frame
+        self.executor.submit(
+            self.category_service.getAllCategories,
+            callback=self.createCategoryFilters
+        )
+    
+    def createCategoryFilters(self, categories):
+        """Crée les checkboxes de filtre pour les catégories chargées"""
         # Checkboxes pour les catégories avec style amélioré et bordure visible
-        categories = self.category_service.getAllCategories()
         for category in categories:
             checkbox = ctk.CTkCheckBox(
-                filters_frame, 
+                self.filters_frame, 
                 text=category.name,
                 command=lambda: self.updateCalendarView(),
                 text_color=COLORS["text_primary"],
@@ -191,6 +268,143 @@ class MainWindow:
             checkbox.pack(anchor="w", padx=SIZES["spacing_md"], pady=SIZES["spacing_xs"])
             checkbox.select()  # Sélectionné par défaut
     
+    def onSearchChanged(self, event=None):
+        """Relance la recherche après une courte pause dans la saisie"""
+        if self.search_after_id is not None:
+            self.root.after_cancel(self.search_after_id)
+        self.search_after_id = self.root.after(SEARCH_DEBOUNCE_MS, self.runSearch)
+    
+    def runSearch(self):
+        """Soumet la recherche au thread de travail"""
+        self.search_after_id = None
+        query = self.search_var.get().strip()
+        
+        if not query:
+            self.executor.cancelKey("search")
+            self.showSearchResults([])
+            return
+        
+        # Une frappe plus récente rend obsolète la recherche précédente
+        self.executor.submit(
+            self.appointment_service.search,
+            query,
+            callback=self.showSearchResults,
+            key="search"
+        )
+    
+    def showSearchResults(self, appointments):
+        """Affiche les résultats de la recherche dans la sidebar"""
+        for widget in self.search_results_frame.winfo_children():
+            widget.destroy()
+        
+        if not appointments:
+            if self.search_var.get().strip():
+                ctk.CTkLabel(
+                    self.search_results_frame,
+                    text="Aucun résultat",
+                    text_color=COLORS["text_secondary"],
+                    font=ctk.CTkFont(size=FONTS["size_sm"])
+                ).pack(anchor="w")
+            return
+        
+        # Les premiers résultats suffisent dans la sidebar
+        for appointment in appointments[:8]:
+            result_btn = ctk.CTkButton(
+                self.search_results_frame,
+                text=f"{appointment.start_datetime.strftime('%d/%m/%Y')} · {appointment.title}",
+                command=lambda a=appointment: self.onSearchResultSelected(a),
+                anchor="w",
+                height=26,
+                corner_radius=0,
+                fg_color="transparent",
+                hover_color=COLORS["surface_hover"],
+                text_color=COLORS["text_primary"],
+                font=ctk.CTkFont(size=FONTS["size_sm"])
+            )
+            result_btn.pack(fill="x")
+        
+        self.updateStatusBar(f"Recherche: {len(appointments)} résultat(s)")
+    
+    def onSearchResultSelected(self, appointment):
+        """Affiche le mois du rendez-vous trouvé puis ouvre son édition"""
+        self.setViewMode("month", appointment.start_datetime.date())
+        self.editAppointment(appointment)
+    
+    def showConflicts(self):
+        """Recherche en arrière-plan les conflits du trimestre de la date courante"""
+        first_month = 3 * ((self.current_date.month - 1) // 3) + 1
+        start_date = date(self.current_date.year, first_month, 1)
+        if first_month == 10:
+            end_date = date(self.current_date.year, 12, 31)
+        else:
+            end_date = date(self.current_date.year, first_month + 3, 1) - timedelta(days=1)
+        
+        self.updateStatusBar("Recherche des conflits...")
+        self.executor.submit(
+            self.appointment_service.findConflicts,
+            start_date,
+            end_date,
+            callback=lambda groups: self.showConflictReport(start_date, end_date, groups),
+            key="conflicts"
+        )
+    
+    def showConflictReport(self, start_date: date, end_date: date, groups):
+        """Affiche les groupes de rendez-vous qui se chevauchent"""
+        report_window = ctk.CTkToplevel(self.root)
+        report_window.title(
+            f"Conflits du {start_date.strftime('%d/%m/%Y')} au {end_date.strftime('%d/%m/%Y')}"
+        )
+        report_window.geometry("520x420")
+        report_window.transient(self.root)
+        
+        groups_frame = ctk.CTkScrollableFrame(report_window)
+        groups_frame.pack(fill="both", expand=True, padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
+        
+        if not groups:
+            ctk.CTkLabel(
+                groups_frame,
+                text="Aucun conflit sur la période",
+                text_color=COLORS["text_secondary"]
+            ).pack(pady=SIZES["spacing_xl"])
+        
+        for group in groups:
+            group_end = max(appointment.end_datetime for appointment in group)
+            ctk.CTkLabel(
+                groups_frame,
+                text=(f"{group[0].start_datetime.strftime('%d/%m/%Y %H:%M')} - "
+                      f"{group_end.strftime('%H:%M')} · {len(group)} rendez-vous"),
+                font=ctk.CTkFont(weight="bold"),
+                text_color=COLORS["text_primary"]
+            ).pack(anchor="w", pady=(SIZES["spacing_sm"], 0))
+            
+            for appointment in group:
+                ctk.CTkButton(
+                    groups_frame,
+                    text=(f"{appointment.start_datetime.strftime('%H:%M')}-"
+                          f"{appointment.end_datetime.strftime('%H:%M')}  {appointment.title}"),
+                    command=lambda a=appointment: self.onSearchResultSelected(a),
+                    anchor="w",
+                    height=26,
+                    corner_radius=0,
+                    fg_color="transparent",
+                    hover_color=COLORS["surface_hover"],
+                    text_color=COLORS["text_primary"],
+                    font=ctk.CTkFont(size=FONTS["size_sm"])
+                ).pack(fill="x", padx=(SIZES["spacing_md"], 0))
+        
+        self.updateStatusBar(f"Conflits: {len(groups)} groupe(s)")
+    
+    def showStatistics(self):
+        """Ouvre le panneau de statistiques de l'année de la date courante"""
+        dialog = StatisticsDialog(
+            self.root,
+            self.analytics_service,
+            self.category_service,
+            self.current_date.year,
+            executor=self.executor
+        )
+        dialog.show()
+    
     def createContentArea(self):
         """Crée la zone de contenu principal"""
         content_style = getFrameStyle("default")
@@ -204,10 +418,19 @@ class MainWindow:
             self.content_frame, 
             self.appointment_service,
             self.onDateSelected,
-            self.onAppointmentSelected
+            self.onAppointmentSelected,
+            executor=self.executor
         )
         self.calendar_view.pack(fill="both", expand=True, padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
         
+        # Vue annuelle (affichée à la place du calendrier en mode année)
+        self.year_view = YearView(
+            self.content_frame,
+            self.appointment_service,
+            self.onYearDaySelected,
+            executor=self.executor
+        )
+        
         # Initialiser avec la date courante
         self.calendar_view.showDate(self.current_date)
     
@@ -230,7 +453,9 @@ class MainWindow:
         """Configure les raccourcis clavier"""
         self.root.bind("<Control-n>", lambda e: self.createNewAppointment())
         self.root.bind("<F5>", lambda e: self.updateCalendarView())
+        self.root.bind("<Control-f>", lambda e: self.search_entry.focus_set())
         self.root.bind("<Escape>", lambda e: self.root.quit())
+        self.root.protocol("WM_DELETE_WINDOW", self.root.quit)
     
     def onDateSelected(self, selected_date: date):
         """Callback appelé quand une date est sélectionnée"""
@@ -246,36 +471,68 @@ class MainWindow:
             # Double-clic pour éditer
             self.editAppointment(appointment)
     
+    def onYearDaySelected(self, selected_date: date):
+        """Callback de la vue annuelle : ouvre le mois du jour cliqué"""
+        self.setViewMode("month", selected_date)
+        self.onDateSelected(selected_date)
+    
+    def setViewMode(self, mode: str, target_date: Optional[date] = None):
+        """Bascule entre la vue mensuelle et la vue annuelle"""
+        if mode != self.view_mode:
+            self.view_mode = mode
+            self.view_mode_selector.set("Année" if mode == "year" else "Mois")
+            
+            if mode == "year":
+                self.calendar_view.pack_forget()
+                self.year_view.pack(fill="both", expand=True, padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
+            else:
+                self.year_view.pack_forget()
+                self.calendar_view.pack(fill="both", expand=True, padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
+        
+        self.showPeriod(target_date or self.current_date)
+    
+    def showPeriod(self, target_date: date):
+        """Affiche la période (mois ou année) contenant la date"""
+        self.current_date = target_date
+        if self.view_mode == "year":
+            self.year_view.showYear(target_date.year)
+            self.date_label.configure(text=target_date.strftime("%Y"))
+        else:
+            self.calendar_view.showDate(target_date)
+            self.date_label.configure(text=target_date.strftime("%B %Y"))
+    
+    def shiftYear(self, years: int) -> date:
+        """Date courante décalée d'un nombre d'années (29 février -> 28 février)"""
+        year = self.current_date.year + years
+        if self.current_date.month == 2 and self.current_date.day == 29:
+            return date(year, 2, 28)
+        return self.current_date.replace(year=year)
+    
     def previousPeriod(self):
         """Navigate vers la période précédente"""
-        # Logique de navigation (mois précédent par exemple)
-        if self.current_date.month == 1:
+        if self.view_mode == "year":
+            new_date = self.shiftYear(-1)
+        elif self.current_date.month == 1:
             new_date = self.current_date.replace(year=self.current_date.year - 1, month=12)
         else:
             new_date = self.current_date.replace(month=self.current_date.month - 1)
         
-        self.current_date = new_date
-        self.calendar_view.showDate(new_date)
-        self.date_label.configure(text=new_date.strftime("%B %Y"))
+        self.showPeriod(new_date)
     
     def nextPeriod(self):
         """Navigate vers la période suivante"""
-        # Logique de navigation (mois suivant par exemple)
-        if self.current_date.month == 12:
+        if self.view_mode == "year":
+            new_date = self.shiftYear(1)
+        elif self.current_date.month == 12:
             new_date = self.current_date.replace(year=self.current_date.year + 1, month=1)
         else:
             new_date = self.current_date.replace(month=self.current_date.month + 1)
         
-        self.current_date = new_date
-        self.calendar_view.showDate(new_date)
-        self.date_label.configure(text=new_date.strftime("%B %Y"))
+        self.showPeriod(new_date)
     
     def goToToday(self):
         """Revient à la date d'aujourd'hui"""
-        today = date.today()
-        self.current_date = today
-        self.calendar_view.showDate(today)
-        self.date_label.configure(text=today.strftime("%B %Y"))
+        self.showPeriod(date.today())
         self.updateStatusBar("Navigation: Aujourd'hui")
     
     def createNewAppointment(self):
@@ -285,7 +542,8 @@ class MainWindow:
             self.category_service,
             self.appointment_service,
             appointment=None,  # Nouveau rendez-vous
-            callback=self.onAppointmentSaved
+            callback=self.onAppointmentSaved,
+            executor=self.executor
         )
         dialog.show()
     
@@ -296,7 +554,8 @@ class MainWindow:
             self.category_service,
             self.appointment_service,
             appointment=appointment,
-            callback=self.onAppointmentSaved
+            callback=self.onAppointmentSaved,
+            executor=self.executor
         )
         dialog.show()
     
@@ -307,8 +566,8 @@ class MainWindow:
         self.updateStatusBar("Rendez-vous sauvegardé")
     
     def updateCalendarView(self):
-        """Met à jour la vue calendrier"""
-        self.calendar_view.showDate(self.current_date)
+        """Met à jour la vue affichée (mois ou année)"""
+        self.showPeriod(self.current_date)
     
     def updateStatusBar(self, message: str):
         """Met à jour la barre de statut"""
@@ -317,4 +576,9 @@ class MainWindow:
     
     def run(self):
         """Lance l'application"""
-        self.root.mainloop()
\ No newline at end of file
+        try:
+            self.root.mainloop()
+        finally:
+            # Laisser le thread de travail terminer avant la fermeture de la base
+            self.executor.shutdown()
+            self.root.destroy()
\ No newline at end of file
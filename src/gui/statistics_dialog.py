@@ -0,0 +1,158 @@
+"""Panneau de statistiques sur l'occupation de l'agenda"""
+
+import tkinter as tk
+import tkinter.font as tkfont
+import customtkinter as ctk
+from datetime import date
+from typing import Dict, Tuple
+import numpy as np
+from src.services.analytics_service import AnalyticsService
+from src.services.category_service import CategoryService
+from src.services.taxonomy_index import TaxonomyIndex
+from src.gui.background_executor import ImmediateExecutor
+from src.utils.theme import getFrameStyle, getHeatColor, SIZES, COLORS, FONTS
+
+
+WEEKDAY_NAMES = ["Lundi", "Mardi", "Mercredi", "Jeudi", "Vendredi", "Samedi", "Dimanche"]
+
+
+class StatisticsDialog:
+    """Fenêtre affichant les statistiques d'une année"""
+    
+    HEATMAP_CELL = 18
+    HEATMAP_LABEL_WIDTH = 36
+    
+    def __init__(self, parent, analytics_service: AnalyticsService,
+                 category_service: CategoryService, year: int, executor=None):
+        self.parent = parent
+        self.analytics_service = analytics_service
+        self.category_service = category_service
+        # Les calculs passent par l'exécuteur (thread de travail)
+        self.executor = executor or ImmediateExecutor()
+        self.year = year
+        
+        self.window = None
+        self.content_frame = None
+    
+    def show(self):
+        """Affiche la fenêtre puis lance le calcul en arrière-plan"""
+        self.window = ctk.CTkToplevel(self.parent)
+        self.window.title(f"Statistiques {self.year}")
+        self.window.geometry("640x720")
+        self.window.transient(self.parent)
+        
+        self.content_frame = ctk.CTkScrollableFrame(self.window)
+        self.content_frame.pack(fill="both", expand=True, padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
+        
+        self.status_label = ctk.CTkLabel(
+            self.content_frame, text="Calcul en cours...", text_color=COLORS["text_secondary"]
+        )
+        self.status_label.pack(pady=SIZES["spacing_xl"])
+        
+        self.executor.submit(self.fetchStatistics, callback=self.onStatisticsLoaded)
+    
+    def fetchStatistics(self) -> Tuple[Dict[str, object], TaxonomyIndex]:
+        """Calcule les agrégats de l'année et charge les noms des catégories (thread de travail)"""
+        summary = self.analytics_service.getSummary(date(self.year, 1, 1), date(self.year, 12, 31))
+        return summary, self.category_service.getTaxonomy()
+    
+    def onStatisticsLoaded(self, result: Tuple[Dict[str, object], TaxonomyIndex]):
+        """Affiche les statistiques calculées"""
+        if not (self.window and self.window.winfo_exists()):
+            return
+        
+        summary, taxonomy = result
+        self.status_label.configure(
+            text=f"{summary['appointment_count']} rendez-vous · {summary['total_hours']:.1f} heures",
+            text_color=COLORS["text_primary"],
+            font=ctk.CTkFont(size=FONTS["size_lg"], weight=FONTS["weight_bold"])
+        )
+        
+        self.createCategorySection(summary, taxonomy)
+        self.createWeekdaySection(summary)
+        self.createHeatmapSection(summary["occupancy"])
+    
+    def createSection(self, title: str) -> ctk.CTkFrame:
+        """Crée une carte titrée"""
+        section = ctk.CTkFrame(self.content_frame, **getFrameStyle("card"))
+        section.pack(fill="x", pady=(0, SIZES["spacing_md"]))
+        
+        ctk.CTkLabel(
+            section, text=title, font=ctk.CTkFont(weight="bold"), text_color=COLORS["text_primary"]
+        ).pack(anchor="w", padx=SIZES["spacing_md"], pady=(SIZES["spacing_sm"], SIZES["spacing_xs"]))
+        return section
+    
+    def addRow(self, section: ctk.CTkFrame, label: str, value: str, indent: int = 0):
+        """Ajoute une ligne libellé / valeur à une carte"""
+        row = ctk.CTkFrame(section, fg_color="transparent")
+        row.pack(fill="x", padx=(SIZES["spacing_md"] + indent, SIZES["spacing_md"]))
+        
+        ctk.CTkLabel(row, text=label, text_color=COLORS["text_primary"]).pack(side="left")
+        ctk.CTkLabel(row, text=value, text_color=COLORS["text_secondary"]).pack(side="right")
+    
+    def createCategorySection(self, summary: Dict[str, object], taxonomy: TaxonomyIndex):
+        """Heures de l'année et moyenne hebdomadaire par catégorie et sous-catégorie"""
+        section = self.createSection("Heures par catégorie")
+        week_count = max(len(summary["weeks"]), 1)
+        
+        by_subcategory = {}
+        for (category_id, subcategory_id), hours in summary["weekly_subcategory_hours"].items():
+            by_subcategory.setdefault(category_id, []).append((subcategory_id, hours.sum()))
+        
+        categories = sorted(summary["weekly_hours"].items(), key=lambda item: -item[1].sum())
+        for category_id, hours in categories:
+            category = taxonomy.getCategoryById(category_id)
+            total = hours.sum()
+            self.addRow(
+                section, category.name if category else f"Catégorie {category_id}",
+                f"{total:.1f} h · {total / week_count:.1f} h/semaine"
+            )
+            
+            for subcategory_id, subtotal in sorted(by_subcategory.get(category_id, []), key=lambda item: -item[1]):
+                subcategory = taxonomy.getSubcategoryById(subcategory_id) if subcategory_id else None
+                self.addRow(
+                    section, subcategory.name if subcategory else "Sans sous-catégorie",
+                    f"{subtotal:.1f} h", indent=SIZES["spacing_xl"]
+                )
+        
+        ctk.CTkFrame(section, height=SIZES["spacing_sm"], fg_color="transparent").pack()
+    
+    def createWeekdaySection(self, summary: Dict[str, object]):
+        """Jours de la semaine classés par heures occupées"""
+        section = self.createSection("Jours les plus chargés")
+        counts, hours = summary["weekday_counts"], summary["weekday_hours"]
+        
+        for weekday in np.argsort(-hours, kind="stable"):
+            self.addRow(section, WEEKDAY_NAMES[weekday], f"{counts[weekday]} RDV · {hours[weekday]:.1f} h")
+        
+        ctk.CTkFrame(section, height=SIZES["spacing_sm"], fg_color="transparent").pack()
+    
+    def createHeatmapSection(self, occupancy: np.ndarray):
+        """Occupation par jour de la semaine et par heure, dessinée sur un canvas"""
+        section = self.createSection("Occupation par heure")
+        cell = self.HEATMAP_CELL
+        left = self.HEATMAP_LABEL_WIDTH
+        label_font = (tkfont.nametofont("TkDefaultFont").actual("family"), FONTS["size_xs"])
+        
+        canvas = tk.Canvas(
+            section, width=left + 24 * cell, height=(len(WEEKDAY_NAMES) + 1) * cell,
+            background=COLORS["surface"], highlightthickness=0
+        )
+        canvas.pack(padx=SIZES["spacing_md"], pady=(0, SIZES["spacing_md"]))
+        
+        # Intensité relative à la tranche la plus occupée
+        peak = occupancy.max() or 1
+        for hour in range(0, 24, 3):
+            canvas.create_text(left + hour * cell + cell / 2, cell / 2, text=f"{hour}h",
+                               fill=COLORS["text_secondary"], font=label_font)
+        
+        for weekday, name in enumerate(WEEKDAY_NAMES):
+            y = (weekday + 1) * cell
+            canvas.create_text(left - 4, y + cell / 2, text=name[:3], anchor="e",
+                               fill=COLORS["text_secondary"], font=label_font)
+            for hour in range(24):
+                x = left + hour * cell
+                canvas.create_rectangle(
+                    x + 1, y + 1, x + cell - 1, y + cell - 1, outline="",
+                    fill=getHeatColor(occupancy[weekday, hour] / peak)
+                )
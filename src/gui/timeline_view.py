@@ -2,19 +2,26 @@
 
 import customtkinter as ctk
 from datetime import date, datetime, time
-from typing import List, Callable
+from typing import Callable, List, Tuple
 from src.services.appointment_service import AppointmentService
-from src.models.appointment import Appointment
+from src.models.appointment_details import AppointmentDetails
+from src.gui.background_executor import ImmediateExecutor
 
 
 class TimelineView(ctk.CTkFrame):
     """Widget de vue timeline pour afficher les rendez-vous d'une journée"""
     
+    # Créneaux affichés : de 6h à minuit
+    FIRST_HOUR = 6
+    END_HOUR = 24
+    
     def __init__(self, parent, appointment_service: AppointmentService, 
-                 on_appointment_selected: Callable):
+                 on_appointment_selected: Callable, executor=None):
         super().__init__(parent)
         
         self.appointment_service = appointment_service
+        # Les appels au service passent par l'exécuteur (thread de travail)
+        self.executor = executor or ImmediateExecutor()
         self.on_appointment_selected = on_appointment_selected
         
         self.current_date = date.today()
@@ -50,7 +57,7 @@ class TimelineView(ctk.CTkFrame):
         self.time_slots.clear()
         
         # Créer les créneaux horaires (de 6h à 23h)
-        for hour in range(6, 24):
+        for hour in range(self.FIRST_HOUR, self.END_HOUR):
             self.createTimeSlot(hour)
     
     def createTimeSlot(self, hour: int):
@@ -92,13 +99,32 @@ class TimelineView(ctk.CTkFrame):
             text=target_date.strftime("%A %d %B %Y").capitalize()
         )
         
-        # Récupérer les rendez-vous du jour
-        appointments = self.appointment_service.getAppointmentsByDate(target_date)
-        
-        # Placer les rendez-vous dans les créneaux appropriés
+        # Récupérer les rendez-vous du jour en arrière-plan puis les placer
+        # dans les créneaux appropriés (ignoré si une autre date a été demandée)
+        self.executor.submit(
+            self.fetchDay,
+            target_date,
+            callback=self.onDayLoaded,
+            key=("timeline_day", id(self))
+        )
+    
+    def fetchDay(self, target_date: date) -> Tuple[List[AppointmentDetails], List[int]]:
+        """Récupère les rendez-vous et les heures entièrement libres du jour (thread de travail)"""
+        appointments = self.appointment_service.getAppointmentsWithCategory(target_date)
+        free_slots = self.appointment_service.findFreeSlots(
+            target_date, target_date, working_hours=(self.FIRST_HOUR, self.END_HOUR)
+        )
+        return appointments, [slot_start.hour for slot_start, _ in free_slots]
+    
+    def onDayLoaded(self, day_data: Tuple[List[AppointmentDetails], List[int]]):
+        """Place les rendez-vous puis propose la création sur les heures libres"""
+        appointments, free_hours = day_data
         self.placeAppointments(appointments)
+        
+        for hour in free_hours:
+            self.addNewAppointmentSlot(hour)
     
-    def placeAppointments(self, appointments: List[Appointment]):
+    def placeAppointments(self, appointments: List[AppointmentDetails]):
         """Place les rendez-vous dans les créneaux horaires appropriés"""
         # Nettoyer les rendez-vous existants
         for slot in self.time_slots:
@@ -115,7 +141,7 @@ class TimelineView(ctk.CTkFrame):
             if slot:
                 self.createAppointmentWidget(slot['appointments_frame'], appointment)
     
-    def createAppointmentWidget(self, parent, appointment: Appointment):
+    def createAppointmentWidget(self, parent, appointment: AppointmentDetails):
         """Crée un widget pour afficher un rendez-vous"""
         # Frame principal du rendez-vous
         apt_frame = ctk.CTkFrame(parent)
@@ -125,7 +151,7 @@ class TimelineView(ctk.CTkFrame):
         apt_frame.grid_columnconfigure(1, weight=1)
         
         # Indicateur coloré (selon la catégorie)
-        color_indicator = ctk.CTkFrame(apt_frame, width=4, fg_color="#3B82F6")
+        color_indicator = ctk.CTkFrame(apt_frame, width=4, fg_color=appointment.getColor())
         color_indicator.grid(row=0, column=0, sticky="ns", padx=(5, 0))
         
         # Contenu du rendez-vous
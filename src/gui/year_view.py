@@ -0,0 +1,120 @@
+"""Vue annuelle : carte de chaleur des jours d'une année"""
+
+import customtkinter as ctk
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
+from src.services.appointment_service import AppointmentService
+from src.gui.background_executor import ImmediateExecutor
+from src.gui.canvas_year_grid import CanvasYearGrid, heatLevels, monthColumns, yearCellDates
+from src.utils.theme import getFrameStyle, SIZES, COLORS, FONTS
+
+
+# Mesure affichée (libellé -> position dans le couple (nombre, minutes))
+METRICS = {"Rendez-vous": 0, "Minutes": 1}
+
+
+class YearView(ctk.CTkFrame):
+    """Widget de vue annuelle : un jour par cellule, teinté selon son occupation
+    
+    L'année est chargée en une requête agrégée (AppointmentService.getYearActivity)
+    et dessinée sur un unique canvas ; changer de mesure redessine sans requête.
+    """
+    
+    def __init__(self, parent, appointment_service: AppointmentService,
+                 on_date_selected: Callable[[date], None], executor=None):
+        super().__init__(parent)
+        
+        self.appointment_service = appointment_service
+        # Les appels au service passent par l'exécuteur (thread de travail)
+        self.executor = executor or ImmediateExecutor()
+        self.on_date_selected = on_date_selected
+        
+        self.year = date.today().year
+        self.activity: Dict[date, Tuple[int, int]] = {}
+        self.cell_dates: List[Optional[date]] = []
+        
+        self.setupUI()
+    
+    def setupUI(self):
+        """Configure l'en-tête, la grille et la ligne de détail"""
+        self.header_frame = ctk.CTkFrame(self, **getFrameStyle("card"))
+        self.header_frame.pack(fill="x", padx=SIZES["spacing_md"], pady=(SIZES["spacing_md"], SIZES["spacing_sm"]))
+        
+        self.year_label = ctk.CTkLabel(
+            self.header_frame,
+            text="",
+            font=ctk.CTkFont(size=FONTS["size_xl"], weight=FONTS["weight_bold"]),
+            text_color=COLORS["text_primary"]
+        )
+        self.year_label.pack(side="left", padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
+        
+        self.metric_var = ctk.StringVar(value="Rendez-vous")
+        self.metric_selector = ctk.CTkSegmentedButton(
+            self.header_frame,
+            values=list(METRICS),
+            variable=self.metric_var,
+            command=lambda value: self.renderYear(self.year, self.activity)
+        )
+        self.metric_selector.pack(side="right", padx=SIZES["spacing_md"], pady=SIZES["spacing_md"])
+        
+        self.year_grid = CanvasYearGrid(
+            self,
+            on_cell_click=self.onCellClick,
+            on_cell_hover=self.onCellHover,
+            height=7 * 22 + CanvasYearGrid.HEADER_HEIGHT
+        )
+        self.year_grid.pack(fill="both", expand=True, padx=SIZES["spacing_md"])
+        self.cell_dates = yearCellDates(self.year, self.year_grid.cell_count)
+        
+        self.detail_label = ctk.CTkLabel(self, text="", text_color=COLORS["text_secondary"])
+        self.detail_label.pack(anchor="w", padx=SIZES["spacing_md"], pady=SIZES["spacing_sm"])
+    
+    def showYear(self, year: int):
+        """Charge l'activité de l'année en arrière-plan puis la dessine"""
+        self.year = year
+        self.year_label.configure(text=str(year))
+        
+        # Une navigation plus récente rend ce chargement obsolète (même clé)
+        self.executor.submit(
+            self.appointment_service.getYearActivity,
+            year,
+            callback=lambda activity: self.renderYear(year, activity),
+            key=("year_activity", id(self))
+        )
+    
+    def renderYear(self, year: int, activity: Dict[date, Tuple[int, int]]):
+        """Teinte chaque jour selon la mesure choisie"""
+        # Ignorer une réponse arrivée après un changement d'année
+        if year != self.year:
+            return
+        
+        self.activity = activity
+        self.cell_dates = yearCellDates(year, self.year_grid.cell_count)
+        metric = METRICS[self.metric_var.get()]
+        
+        values = [activity[day][metric] if day in activity else 0 for day in self.cell_dates]
+        levels = [
+            level if day is not None else None
+            for day, level in zip(self.cell_dates, heatLevels(values))
+        ]
+        self.year_grid.render(levels, monthColumns(year))
+        
+        count = sum(day_count for day_count, _ in activity.values())
+        minutes = sum(day_minutes for _, day_minutes in activity.values())
+        self.detail_label.configure(text=f"{count} rendez-vous · {minutes / 60:.1f} heures réservées")
+    
+    def onCellClick(self, index: int):
+        """Sélectionne le jour cliqué"""
+        if self.cell_dates[index]:
+            self.on_date_selected(self.cell_dates[index])
+    
+    def onCellHover(self, index: Optional[int]):
+        """Affiche le détail du jour survolé"""
+        day = self.cell_dates[index] if index is not None else None
+        if day is None:
+            return
+        
+        count, minutes = self.activity.get(day, (0, 0))
+        self.detail_label.configure(
+            text=f"{day.strftime('%d/%m/%Y')} · {count} rendez-vous · {minutes // 60} h {minutes % 60:02d}"
+        )
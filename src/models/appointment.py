@@ -1,16 +1,32 @@
 """Modèle pour les rendez-vous"""
 
+import copy
 from datetime import datetime, date, timedelta
-from typing import Optional
+from typing import Callable, Optional
+from src.utils.epoch import fromEpoch, toEpoch
 
 
 class Appointment:
     """Représente un rendez-vous dans le calendrier"""
     
+    # Pas de __dict__ par instance : moins de mémoire sur les gros historiques.
+    # Les horaires sont conservés sous leurs deux formes (datetime et secondes
+    # depuis l'époque), chacune calculée à la demande à partir de l'autre.
+    # La description peut être différée (voir deferDescription).
+    # __weakref__ permet le suivi des instances par l'IdentityMap.
+    __slots__ = (
+        "id", "title", "_description", "_description_loader", "_start", "_end",
+        "_start_epoch", "_end_epoch", "category_id", "subcategory_id", "recurrence_rule",
+        "series_start", "__weakref__"
+    )
+    
+    # Nombre de colonnes lues par fromRow
+    ROW_LENGTH = 8
+    
     def __init__(self, id: Optional[int] = None, title: str = "", 
                  description: str = "", start_datetime: Optional[datetime] = None,
                  end_datetime: Optional[datetime] = None, category_id: Optional[int] = None,
-                 subcategory_id: Optional[int] = None):
+                 subcategory_id: Optional[int] = None, recurrence_rule: Optional[str] = None):
         self.id = id
         self.title = title
         self.description = description
@@ -18,6 +34,119 @@ class Appointment:
         self.end_datetime = end_datetime
         self.category_id = category_id
         self.subcategory_id = subcategory_id
+        # Règle RRULE (ex. "FREQ=WEEKLY;BYDAY=MO") : le rendez-vous est alors
+        # le modèle d'une série dont le début est la première occurrence
+        self.recurrence_rule = recurrence_rule
+        # Début du modèle de la série lorsque l'objet est une occurrence calculée
+        self.series_start = None
+    
+    @classmethod
+    def fromRow(cls, row: tuple) -> "Appointment":
+        """Construit un rendez-vous à partir d'une ligne positionnelle
+        
+        Ordre attendu : id, title, description, start_datetime, end_datetime,
+        category_id, subcategory_id, recurrence_rule (horaires en secondes
+        depuis l'époque).
+        Les datetimes ne sont construits qu'au premier accès.
+        """
+        appointment = cls.__new__(cls)
+        appointment.loadRow(row)
+        return appointment
+    
+    def loadRow(self, row: tuple):
+        """(Re)charge les champs depuis une ligne positionnelle (voir fromRow)"""
+        (self.id, self.title, self._description, self._start_epoch, self._end_epoch,
+         self.category_id, self.subcategory_id, self.recurrence_rule) = row
+        self._description_loader = None
+        self._start = None
+        self._end = None
+        self.series_start = None
+    
+    def rowValues(self, include_description: bool = True) -> tuple:
+        """Retourne la ligne positionnelle de l'objet (voir fromRow)
+        
+        Sans ``include_description``, la description vaut None, comme dans
+        une ligne lue en projection summary.
+        """
+        return (self.id, self.title, self._description if include_description else None,
+                self.start_epoch, self.end_epoch, self.category_id, self.subcategory_id,
+                self.recurrence_rule)
+    
+    @property
+    def description(self) -> Optional[str]:
+        if self._description_loader is not None:
+            loader, self._description_loader = self._description_loader, None
+            self._description = loader(self.id)
+        return self._description
+    
+    @description.setter
+    def description(self, value: Optional[str]):
+        self._description = value
+        self._description_loader = None
+    
+    def deferDescription(self, loader: Callable[[int], Optional[str]]):
+        """Diffère la description : loader(id) la chargera au premier accès"""
+        self._description = None
+        self._description_loader = loader
+    
+    def isDescriptionLoaded(self) -> bool:
+        """Indique si la description est en mémoire (sinon chargée au premier accès)"""
+        return self._description_loader is None
+    
+    @property
+    def start_datetime(self) -> Optional[datetime]:
+        if self._start is None and self._start_epoch is not None:
+            self._start = fromEpoch(self._start_epoch)
+        return self._start
+    
+    @start_datetime.setter
+    def start_datetime(self, value: Optional[datetime]):
+        self._start = value
+        self._start_epoch = None
+    
+    @property
+    def end_datetime(self) -> Optional[datetime]:
+        if self._end is None and self._end_epoch is not None:
+            self._end = fromEpoch(self._end_epoch)
+        return self._end
+    
+    @end_datetime.setter
+    def end_datetime(self, value: Optional[datetime]):
+        self._end = value
+        self._end_epoch = None
+    
+    @property
+    def start_epoch(self) -> Optional[int]:
+        """Début en secondes depuis l'époque (format de stockage)"""
+        if self._start_epoch is None and self._start is not None:
+            self._start_epoch = toEpoch(self._start)
+        return self._start_epoch
+    
+    @property
+    def end_epoch(self) -> Optional[int]:
+        """Fin en secondes depuis l'époque (format de stockage)"""
+        if self._end_epoch is None and self._end is not None:
+            self._end_epoch = toEpoch(self._end)
+        return self._end_epoch
+    
+    def isRecurring(self) -> bool:
+        """Indique si le rendez-vous est une série (modèle ou occurrence)"""
+        return bool(self.recurrence_rule)
+    
+    def isOccurrence(self) -> bool:
+        """Indique si l'objet est une occurrence calculée d'une série"""
+        return self.series_start is not None
+    
+    def createOccurrence(self, start: datetime) -> "Appointment":
+        """Retourne une copie du modèle de série placée à une occurrence
+        
+        L'occurrence garde l'ID de la série ; elle n'est pas stockée en base.
+        """
+        occurrence = copy.copy(self)
+        occurrence.start_datetime = start
+        occurrence.end_datetime = start + self.getDuration()
+        occurrence.series_start = self.start_datetime
+        return occurrence
     
     def getDuration(self) -> timedelta:
         """Retourne la durée du rendez-vous"""
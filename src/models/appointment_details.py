@@ -0,0 +1,48 @@
+"""Modèle d'un rendez-vous accompagné de sa catégorie et de sa sous-catégorie"""
+
+from typing import Optional
+from src.models.appointment import Appointment
+from src.utils.constants import COLORS
+
+
+class AppointmentDetails(Appointment):
+    """Rendez-vous enrichi des noms et couleurs de sa catégorie et sous-catégorie
+    
+    Chargé en une seule jointure par ``DatabaseManager.getAppointmentsWithCategory``,
+    pour que les vues puissent colorer les rendez-vous sans requête supplémentaire.
+    """
+    
+    __slots__ = ("category_name", "category_color", "subcategory_name", "subcategory_color")
+    
+    def __init__(self, *args, category_name: str = "", category_color: str = "",
+                 subcategory_name: Optional[str] = None, subcategory_color: Optional[str] = None,
+                 **kwargs):
+        super().__init__(*args, **kwargs)
+        self.category_name = category_name
+        self.category_color = category_color
+        self.subcategory_name = subcategory_name
+        self.subcategory_color = subcategory_color
+    
+    def loadRow(self, row: tuple):
+        """(Re)charge les champs depuis une ligne positionnelle
+        
+        Colonnes du rendez-vous (voir ``Appointment.fromRow``) suivies de
+        category_name, category_color, subcategory_name, subcategory_color.
+        """
+        super().loadRow(row[:Appointment.ROW_LENGTH])
+        (self.category_name, self.category_color,
+         self.subcategory_name, self.subcategory_color) = row[Appointment.ROW_LENGTH:]
+    
+    def rowValues(self, include_description: bool = True) -> tuple:
+        """Retourne la ligne positionnelle de l'objet, colonnes jointes comprises"""
+        return super().rowValues(include_description) + (
+            self.category_name, self.category_color, self.subcategory_name, self.subcategory_color
+        )
+    
+    def getColor(self) -> str:
+        """Retourne la couleur d'affichage : sous-catégorie, sinon catégorie"""
+        return self.subcategory_color or self.category_color or COLORS["default"]
+    
+    def __str__(self) -> str:
+        return (f"AppointmentDetails(id={self.id}, title='{self.title}', "
+                f"start={self.start_datetime}, category='{self.category_name}')")
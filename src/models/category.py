@@ -6,6 +6,13 @@ from typing import Optional
 class Category:
     """Représente une catégorie d'événements (Perso/Pro)"""
     
+    __slots__ = ("id", "name", "color")
+    
+    @classmethod
+    def fromRow(cls, row: tuple):
+        """Construit l'objet à partir d'une ligne positionnelle (id, name, color)"""
+        return cls(*row)
+    
     def __init__(self, id: Optional[int] = None, name: str = "", color: str = ""):
         self.id = id
         self.name = name
@@ -6,6 +6,13 @@ from typing import Optional
 class Subcategory:
     """Représente une sous-catégorie d'événements"""
     
+    __slots__ = ("id", "name", "category_id", "color")
+    
+    @classmethod
+    def fromRow(cls, row: tuple):
+        """Construit l'objet à partir d'une ligne positionnelle (id, name, category_id, color)"""
+        return cls(*row)
+    
     def __init__(self, id: Optional[int] = None, name: str = "", 
                  category_id: Optional[int] = None, color: str = ""):
         self.id = id
@@ -0,0 +1,150 @@
+"""Service de statistiques sur l'occupation de l'agenda
+
+Une plage est lue une seule fois sous forme de colonnes NumPy (début, fin,
+catégorie, sous-catégorie) ; les agrégats sont ensuite calculés par des
+opérations vectorisées (bincount, repeat) sans boucle Python par rendez-vous.
+"""
+
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Dict, Hashable, List, Tuple
+import numpy as np
+from src.services.appointment_service import AppointmentService
+from src.utils.epoch import SECONDS_PER_DAY, toEpoch
+
+
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_WEEK = 7 * SECONDS_PER_DAY
+# Le 1er janvier 1970 était un jeudi : décalage pour numéroter lundi = 0
+EPOCH_WEEKDAY = 3
+NO_SUBCATEGORY = -1
+SUBCATEGORY_KEY_RANGE = 1 << 32
+
+
+class AppointmentColumns:
+    """Rendez-vous d'une plage en colonnes NumPy (horaires en secondes depuis l'époque)"""
+    
+    def __init__(self, start_date: date, end_date: date, rows: List[Tuple[int, int, int, int]]):
+        self.start_date = start_date
+        self.end_date = end_date
+        
+        table = np.fromiter(chain.from_iterable(rows), dtype=np.int64, count=4 * len(rows)).reshape(-1, 4)
+        # Les rendez-vous dont la fin précède le début ne comptent pour aucune durée
+        table[:, 1] = np.maximum(table[:, 1], table[:, 0])
+        
+        self.start = table[:, 0]
+        self.end = table[:, 1]
+        self.category = table[:, 2]
+        self.subcategory = table[:, 3]
+    
+    @property
+    def duration(self) -> np.ndarray:
+        return self.end - self.start
+    
+    def __len__(self) -> int:
+        return len(self.start)
+
+
+class AnalyticsService:
+    """Service de statistiques : heures par catégorie, jours chargés, occupation horaire"""
+    
+    def __init__(self, appointment_service: AppointmentService):
+        self.appointment_service = appointment_service
+        self.db_manager = appointment_service.db_manager
+    
+    def loadColumns(self, start_date: date, end_date: date) -> AppointmentColumns:
+        """Charge en colonnes les rendez-vous et occurrences entre deux dates incluses"""
+        start = datetime.combine(start_date, time.min)
+        end = datetime.combine(end_date + timedelta(days=1), time.min)
+        
+        rows = self.db_manager.getTimeColumns(start, end)
+        rows.extend(
+            (occurrence.start_epoch, occurrence.end_epoch, occurrence.category_id,
+             occurrence.subcategory_id if occurrence.subcategory_id is not None else NO_SUBCATEGORY)
+            for occurrence in self.appointment_service.iterOccurrences(start, end)
+        )
+        return AppointmentColumns(start_date, end_date, rows)
+    
+    def getWeeklyHours(self, columns: AppointmentColumns,
+                       by_subcategory: bool = False) -> Tuple[List[date], Dict[Hashable, np.ndarray]]:
+        """Heures par semaine (du lundi) pour chaque catégorie ou (catégorie, sous-catégorie)
+        
+        Retourne les lundis des semaines couvertes et, par identifiant de
+        catégorie (ou couple catégorie / sous-catégorie, None si aucune), le
+        tableau des heures de chaque semaine.
+        """
+        first_monday = columns.start_date - timedelta(days=columns.start_date.weekday())
+        week_count = (columns.end_date - first_monday).days // 7 + 1
+        weeks = [first_monday + timedelta(weeks=index) for index in range(week_count)]
+        
+        # Clé entière unique par (catégorie, sous-catégorie) : tri 1-D bien plus rapide
+        key_column = columns.category
+        if by_subcategory:
+            key_column = key_column * SUBCATEGORY_KEY_RANGE + (columns.subcategory - NO_SUBCATEGORY)
+        keys, key_index = np.unique(key_column, return_inverse=True)
+        
+        week_index = (columns.start - toEpoch(first_monday)) // SECONDS_PER_WEEK
+        totals = np.bincount(
+            key_index * week_count + week_index,
+            weights=columns.duration / SECONDS_PER_HOUR,
+            minlength=len(keys) * week_count
+        ).reshape(len(keys), week_count)
+        
+        if not by_subcategory:
+            return weeks, {int(key): totals[index] for index, key in enumerate(keys)}
+        
+        result = {}
+        for index, key in enumerate(keys):
+            category_id, subcategory_offset = divmod(int(key), SUBCATEGORY_KEY_RANGE)
+            subcategory_id = subcategory_offset + NO_SUBCATEGORY
+            result[(category_id, None if subcategory_id == NO_SUBCATEGORY else subcategory_id)] = totals[index]
+        return weeks, result
+    
+    def getWeekdayTotals(self, columns: AppointmentColumns) -> Tuple[np.ndarray, np.ndarray]:
+        """Nombre de rendez-vous et heures par jour de début (lundi = 0)"""
+        weekday = (columns.start // SECONDS_PER_DAY + EPOCH_WEEKDAY) % 7
+        counts = np.bincount(weekday, minlength=7)
+        hours = np.bincount(weekday, weights=columns.duration / SECONDS_PER_HOUR, minlength=7)
+        return counts, hours
+    
+    def getOccupancyMatrix(self, columns: AppointmentColumns) -> np.ndarray:
+        """Minutes occupées par (jour de la semaine, heure) : matrice 7 x 24
+        
+        Chaque rendez-vous est découpé sur les tranches horaires qu'il
+        recouvre ; les chevauchements entre rendez-vous s'additionnent.
+        """
+        busy = columns.end > columns.start
+        start, end = columns.start[busy], columns.end[busy]
+        
+        # Une ligne par (rendez-vous, tranche horaire recouverte)
+        first_hour = start // SECONDS_PER_HOUR
+        span = (end - 1) // SECONDS_PER_HOUR - first_hour + 1
+        owner = np.repeat(np.arange(len(start)), span)
+        offsets = np.arange(len(owner)) - np.repeat(np.cumsum(span) - span, span)
+        hour = first_hour[owner] + offsets
+        
+        overlap = (np.minimum(end[owner], (hour + 1) * SECONDS_PER_HOUR)
+                   - np.maximum(start[owner], hour * SECONDS_PER_HOUR))
+        weekday = (hour // 24 + EPOCH_WEEKDAY) % 7
+        
+        return np.bincount(
+            weekday * 24 + hour % 24, weights=overlap / 60, minlength=7 * 24
+        ).reshape(7, 24)
+    
+    def getSummary(self, start_date: date, end_date: date) -> Dict[str, object]:
+        """Calcule tous les agrégats d'une plage à partir d'une seule lecture"""
+        columns = self.loadColumns(start_date, end_date)
+        weeks, weekly_hours = self.getWeeklyHours(columns)
+        _, weekly_subcategory_hours = self.getWeeklyHours(columns, by_subcategory=True)
+        weekday_counts, weekday_hours = self.getWeekdayTotals(columns)
+        
+        return {
+            "appointment_count": len(columns),
+            "total_hours": float(columns.duration.sum()) / SECONDS_PER_HOUR,
+            "weeks": weeks,
+            "weekly_hours": weekly_hours,
+            "weekly_subcategory_hours": weekly_subcategory_hours,
+            "weekday_counts": weekday_counts,
+            "weekday_hours": weekday_hours,
+            "occupancy": self.getOccupancyMatrix(columns),
+        }
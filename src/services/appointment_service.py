@@ -1,60 +1,215 @@
 """Service de gestion des rendez-vous"""
 
-from typing import List, Optional
-from datetime import datetime, date, timedelta
-from src.database.database_manager import DatabaseManager
+import re
+import heapq
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from datetime import datetime, date, time, timedelta
+from dateutil.rrule import rruleset
+from src.database.database_manager import PROJECTION_FULL, PROJECTION_SUMMARY, DatabaseManager
 from src.models.appointment import Appointment
+from src.models.appointment_details import AppointmentDetails
+from src.services.free_slots import iterFreeSlots, mergeIntervals
+from src.services.recurrence import buildRuleSet, expandSeries, validateRule
+from src.utils.constants import (
+    APPOINTMENT_CACHE_SIZE, SEARCH_MIN_PREFIX, SEARCH_RESULT_LIMIT, SERIES_CACHE_SIZE, WORKING_HOURS
+)
+from src.utils.lru_cache import LRUCache
+
+
+def _buildMatchQuery(text: str) -> str:
+    """Convertit une saisie libre en requête FTS5 : chaque mot est un préfixe requis"""
+    # Les mots sont mis entre guillemets : les opérateurs FTS5 (AND, NEAR, *, ...)
+    # tapés par l'utilisateur sont traités comme du texte. Les mots d'une lettre
+    # sont ignorés : ils correspondent à une grande partie de l'index.
+    words = [word for word in re.findall(r"\w+", text) if len(word) >= SEARCH_MIN_PREFIX]
+    return " ".join(f'"{word}"*' for word in words)
+
+
+def _groupOverlaps(appointments: Iterable[Appointment]) -> List[List[Appointment]]:
+    """Regroupe des rendez-vous triés par début en groupes de chevauchement
+    
+    Balayage unique : un rendez-vous rejoint le groupe courant s'il commence
+    avant la fin la plus tardive du groupe. Seuls les groupes d'au moins deux
+    rendez-vous sont retournés.
+    """
+    groups = []
+    group, group_end = [], None
+    
+    for appointment in appointments:
+        if group and appointment.start_datetime < group_end:
+            group.append(appointment)
+            group_end = max(group_end, appointment.end_datetime)
+            continue
+        
+        if len(group) > 1:
+            groups.append(group)
+        group, group_end = [appointment], appointment.end_datetime
+    
+    if len(group) > 1:
+        groups.append(group)
+    return groups
 
 
 class AppointmentService:
     """Service pour la gestion des rendez-vous"""
     
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, cache_size: int = APPOINTMENT_CACHE_SIZE,
+                 series_cache_size: int = SERIES_CACHE_SIZE):
         self.db_manager = db_manager
+        # Cache des lectures par jour ("day" / "day_details", date) et des
+        # compteurs par mois ("month", année, mois)
+        self.cache = LRUCache(cache_size)
+        # Règles des séries récurrentes, avec leurs occurrences déjà calculées
+        self.series_cache = LRUCache(series_cache_size)
     
     def createAppointment(self, title: str, description: str = "", 
                          start_datetime: datetime = None, end_datetime: datetime = None,
-                         category_id: int = None, subcategory_id: Optional[int] = None) -> int:
-        """Crée un nouveau rendez-vous"""
+                         category_id: int = None, subcategory_id: Optional[int] = None,
+                         recurrence_rule: Optional[str] = None) -> int:
+        """Crée un nouveau rendez-vous, ou une série si une règle RRULE est donnée"""
+        if recurrence_rule:
+            validateRule(recurrence_rule, start_datetime)
+        
         appointment = Appointment(
             title=title,
             description=description,
             start_datetime=start_datetime,
             end_datetime=end_datetime,
             category_id=category_id,
-            subcategory_id=subcategory_id
+            subcategory_id=subcategory_id,
+            recurrence_rule=recurrence_rule
         )
-        return self.db_manager.insertAppointment(appointment)
+        appointment_id = self.db_manager.insertAppointment(appointment)
+        
+        if recurrence_rule:
+            self.invalidateSeries(appointment_id)
+        else:
+            self.invalidateDate(start_datetime)
+        return appointment_id
     
     def getAppointmentById(self, appointment_id: int) -> Optional[Appointment]:
         """Récupère un rendez-vous par son ID"""
-        # Note: Cette méthode nécessiterait d'être ajoutée au DatabaseManager
-        # Pour l'instant, on utilise une approche alternative
-        pass
+        return self.db_manager.getAppointmentById(appointment_id)
+    
+    def getAppointmentsByIds(self, appointment_ids: List[int]) -> List[Appointment]:
+        """Récupère plusieurs rendez-vous par leurs IDs (dans l'ordre demandé)"""
+        return self.db_manager.getAppointmentsByIds(appointment_ids)
     
     def getAppointmentsByDate(self, target_date: date) -> List[Appointment]:
-        """Récupère tous les rendez-vous d'une date donnée"""
-        return self.db_manager.getAppointmentsByDate(target_date)
+        """Récupère tous les rendez-vous d'une date donnée (avec cache)"""
+        key = ("day", target_date)
+        appointments = self.cache.get(key)
+        
+        if appointments is None:
+            appointments = self.withOccurrences(
+                self.db_manager.getAppointmentsByDate(target_date),
+                *self._dayBounds(target_date, target_date)
+            )
+            self.cache.put(key, appointments)
+        
+        # Copie pour que l'appelant ne modifie pas l'entrée du cache
+        return list(appointments)
+    
+    def getAppointmentsWithCategory(self, target_date: date) -> List[AppointmentDetails]:
+        """Récupère les rendez-vous d'une date avec le nom et la couleur de leur catégorie (avec cache)"""
+        key = ("day_details", target_date)
+        appointments = self.cache.get(key)
+        
+        if appointments is None:
+            start, end = self._dayBounds(target_date, target_date)
+            appointments = self.withOccurrences(
+                self.db_manager.getAppointmentsWithCategory(start, end), start, end
+            )
+            self.cache.put(key, appointments)
+        
+        return list(appointments)
+    
+    def getAppointmentsByDateRange(self, start_date: date, end_date: date,
+                                   projection: str = PROJECTION_FULL) -> List[Appointment]:
+        """Récupère tous les rendez-vous dans une plage de dates (bornes incluses)
+        
+        Avec PROJECTION_SUMMARY, les descriptions ne sont lues qu'au premier accès.
+        """
+        # Une seule requête pour toute la plage, déjà triée par date/heure de début
+        start, end = self._dayBounds(start_date, end_date)
+        return self.withOccurrences(
+            self.db_manager.getAppointmentsInRange(start, end, projection), start, end, projection
+        )
+    
+    def getAppointmentCountsByDay(self, year: int, month: int) -> Dict[date, int]:
+        """Retourne le nombre de rendez-vous de chaque jour d'un mois (avec cache)"""
+        key = ("month", year, month)
+        counts = self.cache.get(key)
+        
+        if counts is None:
+            counts = self.db_manager.getAppointmentCountsByDay(year, month)
+            
+            month_start = date(year, month, 1)
+            next_month = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+            for occurrence in self.iterOccurrences(*self._dayBounds(month_start, next_month - timedelta(days=1))):
+                day = occurrence.start_datetime.date()
+                counts[day] = counts.get(day, 0) + 1
+            
+            self.cache.put(key, counts)
+        
+        return dict(counts)
+    
+    def getYearActivity(self, year: int) -> Dict[date, Tuple[int, int]]:
+        """Retourne (nombre, durée en minutes) de chaque jour occupé d'une année (avec cache)
+        
+        Une seule lecture agrégée de la synthèse quotidienne pour toute
+        l'année ; les occurrences des séries sont ajoutées pour l'année seule.
+        Les jours sans rendez-vous sont absents du dictionnaire retourné.
+        """
+        key = ("year", year)
+        activity = self.cache.get(key)
+        
+        if activity is None:
+            start, end = self._dayBounds(date(year, 1, 1), date(year, 12, 31))
+            totals = {
+                day: [count, seconds]
+                for day, (count, seconds) in self.db_manager.getDailyTotals(start, end).items()
+            }
+            
+            for occurrence in self.iterOccurrences(start, end, PROJECTION_SUMMARY):
+                entry = totals.setdefault(occurrence.start_datetime.date(), [0, 0])
+                entry[0] += 1
+                entry[1] += occurrence.end_epoch - occurrence.start_epoch
+            
+            activity = {day: (count, seconds // 60) for day, (count, seconds) in totals.items()}
+            self.cache.put(key, activity)
+        
+        return dict(activity)
     
-    def getAppointmentsByDateRange(self, start_date: date, end_date: date) -> List[Appointment]:
-        """Récupère tous les rendez-vous dans une plage de dates"""
-        appointments = []
-        current_date = start_date
+    def getCategoryTotals(self, start_date: date, end_date: date) -> Dict[int, Tuple[int, int]]:
+        """Totalise par catégorie (nombre, durée en minutes) les rendez-vous entre deux dates incluses
+        
+        Les rendez-vous simples sont lus dans la synthèse quotidienne (une
+        lecture indexée, quelle que soit la taille de l'historique), les
+        occurrences des séries sont ajoutées pour la seule période demandée.
+        """
+        start, end = self._dayBounds(start_date, end_date)
+        totals = {
+            category_id: [count, seconds]
+            for category_id, (count, seconds) in self.db_manager.getCategoryTotals(start, end).items()
+        }
         
-        while current_date <= end_date:
-            daily_appointments = self.getAppointmentsByDate(current_date)
-            appointments.extend(daily_appointments)
-            current_date += timedelta(days=1)
+        for occurrence in self.iterOccurrences(start, end):
+            entry = totals.setdefault(occurrence.category_id, [0, 0])
+            entry[0] += 1
+            entry[1] += (occurrence.end_datetime - occurrence.start_datetime).total_seconds()
         
-        # Trier par date/heure de début
-        appointments.sort(key=lambda apt: apt.start_datetime)
-        return appointments
+        return {category_id: (count, int(seconds // 60)) for category_id, (count, seconds) in totals.items()}
     
     def updateAppointment(self, appointment_id: int, title: str = None, 
                          description: str = None, start_datetime: datetime = None,
                          end_datetime: datetime = None, category_id: int = None,
-                         subcategory_id: Optional[int] = None) -> bool:
-        """Met à jour un rendez-vous existant"""
+                         subcategory_id: Optional[int] = None,
+                         recurrence_rule: Optional[str] = None) -> bool:
+        """Met à jour un rendez-vous existant (ou le modèle d'une série)"""
+        if recurrence_rule:
+            validateRule(recurrence_rule, start_datetime)
+        
         # Créer un objet appointment avec les nouvelles valeurs
         appointment = Appointment(
             id=appointment_id,
@@ -63,14 +218,162 @@ class AppointmentService:
             start_datetime=start_datetime,
             end_datetime=end_datetime,
             category_id=category_id,
-            subcategory_id=subcategory_id
+            subcategory_id=subcategory_id,
+            recurrence_rule=recurrence_rule
         )
         
-        return self.db_manager.updateAppointment(appointment)
+        # L'ancienne date doit aussi être invalidée en cas de déplacement : elle
+        # est lue avant l'écriture, qui publie ensuite une nouvelle instance.
+        previous = self.db_manager.getAppointmentById(appointment_id)
+        previous_start = previous.start_datetime if previous else None
+        was_recurring = previous.isRecurring() if previous else False
+        success = self.db_manager.updateAppointment(appointment)
+        
+        if was_recurring or recurrence_rule:
+            self.invalidateSeries(appointment_id)
+        else:
+            self.invalidateDate(previous_start)
+            self.invalidateDate(start_datetime)
+        return success
     
     def deleteAppointment(self, appointment_id: int) -> bool:
         """Supprime un rendez-vous"""
-        return self.db_manager.deleteAppointment(appointment_id)
+        previous = self.db_manager.getAppointmentById(appointment_id)
+        success = self.db_manager.deleteAppointment(appointment_id)
+        
+        if previous and previous.isRecurring():
+            self.invalidateSeries(appointment_id)
+        elif previous:
+            self.invalidateDate(previous.start_datetime)
+        return success
+    
+    def deleteOccurrence(self, series_id: int, occurrence_start: datetime):
+        """Retire une seule occurrence d'une série (exception)"""
+        self.db_manager.addSeriesException(series_id, occurrence_start)
+        self.series_cache.invalidate(series_id)
+        self.invalidateDate(occurrence_start)
+    
+    def updateOccurrence(self, series_id: int, occurrence_start: datetime, title: str,
+                         description: str = "", start_datetime: datetime = None,
+                         end_datetime: datetime = None, category_id: int = None,
+                         subcategory_id: Optional[int] = None) -> int:
+        """Modifie une seule occurrence d'une série et retourne l'ID du rendez-vous qui la remplace
+        
+        L'occurrence est retirée de la série (exception, comme pour
+        deleteOccurrence) et remplacée par un rendez-vous simple, dans une
+        même transaction. Les autres occurrences ne changent pas.
+        """
+        with self.db_manager.transaction():
+            self.db_manager.addSeriesException(series_id, occurrence_start)
+            appointment_id = self.db_manager.insertAppointment(Appointment(
+                title=title,
+                description=description,
+                start_datetime=start_datetime,
+                end_datetime=end_datetime,
+                category_id=category_id,
+                subcategory_id=subcategory_id
+            ))
+        
+        self.series_cache.invalidate(series_id)
+        self.invalidateDate(occurrence_start)
+        self.invalidateDate(start_datetime)
+        return appointment_id
+    
+    def iterOccurrences(self, start: datetime, end: datetime,
+                        projection: str = PROJECTION_FULL) -> Iterator[Appointment]:
+        """Génère les occurrences des séries récurrentes qui commencent dans [start, end[
+        
+        Les occurrences sont calculées à la demande, uniquement pour la
+        fenêtre demandée ; elles ne sont jamais stockées en base. Les règles
+        sont validées à l'écriture : une règle illisible en base est une
+        erreur de données, signalée par une ValueError.
+        """
+        for series in self.db_manager.getRecurringSeries(end, projection):
+            try:
+                rule_set = self._getRuleSet(series)
+            except ValueError as e:
+                raise ValueError(f"Règle de récurrence invalide pour la série {series.id}: {e}") from e
+            yield from expandSeries(series, rule_set, start, end)
+    
+    def withOccurrences(self, appointments: List[Appointment], start: datetime,
+                        end: datetime, projection: str = PROJECTION_FULL) -> List[Appointment]:
+        """Ajoute à des rendez-vous simples les occurrences de la même fenêtre, triées"""
+        occurrences = list(self.iterOccurrences(start, end, projection))
+        if not occurrences:
+            return appointments
+        return sorted(appointments + occurrences, key=lambda a: a.start_datetime)
+    
+    def _occurrenceLookback(self) -> timedelta:
+        """Retourne de combien remonter pour trouver les occurrences qui débordent sur une plage
+        
+        Une occurrence ne peut chevaucher [start, end[ que si elle commence
+        après start moins la durée de la plus longue série.
+        """
+        return timedelta(seconds=self.db_manager.getLongestSeriesDuration())
+    
+    def _getRuleSet(self, series: Appointment) -> rruleset:
+        """Retourne les occurrences (en cache) d'une série"""
+        signature = (series.recurrence_rule, series.start_datetime)
+        entry = self.series_cache.get(series.id)
+        
+        # La règle ou le début ont pu changer depuis la mise en cache
+        if entry is None or entry[0] != signature:
+            rule_set = buildRuleSet(
+                series.recurrence_rule, series.start_datetime,
+                self.db_manager.getSeriesExceptions(series.id)
+            )
+            entry = (signature, rule_set)
+            self.series_cache.put(series.id, entry)
+        return entry[1]
+    
+    def _dayBounds(self, start_date: date, end_date: date) -> Tuple[datetime, datetime]:
+        """Retourne la fenêtre [minuit du premier jour, minuit après le dernier jour["""
+        return (datetime.combine(start_date, time.min),
+                datetime.combine(end_date + timedelta(days=1), time.min))
+    
+    def search(self, query: str, limit: int = SEARCH_RESULT_LIMIT,
+               date_range: Optional[Tuple[date, date]] = None) -> List[Appointment]:
+        """Recherche les rendez-vous dont le titre ou la description contient les mots saisis
+        
+        Chaque mot est recherché comme préfixe (« méd » trouve « Médecin »), les
+        résultats sont triés par pertinence (BM25). ``date_range`` restreint la
+        recherche aux rendez-vous commençant entre deux dates incluses.
+        """
+        match_query = _buildMatchQuery(query)
+        if not match_query:
+            return []
+        
+        start_date, end_date = date_range if date_range else (None, None)
+        return self.db_manager.searchAppointments(
+            match_query, limit,
+            start=start_date,
+            end=end_date + timedelta(days=1) if end_date else None
+        )
+    
+    def invalidateDate(self, target_datetime: Optional[datetime]):
+        """Invalide les entrées du cache concernant le jour et le mois d'une date"""
+        if target_datetime is None:
+            return
+        
+        target_date = target_datetime.date() if isinstance(target_datetime, datetime) else target_datetime
+        self.cache.invalidate(("day", target_date))
+        self.cache.invalidate(("day_details", target_date))
+        self.cache.invalidate(("month", target_date.year, target_date.month))
+        self.cache.invalidate(("year", target_date.year))
+    
+    def invalidateSeries(self, series_id: int):
+        """Invalide une série : ses occurrences peuvent toucher n'importe quel jour"""
+        self.series_cache.invalidate(series_id)
+        self.cache.clear()
+    
+    def clearCache(self):
+        """Vide le cache (après des écritures faites directement sur la base)"""
+        self.cache.clear()
+        self.series_cache.clear()
+    
+    def getCacheStats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache (hits, misses, evictions, size)"""
+        return self.cache.getStats()
     
     def getAppointmentsByCategory(self, category_id: int) -> List[Appointment]:
         """Récupère tous les rendez-vous d'une catégorie"""
@@ -94,17 +397,99 @@ class AppointmentService:
     def hasConflict(self, start_datetime: datetime, end_datetime: datetime, 
                    exclude_id: Optional[int] = None) -> bool:
         """Vérifie s'il y a un conflit d'horaire avec un autre rendez-vous"""
-        target_date = start_datetime.date()
-        existing_appointments = self.getAppointmentsByDate(target_date)
+        # Recherche par intervalle (R*Tree) : les rendez-vous commencés la
+        # veille et qui débordent sur le créneau sont aussi détectés
+        if self.db_manager.getOverlappingAppointments(
+            start_datetime, end_datetime, exclude_id=exclude_id, limit=1, projection=PROJECTION_SUMMARY
+        ):
+            return True
         
-        for appointment in existing_appointments:
-            # Exclure le rendez-vous en cours de modification
-            if exclude_id and appointment.id == exclude_id:
-                continue
-            
-            # Vérifier les chevauchements
-            if (start_datetime < appointment.end_datetime and 
-                end_datetime > appointment.start_datetime):
+        # Occurrences des séries, développées autour du créneau (une occurrence
+        # commencée plus tôt peut encore déborder dessus)
+        for occurrence in self.iterOccurrences(start_datetime - self._occurrenceLookback(), end_datetime,
+                                               PROJECTION_SUMMARY):
+            if occurrence.id != exclude_id and occurrence.end_datetime > start_datetime:
                 return True
+        return False
+    
+    def getOverlappingAppointments(self, start_datetime: datetime,
+                                   end_datetime: datetime) -> List[Appointment]:
+        """Récupère les rendez-vous qui chevauchent le créneau [début, fin["""
+        return self.db_manager.getOverlappingAppointments(start_datetime, end_datetime)
+    
+    def getConflictingPairs(self, start_date: date, end_date: date) -> List[Tuple[Appointment, Appointment]]:
+        """Récupère les paires de rendez-vous en conflit entre deux dates incluses
+        
+        Occurrences des séries comprises : les paires sont tirées des groupes
+        de chevauchement de findConflicts, triées par début du premier puis du
+        second rendez-vous.
+        """
+        appointments = self._iterOverlapping(*self._dayBounds(start_date, end_date))
+        
+        pairs = []
+        for group in _groupOverlaps(appointments):
+            for index, first in enumerate(group):
+                for second in group[index + 1:]:
+                    # Le groupe est trié par début : les suivants commencent plus tard
+                    if second.start_datetime >= first.end_datetime:
+                        break
+                    pairs.append((first, second))
+        return pairs
+    
+    def findFreeSlots(self, start_date: date, end_date: date,
+                      duration: timedelta = timedelta(hours=1),
+                      working_hours: Tuple[int, int] = WORKING_HOURS,
+                      category_ids: Optional[Iterable[int]] = None,
+                      step: Optional[timedelta] = None) -> Iterator[Tuple[datetime, datetime]]:
+        """Génère les créneaux libres entre deux dates incluses, dans l'ordre
         
-        return False
\ No newline at end of file
+        Les intervalles occupés de toute la plage sont lus en une requête
+        (R*Tree) complétée par les occurrences des séries, puis fusionnés.
+        Si ``category_ids`` est donné, seuls les rendez-vous de ces catégories
+        occupent l'agenda. Les débuts de créneau avancent de ``step``
+        (par défaut la durée demandée).
+        """
+        busy = self._iterOverlapping(*self._dayBounds(start_date, end_date))
+        
+        if category_ids is not None:
+            category_ids = set(category_ids)
+            busy = (a for a in busy if a.category_id in category_ids)
+        
+        merged = mergeIntervals((a.start_datetime, a.end_datetime) for a in busy)
+        return iterFreeSlots(merged, start_date, end_date, duration, working_hours, step or duration)
+    
+    def findConflicts(self, start_date: date, end_date: date,
+                      by_category: bool = False) -> List[List[Appointment]]:
+        """Liste les doubles réservations entre deux dates incluses
+        
+        Les rendez-vous de la plage (une requête, occurrences comprises) sont
+        balayés par ordre de début : chaque groupe réunit des rendez-vous liés
+        par des chevauchements successifs. Avec ``by_category``, seuls les
+        chevauchements au sein d'une même catégorie sont signalés.
+        """
+        appointments = list(self._iterOverlapping(*self._dayBounds(start_date, end_date)))
+        
+        if not by_category:
+            return _groupOverlaps(appointments)
+        
+        by_category_id: Dict[Optional[int], List[Appointment]] = {}
+        for appointment in appointments:
+            by_category_id.setdefault(appointment.category_id, []).append(appointment)
+        
+        groups = [group for category_appointments in by_category_id.values()
+                  for group in _groupOverlaps(category_appointments)]
+        groups.sort(key=lambda group: group[0].start_datetime)
+        return groups
+    
+    def _iterOverlapping(self, start: datetime, end: datetime) -> Iterator[Appointment]:
+        """Génère par ordre de début les rendez-vous et occurrences qui chevauchent [start, end["""
+        # Les modèles de séries sont remplacés par leurs occurrences ; une
+        # occurrence commencée avant la plage peut encore déborder dessus.
+        # Créneaux et rapports de conflits n'affichent pas les descriptions.
+        simple = self.db_manager.getOverlappingAppointments(start, end, projection=PROJECTION_SUMMARY)
+        occurrences = sorted(
+            (o for o in self.iterOccurrences(start - self._occurrenceLookback(), end, PROJECTION_SUMMARY)
+             if o.end_datetime > start),
+            key=lambda a: a.start_datetime
+        )
+        return heapq.merge(simple, occurrences, key=lambda a: a.start_datetime)
@@ -4,6 +4,7 @@ from typing import List, Optional
 from src.database.database_manager import DatabaseManager
 from src.models.category import Category
 from src.models.subcategory import Subcategory
+from src.services.taxonomy_index import TaxonomyIndex
 from src.utils.constants import DEFAULT_CATEGORIES, COLORS
 
 
@@ -12,50 +13,70 @@ class CategoryService:
     
     def __init__(self, db_manager: DatabaseManager):
         self.db_manager = db_manager
+        # Arbre des catégories chargé à la demande, invalidé à chaque insertion
+        self._taxonomy: Optional[TaxonomyIndex] = None
     
     def initializeDefaultCategories(self):
         """Initialise les catégories et sous-catégories par défaut"""
         existing_categories = self.getAllCategories()
         existing_names = [cat.name for cat in existing_categories]
         
-        for category_name, subcategories in DEFAULT_CATEGORIES.items():
-            if category_name not in existing_names:
-                color = COLORS.get(category_name, COLORS["default"])
-                category_id = self.createCategory(category_name, color)
-                
-                # Créer les sous-catégories par défaut
-                for subcategory_name in subcategories:
-                    self.createSubcategory(subcategory_name, category_id, color)
+        # Une seule transaction pour tout l'amorçage
+        with self.db_manager.transaction():
+            for category_name, subcategories in DEFAULT_CATEGORIES.items():
+                if category_name not in existing_names:
+                    color = COLORS.get(category_name, COLORS["default"])
+                    category_id = self.createCategory(category_name, color)
+                    
+                    # Créer les sous-catégories par défaut
+                    for subcategory_name in subcategories:
+                        self.createSubcategory(subcategory_name, category_id, color)
+    
+    def getTaxonomy(self) -> TaxonomyIndex:
+        """Retourne l'index des catégories, chargé en une requête au premier appel"""
+        taxonomy = self._taxonomy
+        if taxonomy is None:
+            taxonomy = self._taxonomy = TaxonomyIndex(self.db_manager.getCategoryTree())
+        return taxonomy
+    
+    def invalidateTaxonomy(self):
+        """Force le rechargement de l'index des catégories"""
+        self._taxonomy = None
     
     def createCategory(self, name: str, color: str) -> int:
         """Crée une nouvelle catégorie"""
         category = Category(name=name, color=color)
-        return self.db_manager.insertCategory(category)
+        category_id = self.db_manager.insertCategory(category)
+        self.invalidateTaxonomy()
+        return category_id
     
     def getAllCategories(self) -> List[Category]:
         """Récupère toutes les catégories"""
-        return self.db_manager.getAllCategories()
+        return self.getTaxonomy().getCategories()
     
     def getCategoryById(self, category_id: int) -> Optional[Category]:
         """Récupère une catégorie par son ID"""
-        return self.db_manager.getCategoryById(category_id)
+        return self.getTaxonomy().getCategoryById(category_id)
+    
+    def getCategoryByName(self, name: str) -> Optional[Category]:
+        """Récupère une catégorie par son nom"""
+        return self.getTaxonomy().getCategoryByName(name)
     
     def createSubcategory(self, name: str, category_id: int, color: str) -> int:
         """Crée une nouvelle sous-catégorie"""
         subcategory = Subcategory(name=name, category_id=category_id, color=color)
-        return self.db_manager.insertSubcategory(subcategory)
+        subcategory_id = self.db_manager.insertSubcategory(subcategory)
+        self.invalidateTaxonomy()
+        return subcategory_id
+    
+    def getSubcategoryById(self, subcategory_id: int) -> Optional[Subcategory]:
+        """Récupère une sous-catégorie par son ID"""
+        return self.getTaxonomy().getSubcategoryById(subcategory_id)
     
     def getSubcategoriesByCategory(self, category_id: int) -> List[Subcategory]:
         """Récupère toutes les sous-catégories d'une catégorie"""
-        return self.db_manager.getSubcategoriesByCategory(category_id)
+        return self.getTaxonomy().getSubcategories(category_id)
     
     def getAllSubcategories(self) -> List[Subcategory]:
         """Récupère toutes les sous-catégories"""
-        categories = self.getAllCategories()
-        all_subcategories = []
-        
-        for category in categories:
-            subcategories = self.getSubcategoriesByCategory(category.id)
-            all_subcategories.extend(subcategories)
-        
-        return all_subcategories
\ No newline at end of file
+        return self.getTaxonomy().getAllSubcategories()
\ No newline at end of file
@@ -0,0 +1,112 @@
+"""Export des rendez-vous en flux (iCalendar et JSON lines)"""
+
+import json
+from datetime import datetime, timezone
+from typing import Iterable, Iterator, Optional, TextIO
+from src.database.database_manager import DatabaseManager
+from src.utils.constants import APP_NAME, APP_VERSION, EXPORT_BUFFER_SIZE
+from src.utils.epoch import fromEpoch
+from src.utils.ics import escapeText, foldLine, formatDateTime
+
+
+PRODID = f"-//{APP_NAME}//{APP_VERSION}//FR"
+
+
+def iterIcsEvents(rows: Iterable[tuple], dtstamp: str) -> Iterator[str]:
+    """Génère le texte d'un VEVENT (lignes repliées) par ligne d'export"""
+    for (appointment_id, title, description, start, end, recurrence_rule,
+         category_name, subcategory_name, exceptions) in rows:
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:{appointment_id}@gestion-calendar",
+            f"DTSTAMP:{dtstamp}",
+            f"DTSTART:{formatDateTime(fromEpoch(start))}",
+            f"DTEND:{formatDateTime(fromEpoch(end))}",
+            f"SUMMARY:{escapeText(title)}",
+        ]
+        if description:
+            lines.append(f"DESCRIPTION:{escapeText(description)}")
+        
+        categories = [name for name in (category_name, subcategory_name) if name]
+        if categories:
+            lines.append("CATEGORIES:" + ",".join(map(escapeText, categories)))
+        
+        if recurrence_rule:
+            lines.append(f"RRULE:{recurrence_rule}")
+            if exceptions:
+                lines.append("EXDATE:" + ",".join(
+                    formatDateTime(fromEpoch(int(value))) for value in exceptions.split(",")
+                ))
+        
+        lines.append("END:VEVENT")
+        yield "".join(map(foldLine, lines))
+
+
+def iterJsonLines(rows: Iterable[tuple]) -> Iterator[str]:
+    """Génère un objet JSON par ligne d'export (terminé par un saut de ligne)"""
+    for (appointment_id, title, description, start, end, recurrence_rule,
+         category_name, subcategory_name, exceptions) in rows:
+        record = {
+            "id": appointment_id,
+            "title": title,
+            "description": description,
+            "start": fromEpoch(start).isoformat(),
+            "end": fromEpoch(end).isoformat(),
+            "category": category_name,
+            "subcategory": subcategory_name,
+            "recurrence_rule": recurrence_rule,
+            "exceptions": [fromEpoch(int(value)).isoformat() for value in exceptions.split(",")]
+            if exceptions else [],
+        }
+        yield json.dumps(record, ensure_ascii=False) + "\n"
+
+
+class ExportService:
+    """Service d'export des rendez-vous vers un fichier
+    
+    Les lignes sont lues d'un curseur (DatabaseManager.iterExportRows),
+    converties une à une par un générateur et écrites dans un fichier
+    tamponné : aucune liste de rendez-vous n'est construite et la mémoire
+    utilisée ne dépend pas de la taille de la base. Les séries récurrentes
+    sont exportées telles qu'enregistrées (règle et exceptions), sans
+    développer leurs occurrences.
+    """
+    
+    def __init__(self, db_manager: DatabaseManager, buffer_size: int = EXPORT_BUFFER_SIZE):
+        self.db_manager = db_manager
+        self.buffer_size = buffer_size
+    
+    def exportIcs(self, path: str, start=None, end=None) -> int:
+        """Exporte dans un fichier .ics les rendez-vous de [start, end[ ; retourne leur nombre"""
+        # newline="" : les fins de ligne CRLF exigées par iCalendar sont écrites telles quelles
+        with open(path, "w", encoding="utf-8", newline="", buffering=self.buffer_size) as stream:
+            return self.writeIcs(stream, start, end)
+    
+    def exportJsonl(self, path: str, start=None, end=None) -> int:
+        """Exporte en JSON lines les rendez-vous de [start, end[ ; retourne leur nombre"""
+        with open(path, "w", encoding="utf-8", newline="", buffering=self.buffer_size) as stream:
+            return self.writeJsonl(stream, start, end)
+    
+    def writeIcs(self, stream: TextIO, start=None, end=None,
+                 dtstamp: Optional[datetime] = None) -> int:
+        """Écrit un VCALENDAR complet dans un flux texte"""
+        dtstamp = dtstamp or datetime.now(timezone.utc)
+        stamp = formatDateTime(dtstamp.astimezone(timezone.utc)) + "Z"
+        
+        stream.write(foldLine("BEGIN:VCALENDAR") + foldLine("VERSION:2.0")
+                     + foldLine(f"PRODID:{PRODID}") + foldLine("CALSCALE:GREGORIAN"))
+        count = self._writeAll(stream, iterIcsEvents(self.db_manager.iterExportRows(start, end), stamp))
+        stream.write(foldLine("END:VCALENDAR"))
+        return count
+    
+    def writeJsonl(self, stream: TextIO, start=None, end=None) -> int:
+        """Écrit un rendez-vous par ligne JSON dans un flux texte"""
+        return self._writeAll(stream, iterJsonLines(self.db_manager.iterExportRows(start, end)))
+    
+    def _writeAll(self, stream: TextIO, chunks: Iterable[str]) -> int:
+        """Écrit les morceaux au fil de l'eau et retourne leur nombre"""
+        count = 0
+        for chunk in chunks:
+            stream.write(chunk)
+            count += 1
+        return count
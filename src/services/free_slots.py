@@ -0,0 +1,64 @@
+"""Recherche de créneaux libres par fusion d'intervalles occupés"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator, List, Tuple
+
+
+Interval = Tuple[datetime, datetime]
+
+
+def mergeIntervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Fusionne des intervalles triés par début en intervalles disjoints"""
+    merged = []
+    for start, end in intervals:
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def iterFreeSlots(busy: List[Interval], start_date: date, end_date: date,
+                  duration: timedelta, working_hours: Tuple[int, int],
+                  step: timedelta) -> Iterator[Interval]:
+    """Génère les créneaux libres de ``duration`` pendant les heures ouvrées
+    
+    ``busy`` doit être fusionné (disjoint et trié) : les jours et les
+    intervalles occupés sont alors parcourus en un seul balayage. Les débuts
+    de créneau sont alignés sur ``step`` depuis le début des heures ouvrées.
+    """
+    first_hour, last_hour = working_hours
+    index = 0
+    day = start_date
+    
+    while day <= end_date:
+        midnight = datetime.combine(day, time.min)
+        window_start = midnight + timedelta(hours=first_hour)
+        window_end = midnight + timedelta(hours=last_hour)
+        
+        # Les intervalles terminés avant la journée ne servent plus
+        while index < len(busy) and busy[index][1] <= window_start:
+            index += 1
+        
+        cursor = window_start
+        position = index
+        while cursor < window_end:
+            if position < len(busy) and busy[position][0] < window_end:
+                gap_end = max(busy[position][0], cursor)
+            else:
+                gap_end = window_end
+            
+            # Créneaux alignés sur la grille contenus dans le trou [cursor, gap_end[
+            offset = (cursor - window_start) % step
+            slot_start = cursor if not offset else cursor + (step - offset)
+            while slot_start + duration <= gap_end:
+                yield slot_start, slot_start + duration
+                slot_start += step
+            
+            if gap_end >= window_end:
+                break
+            cursor = max(cursor, busy[position][1])
+            position += 1
+        
+        day += timedelta(days=1)
@@ -0,0 +1,190 @@
+"""Import de fichiers iCalendar (.ics) en flux"""
+
+import os
+from datetime import datetime, timedelta
+from typing import BinaryIO, Callable, Dict, List, Optional, Tuple
+from src.models.appointment import Appointment
+from src.services.appointment_service import AppointmentService
+from src.services.category_service import CategoryService
+from src.services.recurrence import validateRule
+from src.services.taxonomy_index import TaxonomyIndex
+from src.utils.constants import ICS_IMPORT_BATCH_SIZE
+from src.utils.ics import iterEvents, localizeRule, parseDateTime, parseDuration, splitList, unescapeText
+
+
+# progress_callback(rendez-vous importés, octets lus, taille totale ou None)
+ProgressCallback = Callable[[int, int, Optional[int]], None]
+
+
+class IcsImportService:
+    """Service d'import des VEVENT d'un fichier .ics
+    
+    Le fichier est lu événement par événement (un seul VEVENT en mémoire) et
+    les rendez-vous sont insérés par lots dans une unique transaction : un
+    échec annule tout l'import. Les index dérivés sont alimentés en une fois à
+    la fin (voir DatabaseManager.deferredIndexes).
+    """
+    
+    def __init__(self, appointment_service: AppointmentService, category_service: CategoryService,
+                 batch_size: int = ICS_IMPORT_BATCH_SIZE):
+        self.appointment_service = appointment_service
+        self.category_service = category_service
+        self.db_manager = appointment_service.db_manager
+        self.batch_size = batch_size
+        # Valeurs CATEGORIES déjà rencontrées -> (catégorie, sous-catégorie)
+        self._category_cache: Dict[Tuple[str, ...], Tuple[int, Optional[int]]] = {}
+    
+    def importFile(self, path: str, default_category_id: Optional[int] = None,
+                   progress_callback: Optional[ProgressCallback] = None) -> Dict[str, int]:
+        """Importe un fichier .ics ; voir importStream"""
+        with open(path, "rb") as stream:
+            return self.importStream(stream, default_category_id, progress_callback, os.path.getsize(path))
+    
+    def importStream(self, stream: BinaryIO, default_category_id: Optional[int] = None,
+                     progress_callback: Optional[ProgressCallback] = None,
+                     total_bytes: Optional[int] = None) -> Dict[str, int]:
+        """Importe les événements d'un flux binaire et retourne les compteurs
+        
+        Les événements sans catégorie connue sont rangés dans
+        ``default_category_id`` (par défaut la première catégorie). Les
+        événements illisibles (sans DTSTART par exemple) sont ignorés. Un
+        événement dont la règle RRULE n'est pas reconnue est importé seul et
+        compté dans ``rules_dropped``.
+        """
+        taxonomy = self.category_service.getTaxonomy()
+        if default_category_id is None:
+            categories = taxonomy.getCategories()
+            if not categories:
+                raise ValueError("Aucune catégorie disponible pour l'import")
+            default_category_id = categories[0].id
+        self._category_cache.clear()
+        
+        imported = skipped = rules_dropped = 0
+        batch: List[Appointment] = []
+        series_ids: Dict[str, int] = {}
+        # Occurrences remplacées (RECURRENCE-ID) : retirées de leur série à la fin
+        overrides: List[Tuple[str, datetime]] = []
+        position = 0
+        
+        # Les index (R*Tree, plein texte, synthèse) sont construits en fin d'import
+        with self.db_manager.deferredIndexes():
+            for event, position in iterEvents(stream):
+                try:
+                    appointment, exceptions = self._buildAppointment(event, taxonomy, default_category_id)
+                    # Début de l'occurrence remplacée : une date illisible ignore l'événement
+                    replaced_start = (parseDateTime(*event["RECURRENCE-ID"][0])[0]
+                                      if "RECURRENCE-ID" in event else None)
+                except ValueError:
+                    skipped += 1
+                    continue
+                
+                if "RRULE" in event and not appointment.recurrence_rule:
+                    rules_dropped += 1
+                
+                uid = event["UID"][0][1] if "UID" in event else None
+                if replaced_start and uid:
+                    overrides.append((uid, replaced_start))
+                
+                if appointment.recurrence_rule:
+                    # L'ID de la série est nécessaire pour ses exceptions
+                    series_id = self.db_manager.insertAppointment(appointment)
+                    for exception in exceptions:
+                        self.db_manager.addSeriesException(series_id, exception)
+                    if uid:
+                        series_ids[uid] = series_id
+                    imported += 1
+                    continue
+                
+                batch.append(appointment)
+                if len(batch) >= self.batch_size:
+                    imported += self.db_manager.insertAppointments(batch)
+                    batch.clear()
+                    if progress_callback:
+                        progress_callback(imported, position, total_bytes)
+            
+            if batch:
+                imported += self.db_manager.insertAppointments(batch)
+            
+            for uid, occurrence_start in overrides:
+                if uid in series_ids:
+                    self.db_manager.addSeriesException(series_ids[uid], occurrence_start)
+        
+        if progress_callback:
+            progress_callback(imported, total_bytes or position, total_bytes)
+        
+        # Les écritures ont contourné le service : ses caches sont périmés
+        self.appointment_service.clearCache()
+        return {"imported": imported, "skipped": skipped, "rules_dropped": rules_dropped}
+    
+    def _buildAppointment(self, event: dict, taxonomy: TaxonomyIndex,
+                          default_category_id: int) -> Tuple[Appointment, List[datetime]]:
+        """Construit le rendez-vous d'un VEVENT et la liste de ses exceptions (EXDATE)"""
+        if "DTSTART" not in event:
+            raise ValueError("Événement sans DTSTART")
+        start, all_day = parseDateTime(*event["DTSTART"][0])
+        
+        if "DTEND" in event:
+            end = parseDateTime(*event["DTEND"][0])[0]
+        elif "DURATION" in event:
+            end = start + (parseDuration(event["DURATION"][0][1]) or timedelta())
+        else:
+            end = start + timedelta(days=1) if all_day else start
+        
+        categories = []
+        for _, value in event.get("CATEGORIES", ()):
+            categories.extend(splitList(value))
+        category_id, subcategory_id = self._resolveCategory(tuple(categories), taxonomy, default_category_id)
+        
+        recurrence_rule = localizeRule(event["RRULE"][0][1]) if "RRULE" in event else None
+        if recurrence_rule:
+            try:
+                validateRule(recurrence_rule, start)
+            except ValueError:
+                # Règle non reconnue : seule la première occurrence est importée
+                recurrence_rule = None
+        
+        exceptions = []
+        for params, value in event.get("EXDATE", ()):
+            exceptions.extend(parseDateTime(params, item)[0] for item in value.split(","))
+        
+        appointment = Appointment(
+            title=unescapeText(event["SUMMARY"][0][1]) if "SUMMARY" in event else "(Sans titre)",
+            description=unescapeText(event["DESCRIPTION"][0][1]) if "DESCRIPTION" in event else "",
+            start_datetime=start,
+            end_datetime=end,
+            category_id=category_id,
+            subcategory_id=subcategory_id,
+            recurrence_rule=recurrence_rule
+        )
+        return appointment, exceptions
+    
+    def _resolveCategory(self, names: Tuple[str, ...], taxonomy: TaxonomyIndex,
+                         default_category_id: int) -> Tuple[int, Optional[int]]:
+        """Associe les valeurs CATEGORIES à une catégorie et une sous-catégorie existantes
+        
+        La première valeur portant le nom d'une catégorie la désigne ; une
+        autre valeur peut alors désigner l'une de ses sous-catégories. Un nom
+        de sous-catégorie seul désigne aussi sa catégorie parente.
+        """
+        resolved = self._category_cache.get(names)
+        if resolved is not None:
+            return resolved
+        
+        category = next((c for c in map(taxonomy.getCategoryByName, names) if c), None)
+        subcategory = None
+        if category:
+            subcategory = next(
+                (s for s in (taxonomy.getSubcategoryByName(category.id, name) for name in names) if s), None
+            )
+        else:
+            subcategory = next(
+                (s for s in taxonomy.getAllSubcategories() if s.name in names), None
+            )
+        
+        if subcategory:
+            resolved = (subcategory.category_id, subcategory.id)
+        else:
+            resolved = (category.id if category else default_category_id, None)
+        
+        self._category_cache[names] = resolved
+        return resolved
@@ -0,0 +1,41 @@
+"""Expansion des séries de rendez-vous récurrents (règles RRULE)"""
+
+from datetime import datetime
+from typing import Iterable, Iterator
+from dateutil.rrule import rruleset, rrulestr
+from src.models.appointment import Appointment
+
+
+def buildRuleSet(rule: str, dtstart: datetime, exceptions: Iterable[datetime] = ()) -> rruleset:
+    """Construit l'ensemble des occurrences d'une règle RRULE
+    
+    L'ensemble garde en cache les occurrences déjà calculées : les parcours
+    suivants d'une même fenêtre ne recalculent pas la règle.
+    """
+    try:
+        rule_set = rrulestr(rule, dtstart=dtstart, cache=True, forceset=True)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Règle de récurrence invalide '{rule}': {e}")
+    
+    for exception in exceptions:
+        rule_set.exdate(exception)
+    return rule_set
+
+
+def validateRule(rule: str, dtstart: datetime):
+    """Lève ValueError si la règle ne peut pas être interprétée"""
+    rule_set = buildRuleSet(rule, dtstart)
+    try:
+        rule_set.after(dtstart, inc=True)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Règle de récurrence invalide '{rule}': {e}")
+
+
+def expandSeries(series: Appointment, rule_set: rruleset, start: datetime,
+                 end: datetime) -> Iterator[Appointment]:
+    """Génère les occurrences d'une série qui commencent dans [start, end["""
+    for occurrence_start in rule_set.xafter(start, inc=True):
+        if occurrence_start >= end:
+            break
+        yield series.createOccurrence(occurrence_start)
+
@@ -0,0 +1,63 @@
+"""Index en mémoire des catégories et sous-catégories"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+from src.models.category import Category
+from src.models.subcategory import Subcategory
+
+
+class TaxonomyIndex:
+    """Arbre des catégories indexé par ID, par nom et par catégorie parente
+    
+    Construit en un passage à partir des lignes de
+    ``DatabaseManager.getCategoryTree`` (une ligne par couple catégorie /
+    sous-catégorie, sous-catégorie absente pour une catégorie vide).
+    """
+    
+    def __init__(self, tree: Iterable[Tuple[Category, Optional[Subcategory]]] = ()):
+        self._categories: List[Category] = []
+        self._categories_by_id: Dict[int, Category] = {}
+        self._categories_by_name: Dict[str, Category] = {}
+        self._subcategories_by_id: Dict[int, Subcategory] = {}
+        self._children: Dict[int, List[Subcategory]] = {}
+        
+        for category, subcategory in tree:
+            if category.id not in self._categories_by_id:
+                self._categories.append(category)
+                self._categories_by_id[category.id] = category
+                self._categories_by_name[category.name] = category
+                self._children[category.id] = []
+            
+            if subcategory is not None:
+                self._subcategories_by_id[subcategory.id] = subcategory
+                self._children[category.id].append(subcategory)
+    
+    def getCategories(self) -> List[Category]:
+        """Retourne toutes les catégories, dans l'ordre de l'arbre"""
+        return list(self._categories)
+    
+    def getCategoryById(self, category_id: int) -> Optional[Category]:
+        """Retourne une catégorie par son ID"""
+        return self._categories_by_id.get(category_id)
+    
+    def getCategoryByName(self, name: str) -> Optional[Category]:
+        """Retourne une catégorie par son nom"""
+        return self._categories_by_name.get(name)
+    
+    def getSubcategoryById(self, subcategory_id: int) -> Optional[Subcategory]:
+        """Retourne une sous-catégorie par son ID"""
+        return self._subcategories_by_id.get(subcategory_id)
+    
+    def getSubcategoryByName(self, category_id: int, name: str) -> Optional[Subcategory]:
+        """Retourne la sous-catégorie d'une catégorie portant ce nom"""
+        return next((sub for sub in self._children.get(category_id, []) if sub.name == name), None)
+    
+    def getSubcategories(self, category_id: int) -> List[Subcategory]:
+        """Retourne les sous-catégories d'une catégorie"""
+        return list(self._children.get(category_id, []))
+    
+    def getAllSubcategories(self) -> List[Subcategory]:
+        """Retourne toutes les sous-catégories, groupées par catégorie"""
+        return [sub for category in self._categories for sub in self._children[category.id]]
+    
+    def __len__(self) -> int:
+        return len(self._categories)
@@ -1,18 +1,23 @@
 """Tests pour le gestionnaire de base de données"""
 
+import gc
 import pytest
 import sqlite3
 import tempfile
 import os
-from datetime import datetime
-from src.database.database_manager import DatabaseManager
+from datetime import date, datetime, timedelta
+from unittest.mock import patch
+from src.database.database_manager import PROJECTION_SUMMARY, DatabaseManager
 from src.models.category import Category
 from src.models.subcategory import Subcategory
 from src.models.appointment import Appointment
+from src.database.migrations import MigrationManager, MIGRATIONS
+from src.database.pagination import cursorToken
+from src.utils.epoch import toEpoch
 
 
 class TestDatabaseManager:
-    
+
     @pytest.fixture
     def temp_db(self):
         """Crée une base de données temporaire pour les tests"""
@@ -20,7 +25,10 @@ class TestDatabaseManager:
         os.close(temp_fd)
         db_manager = DatabaseManager(temp_path)
         yield db_manager
-        os.unlink(temp_path)
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
     
     def test_initializeDatabase_shouldCreateTables(self, temp_db):
         """Test de l'initialisation de la base de données"""
@@ -142,4 +150,588 @@ class TestDatabaseManager:
         appointments = temp_db.getAppointmentsByDate(datetime(2024, 1, 15).date())
         
         assert len(appointments) == 1
-        assert appointments[0].title == "RDV 1"
\ No newline at end of file
+        assert appointments[0].title == "RDV 1"
+    
+    def test_getAppointmentsByDate_withLastSecondOfDay_shouldIncludeAppointment(self, temp_db):
+        """Test d'un rendez-vous commençant pendant la dernière seconde du jour"""
+        temp_db.initializeDatabase()
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        
+        temp_db.insertAppointment(Appointment(
+            title="Minuit moins le quart de seconde",
+            start_datetime=datetime(2024, 1, 15, 23, 59, 59, 500000),
+            end_datetime=datetime(2024, 1, 16, 0, 30),
+            category_id=category_id
+        ))
+        
+        assert len(temp_db.getAppointmentsByDate(datetime(2024, 1, 15).date())) == 1
+        assert temp_db.getAppointmentsByDate(datetime(2024, 1, 16).date()) == []
+        
+        stored = temp_db.connection.execute("SELECT start_datetime FROM appointments").fetchone()[0]
+        assert stored == toEpoch(datetime(2024, 1, 15, 23, 59, 59))
+    
+    def test_getAppointmentsInRange_shouldReturnSortedAppointmentsInWindow(self, temp_db):
+        """Test de récupération des rendez-vous sur une plage en une requête"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        
+        # Insérés dans le désordre pour vérifier le tri
+        for title, start in [
+            ("RDV 3", datetime(2024, 1, 20, 9, 0)),
+            ("RDV 1", datetime(2024, 1, 15, 10, 0)),
+            ("RDV hors plage", datetime(2024, 1, 21, 0, 0)),
+            ("RDV 2", datetime(2024, 1, 15, 8, 0)),
+        ]:
+            temp_db.insertAppointment(Appointment(
+                title=title,
+                start_datetime=start,
+                end_datetime=start.replace(hour=start.hour + 1),
+                category_id=category_id
+            ))
+        
+        # La borne de fin est exclue
+        appointments = temp_db.getAppointmentsInRange(
+            datetime(2024, 1, 15).date(), datetime(2024, 1, 21).date()
+        )
+        
+        assert [apt.title for apt in appointments] == ["RDV 2", "RDV 1", "RDV 3"]
+    
+    
+    def test_getAppointmentCountsByDay_shouldGroupByDay(self, temp_db):
+        """Test du comptage des rendez-vous par jour d'un mois"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        for start in [
+            datetime(2024, 1, 15, 10, 0),
+            datetime(2024, 1, 15, 14, 0),
+            datetime(2024, 1, 31, 23, 30),
+            datetime(2024, 2, 1, 9, 0),  # Mois suivant
+        ]:
+            temp_db.insertAppointment(Appointment(
+                title="RDV",
+                start_datetime=start,
+                end_datetime=start,
+                category_id=category_id
+            ))
+        
+        counts = temp_db.getAppointmentCountsByDay(2024, 1)
+        
+        assert counts == {
+            datetime(2024, 1, 15).date(): 2,
+            datetime(2024, 1, 31).date(): 1,
+        }
+    
+    def test_dailySummary_shouldFollowWritesThroughTriggers(self, temp_db):
+        """Test de la synthèse quotidienne tenue à jour par triggers"""
+        temp_db.initializeDatabase()
+        
+        perso_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        pro_id = temp_db.insertCategory(Category(name="Pro", color="#10B981"))
+        
+        def add(start, minutes, category_id, rule=None):
+            return temp_db.insertAppointment(Appointment(
+                title="RDV", start_datetime=start, end_datetime=start + timedelta(minutes=minutes),
+                category_id=category_id, recurrence_rule=rule
+            ))
+        
+        first_id = add(datetime(2024, 1, 15, 9, 0), 60, perso_id)
+        add(datetime(2024, 1, 15, 14, 0), 30, perso_id)
+        add(datetime(2024, 1, 15, 16, 0), 45, pro_id)
+        add(datetime(2024, 1, 16, 8, 0), 60, perso_id, rule="FREQ=DAILY")  # Série : ignorée
+        
+        january = (datetime(2024, 1, 1), datetime(2024, 2, 1))
+        assert temp_db.getDailySummary(*january) == [
+            (date(2024, 1, 15), perso_id, 2, 5400),
+            (date(2024, 1, 15), pro_id, 1, 2700),
+        ]
+        
+        # Déplacement vers un autre jour et une autre catégorie
+        moved = temp_db.getAppointmentById(first_id)
+        moved.start_datetime = datetime(2024, 1, 20, 9, 0)
+        moved.end_datetime = datetime(2024, 1, 20, 11, 0)
+        moved.category_id = pro_id
+        temp_db.updateAppointment(moved)
+        
+        assert temp_db.getCategoryTotals(*january) == {perso_id: (1, 1800), pro_id: (2, 9900)}
+        
+        temp_db.deleteAppointment(first_id)
+        expected = [(date(2024, 1, 15), perso_id, 1, 1800), (date(2024, 1, 15), pro_id, 1, 2700)]
+        assert temp_db.getDailySummary(*january) == expected
+        assert temp_db.getAppointmentCountsByDay(2024, 1) == {date(2024, 1, 15): 2}
+        
+        # La reconstruction donne le même résultat que les triggers
+        assert temp_db.rebuildDailySummary() == 2
+        assert temp_db.getDailySummary(*january) == expected
+    
+    def test_dailySummary_withPre1970Appointment_shouldUseItsOwnDay(self, temp_db):
+        """Test du jour d'un rendez-vous antérieur à 1970 (horaire négatif)"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        appointment_id = temp_db.insertAppointment(Appointment(
+            title="Archive", start_datetime=datetime(1969, 7, 20, 20, 0),
+            end_datetime=datetime(1969, 7, 20, 21, 0), category_id=category_id
+        ))
+        
+        july = (datetime(1969, 7, 1), datetime(1969, 8, 1))
+        assert temp_db.getDailySummary(*july) == [(date(1969, 7, 20), category_id, 1, 3600)]
+        assert temp_db.getDailyTotals(*july) == {date(1969, 7, 20): (1, 3600)}
+        
+        # Les triggers de mise à jour et de suppression retrouvent le même jour
+        moved = temp_db.getAppointmentById(appointment_id)
+        moved.end_datetime = datetime(1969, 7, 20, 22, 0)
+        temp_db.updateAppointment(moved)
+        assert temp_db.getDailySummary(*july) == [(date(1969, 7, 20), category_id, 1, 7200)]
+        assert temp_db.rebuildDailySummary() == 1
+        assert temp_db.getDailySummary(*july) == [(date(1969, 7, 20), category_id, 1, 7200)]
+        
+        temp_db.deleteAppointment(appointment_id)
+        assert temp_db.getDailySummary(*july) == []
+    
+    def test_iterExportRows_shouldStreamSeriesThenRangeRows(self, temp_db):
+        """Test de la lecture en flux des lignes d'export"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        
+        def add(start, rule=None):
+            return temp_db.insertAppointment(Appointment(
+                title="RDV", start_datetime=start, end_datetime=start + timedelta(hours=1),
+                category_id=category_id, recurrence_rule=rule
+            ))
+        
+        add(datetime(2024, 2, 1, 9, 0))  # Hors période
+        late_id = add(datetime(2024, 1, 20, 9, 0))
+        early_id = add(datetime(2024, 1, 10, 9, 0))
+        series_id = add(datetime(2023, 6, 1, 8, 0), rule="FREQ=WEEKLY")
+        temp_db.addSeriesException(series_id, datetime(2023, 6, 8, 8, 0))
+        
+        rows = temp_db.iterExportRows(date(2024, 1, 1), date(2024, 2, 1))
+        
+        assert not isinstance(rows, list)
+        rows = list(rows)
+        assert [row[0] for row in rows] == [series_id, early_id, late_id]
+        assert rows[0][5:] == ("FREQ=WEEKLY", "Perso", None, str(toEpoch(datetime(2023, 6, 8, 8, 0))))
+        assert rows[1][8] is None
+        assert len(list(temp_db.iterExportRows())) == 4
+    
+    def test_iterAppointments_shouldPageByStartAndIdAndResume(self, temp_db):
+        """Test du parcours paginé par clé et de sa reprise par jeton"""
+        temp_db.initializeDatabase()
+        
+        perso_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        pro_id = temp_db.insertCategory(Category(name="Pro", color="#10B981"))
+        # Trois rendez-vous par heure : les débuts identiques sont départagés par l'id
+        temp_db.insertAppointments(
+            Appointment(
+                title=f"RDV {index}",
+                start_datetime=datetime(2024, 1, 15, 17 - index // 3, 0),
+                end_datetime=datetime(2024, 1, 15, 18 - index // 3, 0),
+                category_id=perso_id if index % 2 else pro_id
+            )
+            for index in range(10)
+        )
+        
+        statements = []
+        temp_db.connection.set_trace_callback(statements.append)
+        appointments = list(temp_db.iterAppointments(batch_size=4))
+        temp_db.connection.set_trace_callback(None)
+        
+        keys = [(a.start_datetime, a.id) for a in appointments]
+        assert keys == sorted(keys) and len(keys) == 10
+        assert len(statements) == 3  # Pages de 4, 4 puis 2
+        
+        # Reprise après le cinquième rendez-vous, lots d'une autre taille
+        token = cursorToken(appointments[4])
+        assert list(temp_db.iterAppointments(batch_size=3, cursor_token=token)) == appointments[5:]
+        
+        # Filtres de période et de catégorie
+        ranged = temp_db.iterAppointments(datetime(2024, 1, 15, 15, 0), datetime(2024, 1, 15, 17, 0),
+                                          category_ids=[perso_id], batch_size=2)
+        assert [a.title for a in ranged] == ["RDV 7", "RDV 3", "RDV 5"]
+        
+        with pytest.raises(ValueError):
+            list(temp_db.iterAppointments(cursor_token="pas-un-jeton"))
+    
+    def test_summaryProjection_shouldDeferDescriptions(self, temp_db):
+        """Test de la projection sans description et de son chargement différé"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        notes = "Compte rendu détaillé. " * 500
+        appointment_id = temp_db.insertAppointment(Appointment(
+            title="Bilan", description=notes,
+            start_datetime=datetime(2024, 1, 15, 9, 0), end_datetime=datetime(2024, 1, 15, 10, 0),
+            category_id=category_id
+        ))
+        temp_db.identity_map.clear()
+        
+        statements = []
+        temp_db.connection.set_trace_callback(statements.append)
+        appointment, = temp_db.getAppointmentsInRange(
+            date(2024, 1, 15), date(2024, 1, 16), projection=PROJECTION_SUMMARY
+        )
+        
+        assert "description" not in statements[0]
+        assert not appointment.isDescriptionLoaded()
+        assert appointment.title == "Bilan"
+        assert appointment.description == notes
+        assert len(statements) == 2
+        temp_db.connection.set_trace_callback(None)
+        
+        # Une lecture summary ne diffère pas à nouveau une description chargée
+        shared, = temp_db.getAppointmentsInRange(date(2024, 1, 15), date(2024, 1, 16), PROJECTION_SUMMARY)
+        assert shared is appointment
+        assert appointment.isDescriptionLoaded()
+        assert appointment.description == notes
+        
+        # Une mise à jour après une lecture partielle ne perd pas la description
+        del appointment, shared
+        appointment, = temp_db.getAppointmentsInRange(date(2024, 1, 15), date(2024, 1, 16), PROJECTION_SUMMARY)
+        assert not appointment.isDescriptionLoaded()
+        appointment.title = "Bilan annuel"
+        temp_db.updateAppointment(appointment)
+        assert temp_db.getAppointmentDescription(appointment_id) == notes
+        
+        with pytest.raises(ValueError):
+            temp_db.getAppointmentsByDate(date(2024, 1, 15), projection="titres")
+    
+    def test_summaryProjection_shouldKeepLoadedDescriptionOfSharedInstance(self, temp_db):
+        """Test d'une instance complète partagée relue en projection summary"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        temp_db.insertAppointment(Appointment(
+            title="Bilan", description="Notes",
+            start_datetime=datetime(2024, 1, 15, 9, 0), end_datetime=datetime(2024, 1, 15, 10, 0),
+            category_id=category_id
+        ))
+        temp_db.identity_map.clear()
+        
+        full, = temp_db.getAppointmentsByDate(date(2024, 1, 15))
+        assert full.isDescriptionLoaded()
+        
+        statements = []
+        temp_db.connection.set_trace_callback(statements.append)
+        summary, = temp_db.getOverlappingAppointments(
+            datetime(2024, 1, 15, 9, 30), datetime(2024, 1, 15, 9, 45), projection=PROJECTION_SUMMARY
+        )
+        assert summary is full
+        assert full.isDescriptionLoaded()
+        assert full.description == "Notes"
+        # Aucune lecture différée de la description
+        assert not any("description" in statement for statement in statements)
+        temp_db.connection.set_trace_callback(None)
+    
+    def test_insertAppointments_shouldInsertBatch(self, temp_db):
+        """Test d'insertion d'un lot de rendez-vous"""
+        temp_db.initializeDatabase()
+        
+        category_id = temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+        appointments = (
+            Appointment(
+                title=f"RDV {hour}",
+                start_datetime=datetime(2024, 1, 15, hour, 0),
+                end_datetime=datetime(2024, 1, 15, hour, 30),
+                category_id=category_id
+            )
+            for hour in range(8, 18)
+        )
+        
+        inserted = temp_db.insertAppointments(appointments)
+        
+        assert inserted == 10
+        stored = temp_db.getAppointmentsByDate(datetime(2024, 1, 15).date())
+        assert len(stored) == 10
+        
+        # Mise à jour groupée
+        for appointment in stored:
+            appointment.title = f"{appointment.title} (modifié)"
+        assert temp_db.updateAppointments(stored) == 10
+        assert temp_db.getAppointmentsByDate(datetime(2024, 1, 15).date())[0].title == "RDV 8 (modifié)"
+    
+    def test_transaction_shouldDeferCommitUntilBlockExit(self, temp_db):
+        """Test du report des commits dans un bloc transaction()"""
+        temp_db.initializeDatabase()
+        
+        observer = sqlite3.connect(temp_db.db_path)
+        
+        with temp_db.transaction():
+            temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+            temp_db.insertCategory(Category(name="Pro", color="#EF4444"))
+            
+            # Rien n'est encore visible depuis une autre connexion
+            assert observer.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 0
+        
+        assert observer.execute("SELECT COUNT(*) FROM categories").fetchone()[0] == 2
+        observer.close()
+    
+    def test_transaction_shouldRollbackOnError(self, temp_db):
+        """Test de l'annulation des écritures en cas d'erreur"""
+        temp_db.initializeDatabase()
+        
+        with pytest.raises(ValueError):
+            with temp_db.transaction():
+                temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+                raise ValueError("interruption")
+        
+        assert temp_db.getAllCategories() == []
+    
+    def test_transaction_withCaughtInnerError_shouldRollbackInnerBlockOnly(self, temp_db):
+        """Test d'un bloc imbriqué en échec dont l'exception est rattrapée"""
+        temp_db.initializeDatabase()
+        
+        with temp_db.transaction():
+            # Bloc imbriqué avant toute écriture du bloc externe
+            try:
+                with temp_db.transaction():
+                    temp_db.insertCategory(Category(name="Annulée", color="#000000"))
+                    raise ValueError("interruption")
+            except ValueError:
+                pass
+            
+            temp_db.insertCategory(Category(name="Perso", color="#3B82F6"))
+            try:
+                with temp_db.transaction():
+                    temp_db.insertCategory(Category(name="Partielle", color="#000000"))
+                    raise ValueError("interruption")
+            except ValueError:
+                pass
+            
+            with temp_db.transaction():
+                temp_db.insertCategory(Category(name="Pro", color="#EF4444"))
+        
+        assert [category.name for category in temp_db.getAllCategories()] == ["Perso", "Pro"]
+    
+    def test_performanceProfile_shouldApplyPragmas(self, temp_db):
+        """Test de l'application du profil de performance par défaut"""
+        connection = temp_db.connection
+        
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert connection.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert connection.execute("PRAGMA temp_store").fetchone()[0] == 2   # MEMORY
+        assert connection.execute("PRAGMA busy_timeout").fetchone()[0] == 5000
+    
+    def test_performanceProfile_withUnknownName_shouldRaise(self, temp_db):
+        """Test du refus d'un profil de performance inconnu"""
+        # Le profil est vérifié avant l'ouverture : aucune connexion laissée ouverte
+        with patch("sqlite3.connect") as connect, pytest.raises(ValueError):
+            DatabaseManager(temp_db.db_path, profile="turbo")
+        connect.assert_not_called()
+
+
+class TestIdentityMap:
+
+    @pytest.fixture
+    def db_manager(self):
+        """Crée une base temporaire avec trois rendez-vous"""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(temp_fd)
+        db_manager = DatabaseManager(temp_path)
+        db_manager.initializeDatabase()
+        category_id = db_manager.insertCategory(Category(name="Perso", color="#3B82F6"))
+        db_manager.insertAppointments(
+            Appointment(
+                title=f"RDV {hour}",
+                start_datetime=datetime(2024, 1, 15, hour, 0),
+                end_datetime=datetime(2024, 1, 15, hour, 30),
+                category_id=category_id
+            )
+            for hour in (9, 10, 11)
+        )
+        yield db_manager
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+    
+    def test_reads_shouldShareOneInstancePerRow(self, db_manager):
+        """Test de l'unicité des instances entre plusieurs lectures"""
+        by_date = db_manager.getAppointmentsByDate(datetime(2024, 1, 15).date())
+        by_range = db_manager.getAppointmentsInRange(datetime(2024, 1, 15, 10), datetime(2024, 1, 16))
+        
+        assert by_range[0] is by_date[1]
+        assert db_manager.getAppointmentById(by_date[0].id) is by_date[0]
+    
+    def test_getAppointmentsByIds_shouldKeepRequestedOrderInOneQuery(self, db_manager):
+        """Test de la lecture groupée par IDs"""
+        statements = []
+        db_manager.connection.set_trace_callback(statements.append)
+        appointments = db_manager.getAppointmentsByIds([3, 999, 1])
+        db_manager.connection.set_trace_callback(None)
+        
+        assert [a.title for a in appointments] == ["RDV 11", "RDV 9"]
+        assert len(statements) == 1
+        assert db_manager.getAppointmentsByIds([1]) == [appointments[1]]
+    
+    def test_updateAppointment_shouldPublishNewInstance(self, db_manager):
+        """Test d'une mise à jour : l'instance déjà remise reste un instantané inchangé"""
+        loaded = db_manager.getAppointmentById(1)
+        
+        changed = Appointment(
+            id=1, title="RDV déplacé", start_datetime=datetime(2024, 1, 16, 9, 0),
+            end_datetime=datetime(2024, 1, 16, 10, 0), category_id=loaded.category_id
+        )
+        db_manager.updateAppointment(changed)
+        
+        assert loaded.title == "RDV 9"
+        assert loaded.start_datetime == datetime(2024, 1, 15, 9, 0)
+        reloaded = db_manager.getAppointmentById(1)
+        assert reloaded is not loaded
+        assert reloaded.title == "RDV déplacé"
+        assert reloaded.start_datetime == datetime(2024, 1, 16, 9, 0)
+    
+    def test_updateAppointment_shouldReloadCategoryOfDetails(self, db_manager):
+        """Test des noms et couleurs relus après un changement de catégorie"""
+        pro_id = db_manager.insertCategory(Category(name="Pro", color="#EF4444"))
+        details = db_manager.getAppointmentsWithCategory(datetime(2024, 1, 15), datetime(2024, 1, 16))
+        assert details[0].category_name == "Perso"
+        
+        changed = Appointment(
+            id=details[0].id, title="RDV 9", start_datetime=details[0].start_datetime,
+            end_datetime=details[0].end_datetime, category_id=pro_id
+        )
+        db_manager.updateAppointment(changed)
+        assert (details[0].category_name, details[0].category_color) == ("Perso", "#3B82F6")
+        
+        reloaded = db_manager.getAppointmentsWithCategory(datetime(2024, 1, 15), datetime(2024, 1, 16))
+        assert (reloaded[0].category_name, reloaded[0].category_color) == ("Pro", "#EF4444")
+        assert reloaded[0] is not details[0]
+        assert reloaded[1] is details[1]
+    
+    def test_rereadOfChangedRow_shouldNotMutateSharedInstance(self, db_manager):
+        """Test d'une ligne modifiée hors du gestionnaire : nouvelle instance, ancienne intacte"""
+        loaded = db_manager.getAppointmentById(2)
+        by_date = db_manager.getAppointmentsByDate(datetime(2024, 1, 15).date())
+        assert by_date[1] is loaded
+        
+        db_manager.connection.execute("UPDATE appointments SET title = 'Renommé' WHERE id = 2")
+        by_date = db_manager.getAppointmentsByDate(datetime(2024, 1, 15).date())
+        
+        assert by_date[1] is not loaded
+        assert by_date[1].title == "Renommé"
+        assert loaded.title == "RDV 10"
+        assert db_manager.getAppointmentById(2) is by_date[1]
+    
+    def test_unusedInstances_shouldLeaveTheMap(self, db_manager):
+        """Test de l'éviction des instances qui ne sont plus référencées"""
+        appointments = db_manager.getAppointmentsByDate(datetime(2024, 1, 15).date())
+        assert len(db_manager.identity_map) == 3
+        
+        del appointments
+        gc.collect()
+        
+        assert len(db_manager.identity_map) == 0
+    
+    def test_rollback_shouldClearTheMap(self, db_manager):
+        """Test de l'oubli des instances après une annulation"""
+        loaded = db_manager.getAppointmentById(1)
+        
+        with pytest.raises(RuntimeError):
+            with db_manager.transaction():
+                loaded.title = "Annulé"
+                db_manager.updateAppointment(loaded)
+                raise RuntimeError("annulation")
+        
+        reloaded = db_manager.getAppointmentById(1)
+        assert reloaded is not loaded
+        assert reloaded.title == "RDV 9"
+
+
+class TestMigrations:
+
+    @pytest.fixture
+    def temp_path(self):
+        """Crée un fichier de base de données temporaire"""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(temp_fd)
+        yield temp_path
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+    
+    def test_initializeDatabase_shouldMigrateToLatestVersion(self, temp_path):
+        """Test de la mise à jour du schéma lors de l'initialisation"""
+        db_manager = DatabaseManager(temp_path)
+        db_manager.initializeDatabase()
+        
+        assert db_manager.getSchemaVersion() == MIGRATIONS[-1].version
+        
+        cursor = db_manager.connection.cursor()
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='index'")
+        indexes = [row[0] for row in cursor.fetchall()]
+        
+        assert "idx_appointments_time_range" in indexes
+        assert "idx_appointments_category" in indexes
+        assert "idx_appointments_subcategory" in indexes
+        
+        # Une seconde initialisation ne réapplique rien
+        assert db_manager.migrateDatabase() == 0
+        db_manager.close()
+    
+    def test_migrate_shouldUpgradeExistingDatabaseInPlace(self, temp_path):
+        """Test de la mise à jour d'une base existante sans index"""
+        # Base créée par une version antérieure (schéma version 0)
+        connection = sqlite3.connect(temp_path)
+        connection.executescript("""
+            CREATE TABLE categories (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL UNIQUE, color TEXT NOT NULL);
+            CREATE TABLE subcategories (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name TEXT NOT NULL, category_id INTEGER NOT NULL, color TEXT NOT NULL);
+            CREATE TABLE appointments (id INTEGER PRIMARY KEY AUTOINCREMENT,
+                title TEXT NOT NULL, description TEXT, start_datetime TEXT NOT NULL,
+                end_datetime TEXT NOT NULL, category_id INTEGER NOT NULL, subcategory_id INTEGER);
+            INSERT INTO categories (name, color) VALUES ('Perso', '#3B82F6');
+            INSERT INTO appointments (title, start_datetime, end_datetime, category_id)
+                VALUES ('RDV existant', '2024-01-15T10:00:00', '2024-01-15T11:00:00', 1);
+            INSERT INTO appointments (title, start_datetime, end_datetime, category_id)
+                VALUES ('RDV tardif', '2024-01-15T23:59:59.500000', '2024-01-16T00:30:00', 1);
+        """)
+        connection.close()
+        
+        db_manager = DatabaseManager(temp_path)
+        manager = MigrationManager(db_manager.connection)
+        assert manager.getCurrentVersion() == 0
+        
+        db_manager.initializeDatabase()
+        
+        assert db_manager.getSchemaVersion() == manager.getLatestVersion()
+        appointments = db_manager.getAppointmentsByDate(datetime(2024, 1, 15).date())
+        assert [a.title for a in appointments] == ["RDV existant", "RDV tardif"]
+        assert appointments[0].start_datetime == datetime(2024, 1, 15, 10, 0)
+        assert appointments[1].end_datetime == datetime(2024, 1, 16, 0, 30)
+        
+        # Les horaires sont désormais des entiers
+        types = db_manager.connection.execute(
+            "SELECT DISTINCT typeof(start_datetime), typeof(end_datetime) FROM appointments"
+        ).fetchall()
+        assert types == [("integer", "integer")]
+        
+        # La description est passée en dernière colonne, index et triggers conservés
+        columns = [row[1] for row in db_manager.connection.execute("PRAGMA table_info(appointments)")]
+        assert columns[-1] == "description"
+        assert [a.title for a in db_manager.searchAppointments("tardif*", 10)] == ["RDV tardif"]
+        
+        # L'index d'intervalles est rempli avec les rendez-vous existants
+        overlapping = db_manager.getOverlappingAppointments(datetime(2024, 1, 16), datetime(2024, 1, 16, 1))
+        assert [a.title for a in overlapping] == ["RDV tardif"]
+        
+        # La recherche par jour utilise l'index au lieu d'un parcours complet
+        plan = db_manager.connection.execute(
+            """EXPLAIN QUERY PLAN SELECT * FROM appointments
+               WHERE start_datetime >= ? AND start_datetime < ? AND recurrence_rule IS NULL""",
+            (toEpoch(datetime(2024, 1, 15)), toEpoch(datetime(2024, 1, 16)))
+        ).fetchall()
+        assert any("idx_appointments_time_range" in row[3] for row in plan)
+        
+        # Le parcours paginé suit l'index des horaires, sans tri temporaire
+        plan = db_manager.connection.execute(
+            """EXPLAIN QUERY PLAN SELECT * FROM appointments
+               WHERE (start_datetime, id) > (?, ?) AND recurrence_rule IS NULL
+               ORDER BY start_datetime, id LIMIT 100""",
+            (0, -1)
+        ).fetchall()
+        assert [row[3] for row in plan if "TEMP B-TREE" in row[3]] == []
+        db_manager.close()
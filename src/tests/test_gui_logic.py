@@ -3,12 +3,16 @@
 import pytest
 import tempfile
 import os
+import threading
+import time
 from datetime import datetime, date
 from unittest.mock import Mock, patch
 from src.services.category_service import CategoryService
 from src.services.appointment_service import AppointmentService
 from src.database.database_manager import DatabaseManager
 from src.models.appointment import Appointment
+from src.gui.background_executor import BackgroundExecutor, ImmediateExecutor
+from src.gui.canvas_year_grid import heatLevels, monthColumns, yearCellDates
 
 
 class TestAppointmentDialogLogic:
@@ -31,7 +35,10 @@ class TestAppointmentDialogLogic:
         
         yield category_service, appointment_service
         
-        os.unlink(temp_path)
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
     
     def test_appointment_creation_workflow(self, setup_services):
         """Test du workflow complet de création d'un rendez-vous"""
@@ -251,4 +258,237 @@ class TestAppointmentDialogLogic:
         )
         # Pour l'instant, le service accepte ces données
         # Cette validation pourrait être ajoutée plus tard
-        assert invalid_time_id is not None
\ No newline at end of file
+        assert invalid_time_id is not None
+
+
+class FakeRoot:
+    """Remplace la fenêtre Tk : les callbacks after() sont exécutés à la demande"""
+    
+    def __init__(self):
+        self.scheduled = []
+    
+    def after(self, delay, func):
+        self.scheduled.append(func)
+        return len(self.scheduled)
+    
+    def after_cancel(self, after_id):
+        pass
+    
+    def pump(self, timeout=2.0):
+        """Exécute les callbacks planifiés jusqu'à ce qu'il n'y en ait plus"""
+        deadline = time.monotonic() + timeout
+        while self.scheduled and time.monotonic() < deadline:
+            func = self.scheduled.pop(0)
+            func()
+            time.sleep(0.001)
+
+
+class TestBackgroundExecutor:
+    """Tests de l'exécution des appels de service hors du thread Tk"""
+    
+    @pytest.fixture
+    def executor(self):
+        """Crée un exécuteur avec une fausse fenêtre Tk"""
+        root = FakeRoot()
+        executor = BackgroundExecutor(root, poll_interval=1)
+        yield executor
+        executor.shutdown()
+    
+    def test_submit_shouldRunOnWorkerAndCallbackOnCallerThread(self, executor):
+        """Test de l'aller-retour thread de travail -> thread appelant"""
+        caller_thread = threading.current_thread()
+        seen = {}
+        
+        def work(value):
+            seen["worker"] = threading.current_thread()
+            return value * 2
+        
+        def callback(result):
+            seen["callback"] = threading.current_thread()
+            seen["result"] = result
+        
+        executor.submit(work, 21, callback=callback)
+        executor.root.pump()
+        
+        assert seen["result"] == 42
+        assert seen["worker"] is not caller_thread
+        assert seen["callback"] is caller_thread
+    
+    def test_submit_withSameKey_shouldDropStaleRequest(self, executor):
+        """Test de l'annulation d'une requête rendue obsolète"""
+        gate = threading.Event()
+        results = []
+        
+        # Bloquer le thread de travail pour que les requêtes s'accumulent
+        executor.submit(gate.wait)
+        executor.submit(lambda: "janvier", callback=results.append, key="month")
+        executor.submit(lambda: "février", callback=results.append, key="month")
+        gate.set()
+        executor.root.pump()
+        
+        assert results == ["février"]
+    
+    def test_submit_withError_shouldCallErrorCallback(self, executor):
+        """Test de la remontée des erreurs sur le thread appelant"""
+        errors = []
+        
+        def failing():
+            raise ValueError("disque indisponible")
+        
+        executor.submit(failing, callback=lambda r: None, error_callback=errors.append)
+        executor.root.pump()
+        
+        assert len(errors) == 1
+        assert isinstance(errors[0], ValueError)
+    
+    def test_immediateExecutor_shouldRunSynchronously(self):
+        """Test de l'exécuteur synchrone utilisé par défaut"""
+        results = []
+        
+        ImmediateExecutor().submit(lambda a, b: a + b, 1, 2, callback=results.append)
+        
+        assert results == [3]
+    
+    def test_services_shouldBeUsableFromWorkerThread(self):
+        """Test de l'accès à la base depuis le thread de travail"""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(temp_fd)
+        db_manager = DatabaseManager(temp_path)
+        db_manager.initializeDatabase()
+        category_service = CategoryService(db_manager)
+        
+        root = FakeRoot()
+        executor = BackgroundExecutor(root, poll_interval=1)
+        results = []
+        
+        executor.submit(category_service.initializeDefaultCategories)
+        executor.submit(category_service.getAllCategories, callback=results.append)
+        root.pump()
+        executor.shutdown()
+        
+        assert {cat.name for cat in results[0]} == {"Perso", "Pro"}
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+
+
+class TestCanvasMonthGrid:
+    """Tests du rendu canvas de la grille mensuelle"""
+    
+    @pytest.fixture
+    def canvas_grid(self):
+        """Crée une grille canvas (ignoré sans affichage disponible)"""
+        tkinter = pytest.importorskip("tkinter")
+        try:
+            root = tkinter.Tk()
+        except tkinter.TclError:
+            pytest.skip("Aucun affichage disponible")
+        
+        from src.gui.canvas_month_grid import CanvasMonthGrid
+        clicks = []
+        grid = CanvasMonthGrid(root, on_cell_click=clicks.append, width=700, height=600)
+        grid.pack()
+        root.update()
+        yield grid, clicks
+        root.destroy()
+    
+    def makeState(self, day, indicator=""):
+        return {
+            "text": str(day), "fg_color": "#FFFFFF", "text_color": "#111827",
+            "hover_color": "#F8FAFC", "indicator_text": indicator, "indicator_color": "#EF4444"
+        }
+    
+    def test_render_shouldOnlyUpdateChangedItems(self, canvas_grid):
+        """Test de la mise à jour sélective des items"""
+        grid, clicks = canvas_grid
+        states = [self.makeState(i + 1) if i < 31 else None for i in range(42)]
+        
+        grid.render(states)
+        assert grid.render(states) == 0
+        
+        states[14] = self.makeState(15, indicator="● 2")
+        assert grid.render(states) == 1
+    
+    def test_cellAt_shouldHitTestVisibleCells(self, canvas_grid):
+        """Test de la résolution des clics par hit-testing"""
+        grid, clicks = canvas_grid
+        grid.render([self.makeState(i + 1) if i < 31 else None for i in range(42)])
+        
+        # Centre de la deuxième cellule de la première ligne
+        assert grid.cellAt(150, 50) == 1
+        # Cellule vide de la dernière ligne
+        assert grid.cellAt(650, 550) is None
+
+
+class TestYearGridLogic:
+    """Tests du placement des jours dans la carte de chaleur annuelle"""
+    
+    def test_yearCellDates_shouldStartOnFirstWeekday(self):
+        """Test du décalage du 1er janvier et des cellules hors de l'année"""
+        # 2025 commence un mercredi : deux cellules vides en tête
+        cells = yearCellDates(2025, 7 * 54)
+        assert cells[:3] == [None, None, date(2025, 1, 1)]
+        assert cells[2 + 364] == date(2025, 12, 31)
+        assert sum(cell is not None for cell in cells) == 365
+        
+        # 2012, bissextile commençant un dimanche : le 31 décembre tombe dans la 54e semaine
+        cells = yearCellDates(2012, 7 * 54)
+        assert cells[6 + 365] == date(2012, 12, 31)
+        assert (6 + 365) // 7 == 53
+    
+    def test_monthColumns_shouldLocateFirstDayOfEachMonth(self):
+        """Test des colonnes des libellés de mois"""
+        columns = monthColumns(2025)
+        assert columns[0] == 0
+        # 1er février 2025 : rang 31 + 2 cellules de décalage -> semaine 4
+        assert columns[1] == 4
+        assert columns[11] == (2 + 334) // 7
+    
+    def test_heatLevels_shouldScaleToPeak(self):
+        """Test des niveaux d'intensité relatifs au maximum"""
+        assert heatLevels([0, 1, 5, 10]) == [0, 1, 2, 4]
+        assert heatLevels([0, 0]) == [0, 0]
+
+
+class TestCanvasYearGrid:
+    """Tests du rendu canvas de la vue annuelle"""
+    
+    @pytest.fixture
+    def year_grid(self):
+        """Crée une grille annuelle (ignoré sans affichage disponible)"""
+        tkinter = pytest.importorskip("tkinter")
+        try:
+            root = tkinter.Tk()
+        except tkinter.TclError:
+            pytest.skip("Aucun affichage disponible")
+        
+        from src.gui.canvas_year_grid import CanvasYearGrid
+        clicks = []
+        grid = CanvasYearGrid(root, on_cell_click=clicks.append, width=32 + 54 * 10, height=18 + 7 * 10)
+        grid.pack()
+        root.update()
+        grid.layout()
+        yield grid, clicks
+        root.destroy()
+    
+    def test_render_shouldOnlyUpdateChangedCells(self, year_grid):
+        """Test de la mise à jour sélective des cellules"""
+        grid, clicks = year_grid
+        levels = [0 if cell else None for cell in yearCellDates(2025, grid.cell_count)]
+        
+        assert grid.render(levels, monthColumns(2025)) == 365
+        assert grid.render(levels, monthColumns(2025)) == 0
+        
+        levels[10] = 3
+        assert grid.render(levels, monthColumns(2025)) == 1
+    
+    def test_cellAt_shouldResolveVisibleCells(self, year_grid):
+        """Test de la résolution des clics par calcul de la cellule"""
+        grid, clicks = year_grid
+        grid.render([0 if cell else None for cell in yearCellDates(2025, grid.cell_count)], monthColumns(2025))
+        
+        # Troisième ligne de la première semaine : 1er janvier 2025
+        assert grid.cellAt(32 + 5, 18 + 25) == 2
+        # Lundi de la première semaine, avant le 1er janvier
+        assert grid.cellAt(32 + 5, 18 + 5) is None
@@ -5,10 +5,11 @@ from datetime import datetime, date, time
 from src.models.category import Category
 from src.models.subcategory import Subcategory  
 from src.models.appointment import Appointment
+from src.utils.epoch import toEpoch
 
 
 class TestCategory:
-    
+
     def test_createCategory_withValidData_shouldCreateCategory(self):
         category = Category(1, "Perso", "#3B82F6")
         
@@ -25,7 +26,7 @@ class TestCategory:
 
 
 class TestSubcategory:
-    
+
     def test_createSubcategory_withValidData_shouldCreateSubcategory(self):
         subcategory = Subcategory(1, "Médical", 1, "#10B981")
         
@@ -36,7 +37,7 @@ class TestSubcategory:
 
 
 class TestAppointment:
-    
+
     def test_createAppointment_withValidData_shouldCreateAppointment(self):
         start_datetime = datetime(2024, 1, 15, 10, 30)
         end_datetime = datetime(2024, 1, 15, 11, 30)
@@ -84,4 +85,57 @@ class TestAppointment:
         )
         
         assert appointment.isOnDate(date(2024, 1, 15)) is True
-        assert appointment.isOnDate(date(2024, 1, 16)) is False
\ No newline at end of file
+        assert appointment.isOnDate(date(2024, 1, 16)) is False
+    
+    def test_fromRow_withPositionalRow_shouldConvertEpochs(self):
+        row = (7, "Test", "Desc", 1705314600, 1705316400, 1, None, None)
+        
+        appointment = Appointment.fromRow(row)
+        
+        assert appointment.id == 7
+        assert appointment.title == "Test"
+        assert appointment.start_epoch == 1705314600
+        assert appointment.start_datetime == datetime(2024, 1, 15, 10, 30)
+        assert appointment.end_datetime == datetime(2024, 1, 15, 11, 0)
+        assert appointment.subcategory_id is None
+    
+    def test_setStartDatetime_shouldRecomputeEpoch(self):
+        appointment = Appointment.fromRow((1, "Test", "", 1705314600, 1705316400, 1, None, None))
+        
+        appointment.start_datetime = datetime(2024, 1, 15, 9, 0)
+        
+        assert appointment.start_epoch == toEpoch(datetime(2024, 1, 15, 9, 0))
+        assert appointment.getDuration().total_seconds() == 2 * 3600
+    
+    def test_deferDescription_shouldLoadOnFirstAccessOnly(self):
+        calls = []
+        
+        def loader(appointment_id):
+            calls.append(appointment_id)
+            return "Notes longues"
+        
+        appointment = Appointment.fromRow((7, "Test", None, 1705314600, 1705316400, 1, None, None))
+        appointment.deferDescription(loader)
+        occurrence = appointment.createOccurrence(datetime(2024, 1, 22, 10, 30))
+        
+        assert not appointment.isDescriptionLoaded()
+        assert appointment.description == "Notes longues"
+        assert appointment.description == "Notes longues"
+        assert calls == [7]
+        
+        # Une occurrence copiée avant le chargement charge la description de sa série
+        assert occurrence.description == "Notes longues"
+        
+        # Une valeur affectée remplace le chargement différé
+        appointment.deferDescription(loader)
+        appointment.description = "Nouvelle"
+        assert appointment.description == "Nouvelle" and calls == [7, 7]
+    
+    def test_models_shouldUseSlots(self):
+        appointment = Appointment(title="Test", start_datetime=datetime(2024, 1, 15, 10),
+                                  end_datetime=datetime(2024, 1, 15, 11))
+        
+        for instance in (appointment, Category(1, "Perso", "#3B82F6"), Subcategory(1, "Médical", 1, "#10B981")):
+            assert not hasattr(instance, "__dict__")
+            with pytest.raises(AttributeError):
+                instance.unknown_attribute = 1
@@ -1,11 +1,16 @@
 """Tests pour les services métier"""
 
+import io
+import json
 import pytest
 import tempfile
 import os
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 from src.services.appointment_service import AppointmentService
 from src.services.category_service import CategoryService
+from src.services.analytics_service import AnalyticsService
+from src.services.ics_import_service import IcsImportService
+from src.services.export_service import ExportService
 from src.database.database_manager import DatabaseManager
 from src.models.category import Category
 from src.models.subcategory import Subcategory
@@ -13,7 +18,7 @@ from src.models.appointment import Appointment
 
 
 class TestCategoryService:
-    
+
     @pytest.fixture
     def category_service(self):
         """Crée un service de catégorie avec une base temporaire"""
@@ -23,7 +28,10 @@ class TestCategoryService:
         db_manager.initializeDatabase()
         service = CategoryService(db_manager)
         yield service
-        os.unlink(temp_path)
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
     
     def test_initializeDefaultCategories_shouldCreateDefaultCategories(self, category_service):
         """Test de l'initialisation des catégories par défaut"""
@@ -53,6 +61,38 @@ class TestCategoryService:
         assert subcategory_id is not None
         assert subcategory_id > 0
     
+    def test_getTaxonomy_shouldLoadTreeInOneQuery(self, category_service):
+        """Test du chargement de l'arbre des catégories en une seule requête"""
+        category_service.initializeDefaultCategories()
+        category_service.createCategory("Vide", "#6B7280")
+        
+        statements = []
+        category_service.db_manager.connection.set_trace_callback(statements.append)
+        taxonomy = category_service.getTaxonomy()
+        category_service.getAllSubcategories()
+        category_service.getSubcategoriesByCategory(taxonomy.getCategoryByName("Pro").id)
+        category_service.db_manager.connection.set_trace_callback(None)
+        
+        assert len(statements) == 1
+        assert [cat.name for cat in taxonomy.getCategories()] == ["Perso", "Pro", "Vide"]
+        assert taxonomy.getSubcategories(taxonomy.getCategoryByName("Vide").id) == []
+        
+        pro = taxonomy.getCategoryByName("Pro")
+        reunion = taxonomy.getSubcategoryByName(pro.id, "Réunion")
+        assert taxonomy.getSubcategoryById(reunion.id) is reunion
+        assert reunion.category_id == pro.id
+        assert len(category_service.getAllSubcategories()) == 8
+    
+    def test_createSubcategory_shouldInvalidateTaxonomy(self, category_service):
+        """Test de l'invalidation de l'index après une insertion"""
+        category_id = category_service.createCategory("Perso", "#3B82F6")
+        assert category_service.getSubcategoriesByCategory(category_id) == []
+        
+        category_service.createSubcategory("Sport", category_id, "#10B981")
+        
+        assert [sub.name for sub in category_service.getSubcategoriesByCategory(category_id)] == ["Sport"]
+        assert category_service.getCategoryById(category_id).name == "Perso"
+    
     def test_getSubcategoriesByCategory_shouldReturnFilteredSubcategories(self, category_service):
         """Test de récupération des sous-catégories par catégorie"""
         # Créer des catégories
@@ -74,7 +114,7 @@ class TestCategoryService:
 
 
 class TestAppointmentService:
-    
+
     @pytest.fixture
     def appointment_service(self):
         """Crée un service de rendez-vous avec une base temporaire"""
@@ -84,7 +124,10 @@ class TestAppointmentService:
         db_manager.initializeDatabase()
         service = AppointmentService(db_manager)
         yield service
-        os.unlink(temp_path)
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
     
     @pytest.fixture
     def sample_category_id(self, appointment_service):
@@ -203,4 +246,867 @@ class TestAppointmentService:
         )
         
         assert len(appointments) == 1
-        assert appointments[0].title == "RDV 2"
\ No newline at end of file
+        assert appointments[0].title == "RDV 2"
+    
+    def test_hasConflict_shouldDetectOverlappingAppointment(self, appointment_service, sample_category_id):
+        """Test de détection d'un conflit d'horaire"""
+        appointment_id = appointment_service.createAppointment(
+            title="RDV existant",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 15, 10, 30), datetime(2024, 1, 15, 11, 30)
+        ) is True
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 15, 11, 0), datetime(2024, 1, 15, 12, 0)
+        ) is False
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 15, 10, 30), datetime(2024, 1, 15, 11, 30),
+            exclude_id=appointment_id
+        ) is False
+    
+    def test_hasConflict_withAppointmentFromPreviousDay_shouldDetectOverlap(self, appointment_service, sample_category_id):
+        """Test d'un rendez-vous de la veille qui déborde après minuit"""
+        appointment_service.createAppointment(
+            title="Garde de nuit",
+            start_datetime=datetime(2024, 1, 14, 22, 0),
+            end_datetime=datetime(2024, 1, 15, 6, 0),
+            category_id=sample_category_id
+        )
+        
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 15, 5, 0), datetime(2024, 1, 15, 7, 0)
+        ) is True
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 15, 6, 0), datetime(2024, 1, 15, 7, 0)
+        ) is False
+    
+    def test_hasConflict_shouldFollowUpdatesAndDeletes(self, appointment_service, sample_category_id):
+        """Test de la synchronisation de l'index d'intervalles"""
+        appointment_id = appointment_service.createAppointment(
+            title="RDV",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        appointment_service.updateAppointment(
+            appointment_id,
+            title="RDV",
+            description="",
+            start_datetime=datetime(2024, 1, 16, 10, 0),
+            end_datetime=datetime(2024, 1, 16, 11, 0),
+            category_id=sample_category_id
+        )
+        
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 11, 0)
+        ) is False
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 16, 10, 30), datetime(2024, 1, 16, 10, 45)
+        ) is True
+        
+        appointment_service.deleteAppointment(appointment_id)
+        assert appointment_service.hasConflict(
+            datetime(2024, 1, 16, 10, 30), datetime(2024, 1, 16, 10, 45)
+        ) is False
+    
+    def test_getConflictingPairs_shouldReturnEachPairOnce(self, appointment_service, sample_category_id):
+        """Test du rapport des conflits sur une plage de dates"""
+        for title, start_hour, end_hour in [("A", 9, 11), ("B", 10, 12), ("C", 11, 12), ("D", 14, 15)]:
+            appointment_service.createAppointment(
+                title=title,
+                start_datetime=datetime(2024, 1, 15, start_hour, 0),
+                end_datetime=datetime(2024, 1, 15, end_hour, 0),
+                category_id=sample_category_id
+            )
+        
+        pairs = appointment_service.getConflictingPairs(date(2024, 1, 15), date(2024, 1, 15))
+        
+        assert sorted((a.title, b.title) for a, b in pairs) == [("A", "B"), ("B", "C")]
+        assert appointment_service.getConflictingPairs(date(2024, 1, 16), date(2024, 1, 16)) == []
+    
+    def test_conflicts_shouldUseOccurrencesInsteadOfSeriesTemplate(self, appointment_service, sample_category_id):
+        """Test des conflits avec une série dont la première occurrence est supprimée"""
+        series_id = appointment_service.createAppointment(
+            title="Hebdo",
+            start_datetime=datetime(2024, 1, 1, 10, 0),
+            end_datetime=datetime(2024, 1, 1, 11, 0),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=WEEKLY"
+        )
+        appointment_service.deleteOccurrence(series_id, datetime(2024, 1, 1, 10, 0))
+        appointment_service.createAppointment(
+            title="Point",
+            start_datetime=datetime(2024, 1, 8, 10, 30),
+            end_datetime=datetime(2024, 1, 8, 11, 30),
+            category_id=sample_category_id
+        )
+        
+        # Le modèle de la série ne compte pas : son premier jour est libre
+        assert appointment_service.hasConflict(datetime(2024, 1, 1, 10, 30), datetime(2024, 1, 1, 11, 30)) is False
+        assert appointment_service.hasConflict(datetime(2024, 1, 15, 10, 30), datetime(2024, 1, 15, 11, 30)) is True
+        
+        pairs = appointment_service.getConflictingPairs(date(2024, 1, 1), date(2024, 1, 14))
+        assert [(a.title, a.start_datetime, b.title) for a, b in pairs] == [
+            ("Hebdo", datetime(2024, 1, 8, 10, 0), "Point")
+        ]
+    
+    def test_conflicts_shouldFindSeriesOccurrencesLongerThanADay(self, appointment_service, sample_category_id):
+        """Test d'une occurrence de plusieurs jours commencée avant le créneau"""
+        appointment_service.createAppointment(
+            title="Séminaire",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 4, 9, 0),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=MONTHLY"
+        )
+        
+        # Le 3 février est couvert par l'occurrence commencée le 1er
+        assert appointment_service.hasConflict(datetime(2024, 2, 3, 10, 0), datetime(2024, 2, 3, 11, 0)) is True
+        assert list(appointment_service.findFreeSlots(date(2024, 2, 3), date(2024, 2, 3))) == []
+        assert appointment_service.hasConflict(datetime(2024, 2, 5, 10, 0), datetime(2024, 2, 5, 11, 0)) is False
+    
+    def test_search_shouldMatchPrefixesAndRankTitlesFirst(self, appointment_service, sample_category_id):
+        """Test de la recherche plein texte"""
+        appointment_service.createAppointment(
+            title="Réunion budget",
+            description="Préparer le rendez-vous médecin",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        appointment_service.createAppointment(
+            title="Médecin généraliste",
+            start_datetime=datetime(2024, 2, 1, 9, 0),
+            end_datetime=datetime(2024, 2, 1, 9, 30),
+            category_id=sample_category_id
+        )
+        
+        results = appointment_service.search("med")
+        
+        assert [a.title for a in results] == ["Médecin généraliste", "Réunion budget"]
+        assert [a.title for a in appointment_service.search("reu BUDG")] == ["Réunion budget"]
+        assert appointment_service.search("  ") == []
+        assert len(appointment_service.search('"méd* (')) == 2
+        
+        in_january = appointment_service.search("med", date_range=(date(2024, 1, 1), date(2024, 1, 31)))
+        assert [a.title for a in in_january] == ["Réunion budget"]
+    
+    def test_search_shouldFollowUpdatesAndDeletes(self, appointment_service, sample_category_id):
+        """Test de la synchronisation de l'index plein texte"""
+        appointment_id = appointment_service.createAppointment(
+            title="Dentiste",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        appointment_service.updateAppointment(
+            appointment_id,
+            title="Kiné",
+            description="",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        
+        assert appointment_service.search("dent") == []
+        assert [a.id for a in appointment_service.search("kine")] == [appointment_id]
+        
+        appointment_service.deleteAppointment(appointment_id)
+        assert appointment_service.search("kine") == []
+    
+    def test_getAppointmentsWithCategory_shouldJoinNamesAndColors(self, appointment_service, sample_category_id):
+        """Test de la lecture enrichie des catégories en une requête"""
+        db_manager = appointment_service.db_manager
+        subcategory_id = db_manager.insertSubcategory(
+            Subcategory(name="Médical", category_id=sample_category_id, color="#10B981")
+        )
+        appointment_service.createAppointment(
+            title="Médecin",
+            start_datetime=datetime(2024, 1, 15, 9, 0),
+            end_datetime=datetime(2024, 1, 15, 10, 0),
+            category_id=sample_category_id,
+            subcategory_id=subcategory_id
+        )
+        appointment_service.createAppointment(
+            title="Courses",
+            start_datetime=datetime(2024, 1, 15, 17, 0),
+            end_datetime=datetime(2024, 1, 15, 18, 0),
+            category_id=sample_category_id
+        )
+        
+        statements = []
+        db_manager.connection.set_trace_callback(statements.append)
+        appointments = appointment_service.getAppointmentsWithCategory(date(2024, 1, 15))
+        db_manager.connection.set_trace_callback(None)
+        
+        # Rendez-vous simples et modèles des séries, catégories jointes
+        assert len(statements) == 2
+        assert [a.title for a in appointments] == ["Médecin", "Courses"]
+        assert appointments[0].subcategory_name == "Médical"
+        assert appointments[0].getColor() == "#10B981"
+        assert appointments[1].category_name == "Test"
+        assert appointments[1].subcategory_name is None
+        assert appointments[1].getColor() == appointments[1].category_color
+    
+    def test_getAppointmentsByDate_shouldServeRepeatedReadsFromCache(self, appointment_service, sample_category_id):
+        """Test du cache de lecture par jour"""
+        appointment_service.createAppointment(
+            title="RDV 1",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        
+        appointment_service.getAppointmentsByDate(date(2024, 1, 15))
+        appointment_service.getAppointmentsByDate(date(2024, 1, 15))
+        appointment_service.getAppointmentCountsByDay(2024, 1)
+        appointment_service.getAppointmentCountsByDay(2024, 1)
+        
+        stats = appointment_service.getCacheStats()
+        assert stats["misses"] == 2
+        assert stats["hits"] == 2
+    
+    def test_updateAppointment_shouldInvalidateOldAndNewDates(self, appointment_service, sample_category_id):
+        """Test de l'invalidation du cache lors du déplacement d'un rendez-vous"""
+        appointment_id = appointment_service.createAppointment(
+            title="RDV déplacé",
+            start_datetime=datetime(2024, 1, 15, 10, 0),
+            end_datetime=datetime(2024, 1, 15, 11, 0),
+            category_id=sample_category_id
+        )
+        
+        # Remplir le cache pour les deux dates et les deux mois
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 1, 15))) == 1
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 2, 3))) == 0
+        assert appointment_service.getAppointmentCountsByDay(2024, 1) == {date(2024, 1, 15): 1}
+        
+        appointment_service.updateAppointment(
+            appointment_id=appointment_id,
+            title="RDV déplacé",
+            start_datetime=datetime(2024, 2, 3, 9, 0),
+            end_datetime=datetime(2024, 2, 3, 10, 0),
+            category_id=sample_category_id
+        )
+        
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 1, 15))) == 0
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 2, 3))) == 1
+        assert appointment_service.getAppointmentCountsByDay(2024, 1) == {}
+        
+        appointment_service.deleteAppointment(appointment_id)
+        
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 2, 3))) == 0
+        assert appointment_service.getAppointmentCountsByDay(2024, 2) == {}
+    
+    def test_cache_shouldEvictLeastRecentlyUsedEntries(self, appointment_service):
+        """Test de la borne du cache"""
+        service = AppointmentService(appointment_service.db_manager, cache_size=2)
+        
+        service.getAppointmentsByDate(date(2024, 1, 1))
+        service.getAppointmentsByDate(date(2024, 1, 2))
+        service.getAppointmentsByDate(date(2024, 1, 1))  # Devient la plus récente
+        service.getAppointmentsByDate(date(2024, 1, 3))  # Évince le 2 janvier
+        service.getAppointmentsByDate(date(2024, 1, 1))
+        
+        stats = service.getCacheStats()
+        assert stats["evictions"] == 1
+        assert stats["hits"] == 2
+        assert stats["size"] == 2
+    
+    def test_recurringSeries_shouldExpandOccurrencesPerWindow(self, appointment_service, sample_category_id):
+        """Test de l'expansion paresseuse d'une série hebdomadaire"""
+        series_id = appointment_service.createAppointment(
+            title="Yoga",
+            start_datetime=datetime(2024, 1, 1, 18, 0),
+            end_datetime=datetime(2024, 1, 1, 19, 0),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=WEEKLY;COUNT=10"
+        )
+        appointment_service.createAppointment(
+            title="Dentiste",
+            start_datetime=datetime(2024, 1, 8, 9, 0),
+            end_datetime=datetime(2024, 1, 8, 10, 0),
+            category_id=sample_category_id
+        )
+        
+        # Une seule ligne en base pour toute la série
+        count = appointment_service.db_manager.connection.execute(
+            "SELECT COUNT(*) FROM appointments WHERE recurrence_rule IS NOT NULL"
+        ).fetchone()[0]
+        assert count == 1
+        
+        day = appointment_service.getAppointmentsByDate(date(2024, 1, 8))
+        assert [a.title for a in day] == ["Dentiste", "Yoga"]
+        assert day[1].id == series_id
+        assert day[1].end_datetime == datetime(2024, 1, 8, 19, 0)
+        assert day[1].series_start == datetime(2024, 1, 1, 18, 0)
+        
+        details = appointment_service.getAppointmentsWithCategory(date(2024, 1, 15))
+        assert [a.category_name for a in details] == ["Test"]
+        
+        week = appointment_service.getAppointmentsByDateRange(date(2024, 1, 1), date(2024, 1, 14))
+        assert [a.start_datetime.day for a in week] == [1, 8, 8]
+        
+        counts = appointment_service.getAppointmentCountsByDay(2024, 3)
+        assert counts == {date(2024, 3, 4): 1}  # Dixième et dernière occurrence
+        assert appointment_service.getAppointmentsByDate(date(2024, 3, 11)) == []
+    
+    def test_iterOccurrences_withCorruptStoredRule_shouldRaise(self, appointment_service, sample_category_id):
+        """Test d'une règle illisible écrite en base sans passer par le service"""
+        series_id = appointment_service.db_manager.insertAppointment(Appointment(
+            title="Série corrompue",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 1, 10, 0),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=PARFOIS"
+        ))
+        
+        with pytest.raises(ValueError, match=f"série {series_id}"):
+            list(appointment_service.iterOccurrences(datetime(2024, 1, 1), datetime(2024, 2, 1)))
+    
+    def test_deleteOccurrence_shouldOnlyRemoveThatOccurrence(self, appointment_service, sample_category_id):
+        """Test des exceptions d'une série"""
+        series_id = appointment_service.createAppointment(
+            title="Stand-up",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 1, 9, 15),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=DAILY"
+        )
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 1, 2))) == 1
+        
+        appointment_service.deleteOccurrence(series_id, datetime(2024, 1, 2, 9, 0))
+        
+        assert appointment_service.getAppointmentsByDate(date(2024, 1, 2)) == []
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 1, 3))) == 1
+        assert appointment_service.getAppointmentCountsByDay(2024, 1)[date(2024, 1, 31)] == 1
+        assert date(2024, 1, 2) not in appointment_service.getAppointmentCountsByDay(2024, 1)
+    
+    def test_updateOccurrence_shouldOnlyChangeThatOccurrence(self, appointment_service, sample_category_id):
+        """Test de la modification d'une seule occurrence d'une série"""
+        series_id = appointment_service.createAppointment(
+            title="Stand-up",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 1, 9, 15),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=DAILY"
+        )
+        # Remplir le cache avant la modification
+        appointment_service.getAppointmentsByDate(date(2024, 1, 3))
+        
+        appointment_service.updateOccurrence(
+            series_id, datetime(2024, 1, 3, 9, 0), title="Stand-up décalé",
+            start_datetime=datetime(2024, 1, 3, 14, 0), end_datetime=datetime(2024, 1, 3, 14, 15),
+            category_id=sample_category_id
+        )
+        
+        day = appointment_service.getAppointmentsByDate(date(2024, 1, 3))
+        assert [(a.title, a.start_datetime.hour, a.isOccurrence()) for a in day] == [
+            ("Stand-up décalé", 14, False)
+        ]
+        assert [a.title for a in appointment_service.getAppointmentsByDate(date(2024, 1, 4))] == ["Stand-up"]
+        assert appointment_service.getAppointmentById(series_id).start_datetime == datetime(2024, 1, 1, 9, 0)
+    
+    def test_updateSeries_shouldInvalidateCachedOccurrences(self, appointment_service, sample_category_id):
+        """Test de l'invalidation des occurrences lors de la modification d'une série"""
+        series_id = appointment_service.createAppointment(
+            title="Piscine",
+            start_datetime=datetime(2024, 1, 1, 7, 0),
+            end_datetime=datetime(2024, 1, 1, 8, 0),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=DAILY"
+        )
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 1, 6))) == 1
+        
+        appointment_service.updateAppointment(
+            series_id,
+            title="Piscine",
+            description="",
+            start_datetime=datetime(2024, 1, 1, 7, 0),
+            end_datetime=datetime(2024, 1, 1, 8, 0),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=WEEKLY"
+        )
+        
+        assert appointment_service.getAppointmentsByDate(date(2024, 1, 6)) == []
+        assert len(appointment_service.getAppointmentsByDate(date(2024, 1, 8))) == 1
+        assert appointment_service.hasConflict(datetime(2024, 1, 15, 7, 30), datetime(2024, 1, 15, 9, 0))
+        assert not appointment_service.hasConflict(datetime(2024, 1, 16, 7, 30), datetime(2024, 1, 16, 9, 0))
+        
+        with pytest.raises(ValueError):
+            appointment_service.createAppointment(
+                title="Invalide",
+                start_datetime=datetime(2024, 1, 1, 7, 0),
+                end_datetime=datetime(2024, 1, 1, 8, 0),
+                category_id=sample_category_id,
+                recurrence_rule="FREQ=SOUVENT"
+            )
+    
+    def test_findFreeSlots_shouldSkipBusyIntervalsInOneSweep(self, appointment_service, sample_category_id):
+        """Test de la recherche de créneaux libres sur plusieurs jours"""
+        db_manager = appointment_service.db_manager
+        other_category_id = db_manager.insertCategory(Category(name="Autre", color="#000000"))
+        
+        # Deux rendez-vous qui se chevauchent (9h-10h30 et 10h-11h) puis une nuit qui déborde
+        for start, end, category_id in (
+            (datetime(2024, 1, 15, 9, 0), datetime(2024, 1, 15, 10, 30), sample_category_id),
+            (datetime(2024, 1, 15, 10, 0), datetime(2024, 1, 15, 11, 0), sample_category_id),
+            (datetime(2024, 1, 15, 16, 30), datetime(2024, 1, 16, 10, 0), other_category_id),
+        ):
+            appointment_service.createAppointment(
+                title="Occupé", start_datetime=start, end_datetime=end, category_id=category_id
+            )
+        
+        slots = list(appointment_service.findFreeSlots(
+            date(2024, 1, 15), date(2024, 1, 16), working_hours=(9, 18)
+        ))
+        starts = [start for start, _ in slots]
+        
+        assert starts[0] == datetime(2024, 1, 15, 11, 0)
+        assert datetime(2024, 1, 15, 15, 0) in starts
+        assert datetime(2024, 1, 15, 16, 0) not in starts
+        assert starts[5] == datetime(2024, 1, 16, 10, 0)
+        assert len(slots) == 5 + 8
+        assert all(end - start == timedelta(hours=1) for start, end in slots)
+        
+        # Seule la catégorie de test occupe l'agenda, sur des créneaux de 30 minutes
+        first = next(appointment_service.findFreeSlots(
+            date(2024, 1, 15), date(2024, 1, 15), duration=timedelta(minutes=30),
+            working_hours=(9, 18), category_ids=[sample_category_id]
+        ))
+        assert first == (datetime(2024, 1, 15, 11, 0), datetime(2024, 1, 15, 11, 30))
+    
+    def test_findFreeSlots_shouldAccountForRecurringOccurrences(self, appointment_service, sample_category_id):
+        """Test des créneaux libres autour d'une série quotidienne"""
+        appointment_service.createAppointment(
+            title="Stand-up",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 1, 9, 30),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=DAILY"
+        )
+        
+        slots = appointment_service.findFreeSlots(date(2024, 1, 10), date(2024, 1, 10), working_hours=(9, 12))
+        assert [start.strftime("%H:%M") for start, _ in slots] == ["10:00", "11:00"]
+    
+    def test_findConflicts_shouldReturnOverlapGroups(self, appointment_service, sample_category_id):
+        """Test du rapport de conflits sur une plage"""
+        other_category_id = appointment_service.db_manager.insertCategory(Category(name="Autre", color="#000000"))
+        
+        def create(title, start, end, category_id=sample_category_id):
+            appointment_service.createAppointment(
+                title=title, start_datetime=start, end_datetime=end, category_id=category_id
+            )
+        
+        # A chevauche B, B chevauche C : un seul groupe de trois
+        create("A", datetime(2024, 2, 5, 9, 0), datetime(2024, 2, 5, 10, 0))
+        create("B", datetime(2024, 2, 5, 9, 30), datetime(2024, 2, 5, 11, 0))
+        create("C", datetime(2024, 2, 5, 10, 30), datetime(2024, 2, 5, 12, 0), other_category_id)
+        create("Seul", datetime(2024, 2, 5, 14, 0), datetime(2024, 2, 5, 15, 0))
+        # Le rendez-vous qui se termine exactement au début du suivant n'est pas en conflit
+        create("D", datetime(2024, 3, 1, 8, 0), datetime(2024, 3, 1, 9, 0))
+        create("E", datetime(2024, 3, 1, 9, 0), datetime(2024, 3, 1, 10, 0))
+        create("F", datetime(2024, 3, 29, 9, 0), datetime(2024, 3, 29, 10, 0), other_category_id)
+        create("G", datetime(2024, 3, 29, 9, 15), datetime(2024, 3, 29, 9, 45), other_category_id)
+        
+        groups = appointment_service.findConflicts(date(2024, 1, 1), date(2024, 3, 31))
+        assert [[a.title for a in group] for group in groups] == [["A", "B", "C"], ["F", "G"]]
+        
+        groups = appointment_service.findConflicts(date(2024, 1, 1), date(2024, 3, 31), by_category=True)
+        assert [[a.title for a in group] for group in groups] == [["A", "B"], ["F", "G"]]
+    
+    def test_getCategoryTotals_shouldAddOccurrencesToSummary(self, appointment_service, sample_category_id):
+        """Test des totaux par catégorie d'une période"""
+        appointment_service.createAppointment(
+            title="Réunion",
+            start_datetime=datetime(2024, 1, 15, 9, 0),
+            end_datetime=datetime(2024, 1, 15, 10, 30),
+            category_id=sample_category_id
+        )
+        appointment_service.createAppointment(
+            title="Stand-up",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 1, 9, 15),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=WEEKLY"
+        )
+        
+        # Semaine du 15 janvier : la réunion et une occurrence du stand-up
+        assert appointment_service.getCategoryTotals(date(2024, 1, 15), date(2024, 1, 21)) == {
+            sample_category_id: (2, 105)
+        }
+        assert appointment_service.getCategoryTotals(date(2024, 1, 1), date(2024, 1, 31)) == {
+            sample_category_id: (6, 165)
+        }
+    
+    def test_getYearActivity_shouldAggregateDaysAndInvalidateOnWrite(self, appointment_service, sample_category_id):
+        """Test de l'activité quotidienne d'une année (vue annuelle)"""
+        appointment_service.createAppointment(
+            title="Réunion",
+            start_datetime=datetime(2024, 1, 15, 9, 0),
+            end_datetime=datetime(2024, 1, 15, 10, 30),
+            category_id=sample_category_id
+        )
+        appointment_service.createAppointment(
+            title="Stand-up",
+            start_datetime=datetime(2024, 1, 1, 9, 0),
+            end_datetime=datetime(2024, 1, 1, 9, 15),
+            category_id=sample_category_id,
+            recurrence_rule="FREQ=WEEKLY"
+        )
+        
+        activity = appointment_service.getYearActivity(2024)
+        # Les 53 lundis de 2024 portent une occurrence du stand-up
+        assert len(activity) == 53
+        assert activity[date(2024, 1, 15)] == (2, 105)
+        assert activity[date(2024, 1, 8)] == (1, 15)
+        assert date(2024, 1, 2) not in activity
+        
+        # Une création invalide l'année en cache
+        appointment_service.createAppointment(
+            title="Atelier",
+            start_datetime=datetime(2024, 6, 3, 14, 0),
+            end_datetime=datetime(2024, 6, 3, 15, 0),
+            category_id=sample_category_id
+        )
+        assert appointment_service.getYearActivity(2024)[date(2024, 6, 3)] == (2, 75)
+
+
+class TestAnalyticsService:
+
+    @pytest.fixture
+    def analytics_service(self):
+        """Crée un service de statistiques avec une base temporaire"""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(temp_fd)
+        db_manager = DatabaseManager(temp_path)
+        db_manager.initializeDatabase()
+        yield AnalyticsService(AppointmentService(db_manager))
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+    
+    @pytest.fixture
+    def sample_data(self, analytics_service):
+        """Crée deux semaines de rendez-vous (du lundi 1er janvier 2024) dont une série"""
+        db_manager = analytics_service.db_manager
+        appointment_service = analytics_service.appointment_service
+        perso_id = db_manager.insertCategory(Category(name="Perso", color="#3B82F6"))
+        pro_id = db_manager.insertCategory(Category(name="Pro", color="#10B981"))
+        sport_id = db_manager.insertSubcategory(Subcategory(name="Sport", category_id=perso_id, color="#3B82F6"))
+        
+        for start, end, category_id, subcategory_id, rule in (
+            (datetime(2024, 1, 1, 9, 30), datetime(2024, 1, 1, 11, 0), perso_id, sport_id, None),
+            (datetime(2024, 1, 3, 14, 0), datetime(2024, 1, 3, 15, 0), perso_id, None, None),
+            (datetime(2024, 1, 9, 10, 0), datetime(2024, 1, 9, 12, 0), pro_id, None, None),
+            (datetime(2024, 1, 5, 8, 0), datetime(2024, 1, 5, 8, 30), pro_id, None, "FREQ=WEEKLY;COUNT=2"),
+        ):
+            appointment_service.createAppointment(
+                title="RDV", start_datetime=start, end_datetime=end, category_id=category_id,
+                subcategory_id=subcategory_id, recurrence_rule=rule
+            )
+        return perso_id, pro_id, sport_id
+    
+    def test_getWeeklyHours_shouldAggregatePerCategoryAndSubcategory(self, analytics_service, sample_data):
+        """Test des heures par semaine"""
+        perso_id, pro_id, sport_id = sample_data
+        columns = analytics_service.loadColumns(date(2024, 1, 1), date(2024, 1, 14))
+        assert len(columns) == 5  # Trois rendez-vous simples et deux occurrences
+        
+        weeks, hours = analytics_service.getWeeklyHours(columns)
+        assert weeks == [date(2024, 1, 1), date(2024, 1, 8)]
+        assert hours[perso_id].tolist() == [2.5, 0.0]
+        assert hours[pro_id].tolist() == [0.5, 2.5]
+        
+        _, hours = analytics_service.getWeeklyHours(columns, by_subcategory=True)
+        assert set(hours) == {(perso_id, sport_id), (perso_id, None), (pro_id, None)}
+        assert hours[(perso_id, sport_id)].tolist() == [1.5, 0.0]
+    
+    def test_weekdayTotalsAndOccupancy_shouldSplitByDayAndHour(self, analytics_service, sample_data):
+        """Test des jours chargés et de la matrice d'occupation"""
+        columns = analytics_service.loadColumns(date(2024, 1, 1), date(2024, 1, 14))
+        
+        counts, hours = analytics_service.getWeekdayTotals(columns)
+        assert counts.tolist() == [1, 1, 1, 0, 2, 0, 0]
+        assert hours.tolist() == [1.5, 2.0, 1.0, 0.0, 1.0, 0.0, 0.0]
+        
+        occupancy = analytics_service.getOccupancyMatrix(columns)
+        assert occupancy.shape == (7, 24)
+        assert occupancy[0, 9] == 30 and occupancy[0, 10] == 60  # Lundi 9h30 - 11h
+        assert occupancy[1, 10] == 60 and occupancy[1, 11] == 60
+        assert occupancy[4, 8] == 60  # Deux occurrences de 30 minutes
+        assert occupancy.sum() == 330
+    
+    def test_getSummary_withEmptyRange_shouldReturnZeros(self, analytics_service):
+        """Test d'une plage sans rendez-vous"""
+        summary = analytics_service.getSummary(date(2024, 1, 1), date(2024, 12, 31))
+        
+        assert summary["appointment_count"] == 0
+        assert summary["weekly_hours"] == {}
+        assert summary["occupancy"].sum() == 0
+        assert len(summary["weeks"]) == 53
+
+
+SAMPLE_ICS = (
+    "BEGIN:VCALENDAR\r\n"
+    "VERSION:2.0\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:rdv-1\r\n"
+    "SUMMARY:Cardiologue\\, contrôle\r\n"
+    "DESCRIPTION:Apporter les résultats\\nd'analyse et l'ordonnance du généraliste pour le\r\n"
+    "  renouvellement\r\n"
+    "DTSTART:20240115T090000\r\n"
+    "DTEND:20240115T100000\r\n"
+    "CATEGORIES:Médical\r\n"
+    "BEGIN:VALARM\r\n"
+    "ACTION:DISPLAY\r\n"
+    "DESCRIPTION:Rappel\r\n"
+    "END:VALARM\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:rdv-2\r\n"
+    "SUMMARY:Congés\r\n"
+    "DTSTART;VALUE=DATE:20240120\r\n"
+    "CATEGORIES:Pro,Inconnue\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:serie-1\r\n"
+    "SUMMARY:Point hebdo\r\n"
+    "DTSTART:20240101T100000\r\n"
+    "DURATION:PT30M\r\n"
+    "RRULE:FREQ=WEEKLY;COUNT=4\r\n"
+    "EXDATE:20240108T100000\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "UID:serie-1\r\n"
+    "RECURRENCE-ID:20240115T100000\r\n"
+    "SUMMARY:Point hebdo (décalé)\r\n"
+    "DTSTART:20240115T140000\r\n"
+    "DTEND:20240115T143000\r\n"
+    "END:VEVENT\r\n"
+    "BEGIN:VEVENT\r\n"
+    "SUMMARY:Sans date\r\n"
+    "END:VEVENT\r\n"
+    "END:VCALENDAR\r\n"
+).encode("utf-8")
+
+
+class TestIcsImportService:
+
+    @pytest.fixture
+    def import_service(self):
+        """Crée un service d'import avec les catégories par défaut"""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(temp_fd)
+        db_manager = DatabaseManager(temp_path)
+        db_manager.initializeDatabase()
+        category_service = CategoryService(db_manager)
+        category_service.initializeDefaultCategories()
+        yield IcsImportService(AppointmentService(db_manager), category_service, batch_size=2)
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+    
+    def test_importStream_shouldCreateAppointmentsSeriesAndExceptions(self, import_service):
+        """Test de l'import d'un flux .ics complet"""
+        progress = []
+        result = import_service.importStream(
+            io.BytesIO(SAMPLE_ICS), progress_callback=lambda *args: progress.append(args),
+            total_bytes=len(SAMPLE_ICS)
+        )
+        
+        assert result == {"imported": 4, "skipped": 1, "rules_dropped": 0}
+        assert progress[-1] == (4, len(SAMPLE_ICS), len(SAMPLE_ICS))
+        assert len(progress) == 2  # Un lot complet de deux, puis la fin
+        
+        appointment_service = import_service.appointment_service
+        taxonomy = import_service.category_service.getTaxonomy()
+        perso = taxonomy.getCategoryByName("Perso")
+        
+        day = appointment_service.getAppointmentsByDate(date(2024, 1, 15))
+        assert [a.title for a in day] == ["Cardiologue, contrôle", "Point hebdo (décalé)"]
+        cardiologue = day[0]
+        assert cardiologue.description == (
+            "Apporter les résultats\nd'analyse et l'ordonnance du généraliste pour le renouvellement"
+        )
+        assert cardiologue.category_id == perso.id
+        assert cardiologue.subcategory_id == taxonomy.getSubcategoryByName(perso.id, "Médical").id
+        
+        conges = appointment_service.getAppointmentsByDate(date(2024, 1, 20))[0]
+        assert conges.category_id == taxonomy.getCategoryByName("Pro").id
+        assert conges.end_datetime == datetime(2024, 1, 21)
+        
+        # Série : exception EXDATE et occurrence remplacée (RECURRENCE-ID) retirées
+        series = [a for a in appointment_service.getAppointmentsByDateRange(date(2024, 1, 1), date(2024, 1, 31))
+                  if a.title == "Point hebdo"]
+        assert [a.start_datetime.day for a in series] == [1, 22]
+        assert series[0].end_datetime == datetime(2024, 1, 1, 10, 30)
+        
+        # Index plein texte et synthèse alimentés en fin d'import
+        assert [a.title for a in appointment_service.search("cardio")] == ["Cardiologue, contrôle"]
+        assert appointment_service.getAppointmentCountsByDay(2024, 1)[date(2024, 1, 15)] == 2
+    
+    def test_importStream_withInvalidRecurrenceId_shouldSkipEvent(self, import_service):
+        """Test d'un RECURRENCE-ID illisible : l'événement seul est ignoré"""
+        content = (
+            "BEGIN:VCALENDAR\r\n"
+            "BEGIN:VEVENT\r\n"
+            "UID:serie-1\r\n"
+            "SUMMARY:Point hebdo\r\n"
+            "DTSTART:20240101T100000\r\n"
+            "RRULE:FREQ=WEEKLY;COUNT=2\r\n"
+            "END:VEVENT\r\n"
+            "BEGIN:VEVENT\r\n"
+            "UID:serie-1\r\n"
+            "RECURRENCE-ID:garbage\r\n"
+            "SUMMARY:Point hebdo (décalé)\r\n"
+            "DTSTART:20240108T140000\r\n"
+            "END:VEVENT\r\n"
+            "END:VCALENDAR\r\n"
+        ).encode("utf-8")
+        
+        result = import_service.importStream(io.BytesIO(content))
+        assert result == {"imported": 1, "skipped": 1, "rules_dropped": 0}
+        
+        january = import_service.appointment_service.getAppointmentsByDateRange(date(2024, 1, 1), date(2024, 1, 31))
+        assert [(a.title, a.start_datetime.day) for a in january] == [("Point hebdo", 1), ("Point hebdo", 8)]
+    
+    def test_importStream_withUtcUntil_shouldKeepSeries(self, import_service):
+        """Test d'une règle dont l'UNTIL est en UTC et d'une règle non reconnue"""
+        content = (
+            "BEGIN:VCALENDAR\r\n"
+            "BEGIN:VEVENT\r\n"
+            "SUMMARY:Point hebdo\r\n"
+            "DTSTART:20240101T100000\r\n"
+            "DURATION:PT30M\r\n"
+            "RRULE:FREQ=WEEKLY;UNTIL=20240123T120000Z\r\n"
+            "END:VEVENT\r\n"
+            "BEGIN:VEVENT\r\n"
+            "SUMMARY:Règle inconnue\r\n"
+            "DTSTART:20240102T100000\r\n"
+            "RRULE:FREQ=PARFOIS\r\n"
+            "END:VEVENT\r\n"
+            "END:VCALENDAR\r\n"
+        ).encode("utf-8")
+        
+        result = import_service.importStream(io.BytesIO(content))
+        assert result == {"imported": 2, "skipped": 0, "rules_dropped": 1}
+        
+        # L'UNTIL tombe entre le 22 et le 29 janvier quel que soit le fuseau local
+        january = import_service.appointment_service.getAppointmentsByDateRange(date(2024, 1, 1), date(2024, 2, 29))
+        assert [(a.title, a.start_datetime.day) for a in january] == [
+            ("Point hebdo", 1), ("Règle inconnue", 2), ("Point hebdo", 8), ("Point hebdo", 15), ("Point hebdo", 22)
+        ]
+    
+    def test_importStream_withError_shouldRollbackAndKeepTriggers(self, import_service):
+        """Test de l'annulation d'un import interrompu"""
+        def failingProgress(*args):
+            raise RuntimeError("Import interrompu")
+        
+        with pytest.raises(RuntimeError):
+            import_service.importStream(io.BytesIO(SAMPLE_ICS), progress_callback=failingProgress)
+        
+        appointment_service = import_service.appointment_service
+        assert appointment_service.getAppointmentsByDate(date(2024, 1, 15)) == []
+        
+        # Les triggers retirés pendant l'import ont été restaurés
+        appointment_service.createAppointment(
+            title="Cardiologue",
+            start_datetime=datetime(2024, 1, 15, 9, 0),
+            end_datetime=datetime(2024, 1, 15, 10, 0),
+            category_id=import_service.category_service.getAllCategories()[0].id
+        )
+        assert len(appointment_service.search("cardio")) == 1
+        assert appointment_service.hasConflict(datetime(2024, 1, 15, 9, 30), datetime(2024, 1, 15, 9, 45))
+
+
+class TestExportService:
+
+    @pytest.fixture
+    def services(self):
+        """Crée une base d'exemple et son service d'export"""
+        temp_fd, temp_path = tempfile.mkstemp(suffix=".db")
+        os.close(temp_fd)
+        db_manager = DatabaseManager(temp_path)
+        db_manager.initializeDatabase()
+        category_service = CategoryService(db_manager)
+        category_service.initializeDefaultCategories()
+        appointment_service = AppointmentService(db_manager)
+        
+        taxonomy = category_service.getTaxonomy()
+        perso = taxonomy.getCategoryByName("Perso")
+        appointment_service.createAppointment(
+            title="Cardiologue, contrôle",
+            description="Apporter les résultats; l'ordonnance\net la carte vitale " * 3,
+            start_datetime=datetime(2024, 1, 15, 9, 0),
+            end_datetime=datetime(2024, 1, 15, 10, 0),
+            category_id=perso.id,
+            subcategory_id=taxonomy.getSubcategoryByName(perso.id, "Médical").id
+        )
+        appointment_service.createAppointment(
+            title="Hors période",
+            start_datetime=datetime(2024, 3, 1, 9, 0),
+            end_datetime=datetime(2024, 3, 1, 10, 0),
+            category_id=taxonomy.getCategoryByName("Pro").id
+        )
+        series_id = appointment_service.createAppointment(
+            title="Point hebdo",
+            start_datetime=datetime(2024, 1, 1, 10, 0),
+            end_datetime=datetime(2024, 1, 1, 10, 30),
+            category_id=perso.id,
+            recurrence_rule="FREQ=WEEKLY;COUNT=4"
+        )
+        appointment_service.deleteOccurrence(series_id, datetime(2024, 1, 8, 10, 0))
+        
+        yield ExportService(db_manager), category_service
+        db_manager.close()
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(temp_path + suffix):
+                os.unlink(temp_path + suffix)
+    
+    def test_exportIcs_shouldRoundTripThroughImport(self, services, tmp_path):
+        """Test d'un export .ics relu par l'import"""
+        export_service, category_service = services
+        path = tmp_path / "export.ics"
+        
+        assert export_service.exportIcs(str(path), date(2024, 1, 1), date(2024, 2, 1)) == 2
+        
+        content = path.read_bytes()
+        assert all(len(line) <= 75 for line in content.split(b"\r\n"))
+        
+        # Réimport dans une base vierge
+        target = DatabaseManager(str(tmp_path / "target.db"))
+        target.initializeDatabase()
+        target_categories = CategoryService(target)
+        target_categories.initializeDefaultCategories()
+        target_service = AppointmentService(target)
+        result = IcsImportService(target_service, target_categories).importStream(io.BytesIO(content))
+        
+        assert result == {"imported": 2, "skipped": 0, "rules_dropped": 0}
+        january = target_service.getAppointmentsByDateRange(date(2024, 1, 1), date(2024, 1, 31))
+        assert [(a.title, a.start_datetime.day) for a in january] == [
+            ("Point hebdo", 1), ("Cardiologue, contrôle", 15), ("Point hebdo", 15), ("Point hebdo", 22)
+        ]
+        cardiologue = january[1]
+        assert cardiologue.description == "Apporter les résultats; l'ordonnance\net la carte vitale " * 3
+        assert target_categories.getSubcategoryById(cardiologue.subcategory_id).name == "Médical"
+        target.close()
+    
+    def test_exportJsonl_shouldWriteOneRecordPerLine(self, services, tmp_path):
+        """Test de l'export JSON lines"""
+        export_service, _ = services
+        path = tmp_path / "export.jsonl"
+        
+        assert export_service.exportJsonl(str(path)) == 3
+        
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [record["title"] for record in records] == ["Point hebdo", "Cardiologue, contrôle", "Hors période"]
+        assert records[0]["recurrence_rule"] == "FREQ=WEEKLY;COUNT=4"
+        assert records[0]["exceptions"] == ["2024-01-08T10:00:00"]
+        assert records[1]["start"] == "2024-01-15T09:00:00"
+        assert (records[1]["category"], records[1]["subcategory"]) == ("Perso", "Médical")
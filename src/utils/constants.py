@@ -1,6 +1,16 @@
 """Constants globales pour l'application"""
 
 DATABASE_PATH = "calendar_data.db"
+APPOINTMENT_CACHE_SIZE = 256  # Entrées (jours ou mois) gardées en mémoire
+CALENDAR_RENDERER = "widgets"  # Rendu de la grille mensuelle : "widgets" ou "canvas"
+SEARCH_RESULT_LIMIT = 50  # Nombre maximal de résultats de recherche
+SEARCH_MIN_PREFIX = 2  # Longueur minimale d'un mot recherché (préfixes indexés : 2 et 3)
+SERIES_CACHE_SIZE = 64  # Séries récurrentes dont les occurrences sont gardées en mémoire
+SEARCH_DEBOUNCE_MS = 150  # Délai après la dernière frappe avant de lancer la recherche
+WORKING_HOURS = (9, 18)  # Heures ouvrées (début, fin) pour la recherche de créneaux libres
+ICS_IMPORT_BATCH_SIZE = 5000  # Rendez-vous insérés par lot lors d'un import .ics
+APPOINTMENT_PAGE_SIZE = 1000  # Rendez-vous lus par page lors d'un parcours (iterAppointments)
+EXPORT_BUFFER_SIZE = 1 << 20  # Tampon d'écriture des exports (octets)
 APP_NAME = "Gestion Calendrier"
 APP_VERSION = "1.0.2"
 
@@ -9,6 +19,15 @@ DEFAULT_CATEGORIES = {
     "Pro": ["Réunion", "Formation", "Projet", "Administratif"]
 }
 
+# Récurrences proposées dans le dialogue (libellé -> règle RRULE)
+RECURRENCE_PRESETS = {
+    "Aucune": None,
+    "Chaque jour": "FREQ=DAILY",
+    "Chaque semaine": "FREQ=WEEKLY",
+    "Chaque mois": "FREQ=MONTHLY",
+    "Chaque année": "FREQ=YEARLY"
+}
+
 COLORS = {
     "Perso": "#3B82F6",  # Bleu
     "Pro": "#EF4444",    # Rouge
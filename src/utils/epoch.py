@@ -0,0 +1,34 @@
+"""Conversion des dates en secondes depuis l'époque Unix
+
+Les horaires des rendez-vous sont stockés en base sous forme d'entiers
+(secondes depuis le 1970-01-01T00:00:00). Les datetimes de l'application sont
+naïfs (heure locale) : ils sont convertis tels quels, sans décalage horaire,
+comme si l'heure murale était UTC. Les fractions de seconde sont tronquées.
+"""
+
+from datetime import date, datetime, time, timedelta
+
+
+EPOCH = datetime(1970, 1, 1)
+SECONDS_PER_DAY = 86400
+_ONE_SECOND = timedelta(seconds=1)
+
+
+def toEpoch(value) -> int:
+    """Convertit une date (minuit) ou un datetime en secondes depuis l'époque"""
+    if not isinstance(value, datetime):
+        value = datetime.combine(value, time.min)
+    elif value.tzinfo is not None:
+        # Un datetime avec fuseau est ramené à son heure murale
+        value = value.replace(tzinfo=None)
+    return (value - EPOCH) // _ONE_SECOND
+
+
+def fromEpoch(seconds: int) -> datetime:
+    """Convertit des secondes depuis l'époque en datetime naïf"""
+    return EPOCH + timedelta(seconds=seconds)
+
+
+def epochToDate(seconds: int) -> date:
+    """Retourne le jour correspondant à des secondes depuis l'époque"""
+    return EPOCH.date() + timedelta(days=seconds // SECONDS_PER_DAY)
@@ -0,0 +1,71 @@
+"""Cache LRU borné avec compteurs"""
+
+from collections import OrderedDict
+from typing import Any, Dict, Hashable
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """Cache borné évinçant l'entrée la moins récemment utilisée
+    
+    Les compteurs de succès, d'échecs et d'évictions permettent de vérifier
+    l'efficacité du cache depuis l'application ou les tests.
+    """
+    
+    def __init__(self, max_size: int = 128):
+        if max_size <= 0:
+            raise ValueError("La taille du cache doit être strictement positive")
+        
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retourne la valeur associée à la clé et la marque comme récente"""
+        value = self._entries.get(key, _MISSING)
+        
+        if value is _MISSING:
+            self.misses += 1
+            return default
+        
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+    
+    def put(self, key: Hashable, value: Any):
+        """Ajoute ou remplace une entrée, en évinçant la plus ancienne si besoin"""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self._entries[key] = value
+        
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+    
+    def invalidate(self, key: Hashable) -> bool:
+        """Supprime une entrée ; retourne True si elle était présente"""
+        return self._entries.pop(key, _MISSING) is not _MISSING
+    
+    def clear(self):
+        """Vide le cache sans réinitialiser les compteurs"""
+        self._entries.clear()
+    
+    def getStats(self) -> Dict[str, int]:
+        """Retourne les compteurs du cache"""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "max_size": self.max_size
+        }
+    
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
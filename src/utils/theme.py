@@ -255,6 +255,15 @@ def getCalendarCellStyle(is_today=False, is_selected=False, has_appointments=Fal
         "width": SIZES["calendar_cell_size"]
     }
 
+def getHeatColor(ratio):
+    """Retourne la couleur d'une carte de chaleur pour une intensité entre 0 et 1
+    
+    Interpolation entre le fond secondaire (0) et la couleur principale (1).
+    """
+    low = tuple(int(COLORS["background_dark"][i:i + 2], 16) for i in (1, 3, 5))
+    high = tuple(int(COLORS["primary"][i:i + 2], 16) for i in (1, 3, 5))
+    return "#" + "".join(f"{round(a + (b - a) * ratio):02X}" for a, b in zip(low, high))
+
 # =============================================================================
 # CONSTANTES DE MIGRATION
 # =============================================================================